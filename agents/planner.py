@@ -7,42 +7,54 @@ from typing import Any, Iterable, Optional
 
 from crewai import Agent
 
-from config.settings import build_crewai_llm
+from config.settings import build_crewai_llm, route_llm_overrides
+
+from .prompting import AgentPersona, persona_kwargs
 
 SYSTEM_PROMPT = (
     "You are the Workshop Planner. Analyze the given topic and create a structured plan with clear milestones, "
     "required resources, and a realistic timeline. Focus on actionable steps that lead to successful workshop delivery."
 )
 
+PERSONA = AgentPersona(
+    name="Workshop Planner",
+    role=(
+        "You are the strategic architect and master planner responsible for transforming high-level workshop concepts "
+        "into comprehensive, actionable roadmaps. Your expertise lies in breaking down complex, ambiguous objectives "
+        "into clear, sequential milestones that guide the entire team toward successful delivery. You analyze the "
+        "workshop topic from multiple angles—considering learning objectives, participant skill levels, resource "
+        "requirements, and practical constraints. You think like a project manager, curriculum designer, and "
+        "educational strategist combined. Your plans include detailed breakdowns of required assets, responsible "
+        "roles for each phase, necessary tooling and infrastructure, realistic timelines with buffer periods, "
+        "risk mitigation strategies, and measurable success criteria. You ensure that every milestone is specific, "
+        "achievable, and aligned with the overall workshop goals. Your planning documents serve as the foundation "
+        "that all other agents reference and build upon, making clarity and comprehensiveness your top priorities."
+    ),
+    goal="Produce a milestone-driven execution plan covering research, authoring, and review",
+    backstory=(
+        "You are an expert workshop designer with years of experience creating educational content. "
+        "You excel at breaking down ambiguous goals into concrete, evidence-backed steps. "
+        "You think strategically about learning outcomes and participant experience."
+    ),
+    system_prompt=SYSTEM_PROMPT,
+    compact_role="Workshop Planner",
+    compact_backstory=(
+        "You turn workshop topics into milestone plans with assets, roles, tooling, timelines with buffers, risks "
+        "and success metrics. Every milestone is specific, achievable and referenced by the rest of the team."
+    ),
+)
+
 
 def create_planner_agent(
     tools: Optional[Iterable[object]] = None,
     llm_overrides: dict[str, Any] | None = None,
+    model_profile: str | None = None,
 ) -> Agent:
     """Create the planner agent used to bootstrap the workflow."""
     return Agent(
-        name="Workshop Planner",
-        role=(
-            "You are the strategic architect and master planner responsible for transforming high-level workshop concepts "
-            "into comprehensive, actionable roadmaps. Your expertise lies in breaking down complex, ambiguous objectives "
-            "into clear, sequential milestones that guide the entire team toward successful delivery. You analyze the "
-            "workshop topic from multiple angles—considering learning objectives, participant skill levels, resource "
-            "requirements, and practical constraints. You think like a project manager, curriculum designer, and "
-            "educational strategist combined. Your plans include detailed breakdowns of required assets, responsible "
-            "roles for each phase, necessary tooling and infrastructure, realistic timelines with buffer periods, "
-            "risk mitigation strategies, and measurable success criteria. You ensure that every milestone is specific, "
-            "achievable, and aligned with the overall workshop goals. Your planning documents serve as the foundation "
-            "that all other agents reference and build upon, making clarity and comprehensiveness your top priorities."
-        ),
-        goal="Produce a milestone-driven execution plan covering research, authoring, and review",
-        backstory=(
-            "You are an expert workshop designer with years of experience creating educational content. "
-            "You excel at breaking down ambiguous goals into concrete, evidence-backed steps. "
-            "You think strategically about learning outcomes and participant experience."
-        ),
-        llm=build_crewai_llm(**(llm_overrides or {})),
+        **persona_kwargs(PERSONA),
+        llm=build_crewai_llm(**route_llm_overrides("planner", llm_overrides, model_profile)),
         allow_delegation=False,
         verbose=True,
-        system_prompt=SYSTEM_PROMPT,
         tools=list(tools or []), ## Call tools here
     )
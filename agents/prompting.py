@@ -0,0 +1,106 @@
+"""Prompt assembly for agent personas: full or compact variants and token measurement.
+
+CrewAI renders ``role``, ``backstory`` and ``goal`` (followed by the tool descriptions)
+into the system message of every LLM call an agent makes, including each tool
+iteration. Those static tokens are therefore paid again and again. Personas keep a
+compact variant next to the full text, and ``AGENT_PROMPT_STYLE=compact`` selects it.
+Because nothing run-specific is placed in the persona, the system message is a stable
+prefix that provider-side prompt caching can reuse.
+"""
+from __future__ import annotations
+
+import logging
+import os
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from config.tokens import PromptStats, count_tokens
+
+PROMPT_STYLES = ("full", "compact")
+
+logger = logging.getLogger(__name__)
+
+
+def prompt_style_from_env() -> str:
+    style = os.getenv("AGENT_PROMPT_STYLE", "full").strip().lower() or "full"
+    if style not in PROMPT_STYLES:
+        raise ValueError(f"Unknown AGENT_PROMPT_STYLE '{style}'. Choose from {', '.join(PROMPT_STYLES)}.")
+    return style
+
+
+@dataclass(frozen=True)
+class AgentPersona:
+    """Everything an agent says about itself, in a full and a compact variant.
+
+    The compact variant folds the system prompt into a short backstory, so the
+    instructions are not sent twice.
+    """
+
+    name: str
+    role: str
+    goal: str
+    backstory: str
+    system_prompt: str
+    compact_role: str
+    compact_backstory: str
+
+    def fields(self, style: str = "full") -> Dict[str, Any]:
+        """Keyword arguments for ``crewai.Agent`` in the given style."""
+
+        if style == "compact":
+            return {
+                "name": self.name,
+                "role": self.compact_role,
+                "goal": self.goal,
+                "backstory": self.compact_backstory,
+                "system_prompt": None,
+            }
+        return {
+            "name": self.name,
+            "role": self.role,
+            "goal": self.goal,
+            "backstory": self.backstory,
+            "system_prompt": self.system_prompt,
+        }
+
+    def static_prompt(self, style: str = "full") -> str:
+        """The persona text sent ahead of every call, in CrewAI's system-message order."""
+
+        fields = self.fields(style)
+        parts = [f"You are {fields['role']}. {fields['backstory']}", f"Your personal goal is: {fields['goal']}"]
+        if fields["system_prompt"]:
+            parts.append(fields["system_prompt"])
+        return "\n".join(parts)
+
+    def static_tokens(self, style: str = "full") -> int:
+        return count_tokens(self.static_prompt(style))
+
+
+def persona_kwargs(persona: AgentPersona, style: Optional[str] = None) -> Dict[str, Any]:
+    """Render ``persona`` for ``crewai.Agent`` and log its static prompt size."""
+
+    style = style or prompt_style_from_env()
+    logger.debug(
+        "%s persona (%s): %d static prompt tokens per call (full: %d)",
+        persona.name,
+        style,
+        persona.static_tokens(style),
+        persona.static_tokens("full"),
+    )
+    return persona.fields(style)
+
+
+def prompt_report(persona: AgentPersona, style: str, stats: Optional[PromptStats] = None) -> Dict[str, Any]:
+    """Static prompt tokens of ``persona`` plus measured per-call input tokens and latency."""
+
+    full_tokens = persona.static_tokens("full")
+    used_tokens = persona.static_tokens(style)
+    report: Dict[str, Any] = {
+        "style": style,
+        "static_tokens": used_tokens,
+        "static_tokens_saved_per_call": full_tokens - used_tokens,
+    }
+    if stats is not None and stats.calls:
+        report.update(stats.as_dict())
+        report["static_tokens_saved"] = (full_tokens - used_tokens) * stats.calls
+    return report
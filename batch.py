@@ -0,0 +1,186 @@
+"""Batch runner that executes many workshop topics concurrently."""
+from __future__ import annotations
+
+import json
+import logging
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, Mapping, Optional
+
+from crew import run_workshop_pipeline
+
+if TYPE_CHECKING:  # pragma: no cover - imported for annotations only
+    from checkpoints import TaskCheckpointStore
+    from config.tracing import Tracer
+
+logger = logging.getLogger(__name__)
+
+
+def parse_provider_limits(values: Iterable[str]) -> Dict[str, int]:
+    """Parse ``provider=limit`` pairs (e.g. ``openrouter=4``) into a mapping."""
+
+    limits: Dict[str, int] = {}
+    for value in values:
+        for item in value.split(","):
+            item = item.strip()
+            if not item:
+                continue
+            provider, separator, limit = item.partition("=")
+            if not separator or not limit.strip().isdigit() or int(limit) < 1:
+                raise ValueError(f"Invalid provider limit '{item}'. Use the form provider=N with N >= 1.")
+            limits[provider.strip()] = int(limit)
+    return limits
+
+
+class ProviderConcurrencyLimiter:
+    """Cap how many crews may talk to the same LLM provider at once."""
+
+    def __init__(self, limits: Mapping[str, int] | None = None, default_limit: int | None = None) -> None:
+        self._limits = dict(limits or {})
+        self._default_limit = default_limit
+        self._semaphores: Dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+    def _semaphore_for(self, provider: str) -> Optional[threading.BoundedSemaphore]:
+        limit = self._limits.get(provider, self._default_limit)
+        if limit is None:
+            return None
+        with self._lock:
+            semaphore = self._semaphores.get(provider)
+            if semaphore is None:
+                semaphore = threading.BoundedSemaphore(limit)
+                self._semaphores[provider] = semaphore
+            return semaphore
+
+    @contextmanager
+    def slot(self, provider: str) -> Iterator[None]:
+        """Hold one concurrency slot for ``provider`` for the duration of the block."""
+
+        semaphore = self._semaphore_for(provider)
+        if semaphore is None:
+            yield
+            return
+        with semaphore:
+            yield
+
+
+def read_topics(source: Path | str) -> Iterator[Dict[str, Any]]:
+    """Yield topic records from a text file (one topic per line) or a JSONL stream.
+
+    JSONL lines must contain a ``topic`` key; any other keys are copied to the
+    output record. Use ``-`` to read from stdin.
+    """
+
+    handle = sys.stdin if str(source) == "-" else open(source, encoding="utf-8")
+    try:
+        for line_number, line in enumerate(handle, start=1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            if line.startswith("{"):
+                record = json.loads(line)
+                if not record.get("topic"):
+                    raise ValueError(f"Line {line_number} of {source} has no 'topic' field.")
+                yield record
+            else:
+                yield {"topic": line}
+    finally:
+        if handle is not sys.stdin:
+            handle.close()
+
+
+@dataclass
+class BatchSummary:
+    total: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    elapsed_seconds: float = 0.0
+
+
+def run_batch(
+    records: Iterable[Dict[str, Any]],
+    output_path: Path,
+    *,
+    max_workers: int = 4,
+    provider_limits: Mapping[str, int] | None = None,
+    default_provider_limit: int | None = None,
+    checkpoints: "TaskCheckpointStore | None" = None,
+    fresh: bool = False,
+    tracer: "Tracer | None" = None,
+) -> BatchSummary:
+    """Run one crew per topic on a thread pool and append each result to ``output_path``.
+
+    Results are written as JSON lines the moment each topic finishes, so the output
+    file can be tailed while the batch is running. ``default_provider_limit`` caps
+    providers without an entry in ``provider_limits``. Every crew shares the
+    ``checkpoints`` store (cleared per topic with ``fresh``) and records its spans
+    on ``tracer``.
+    """
+
+    if max_workers < 1:
+        raise ValueError("max_workers must be at least 1")
+    if default_provider_limit is not None and default_provider_limit < 1:
+        raise ValueError("default_provider_limit must be at least 1")
+
+    limiter = ProviderConcurrencyLimiter(provider_limits, default_limit=default_provider_limit)
+    summary = BatchSummary()
+    write_lock = threading.Lock()
+    # Bound the number of queued topics so huge inputs are streamed, not buffered.
+    in_flight = threading.BoundedSemaphore(max_workers * 2)
+    started = time.perf_counter()
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, "a", encoding="utf-8") as output_file:
+
+        def _run_one(record: Dict[str, Any]) -> None:
+            topic = str(record["topic"])
+            topic_started = time.perf_counter()
+            result: Dict[str, Any] = dict(record)
+            try:
+                if fresh and checkpoints is not None:
+                    checkpoints.clear(topic)
+                result["output"] = run_workshop_pipeline(
+                    topic, checkpoints=checkpoints, limiter=limiter, tracer=tracer
+                )
+                result["status"] = "ok"
+            except Exception as exc:  # pragma: no cover - runtime resilience path
+                logger.exception("Batch topic failed: %s", topic)
+                result["status"] = "error"
+                result["error"] = str(exc)
+            result["elapsed_seconds"] = round(time.perf_counter() - topic_started, 3)
+
+            with write_lock:
+                output_file.write(json.dumps(result, ensure_ascii=False) + "\n")
+                output_file.flush()
+                if result["status"] == "ok":
+                    summary.succeeded += 1
+                else:
+                    summary.failed += 1
+            logger.info(
+                "Batch topic finished (%s in %.1fs): %s",
+                result["status"],
+                result["elapsed_seconds"],
+                topic,
+            )
+
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="workshop-batch") as executor:
+            for record in records:
+                in_flight.acquire()
+                summary.total += 1
+                future = executor.submit(_run_one, record)
+                future.add_done_callback(lambda _: in_flight.release())
+
+    summary.elapsed_seconds = round(time.perf_counter() - started, 3)
+    logger.info(
+        "Batch finished: %d topics, %d succeeded, %d failed in %.1fs",
+        summary.total,
+        summary.succeeded,
+        summary.failed,
+        summary.elapsed_seconds,
+    )
+    return summary
@@ -0,0 +1,129 @@
+"""Task output checkpoints so fallback attempts and reruns resume an unfinished crew."""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+CHECKPOINT_DIR_ENV = "WORKSHOP_CHECKPOINT_DIR"
+
+logger = logging.getLogger(__name__)
+
+
+def task_prompt_hash(task: Any) -> str:
+    """Fingerprint the prompt of a task so edited tasks never reuse stale outputs.
+
+    CrewAI fills ``{topic}`` into ``description`` and ``expected_output`` in place at
+    kickoff, so the templates it keeps aside are hashed instead; otherwise a checkpoint
+    saved during a run would never match the same task on a freshly built crew.
+    """
+
+    description = getattr(task, "_original_description", None) or getattr(task, "description", "")
+    expected_output = getattr(task, "_original_expected_output", None) or getattr(
+        task, "expected_output", ""
+    )
+    payload = "\n".join(
+        [
+            str(getattr(task, "name", "") or ""),
+            str(description or ""),
+            str(expected_output or ""),
+        ]
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+class TaskCheckpointStore:
+    """Keep finished task outputs in memory and, optionally, on disk.
+
+    Entries are keyed by (topic, task name, prompt hash). With a ``directory`` the
+    outputs survive process restarts, so rerunning ``main.py`` resumes where the
+    previous run stopped.
+    """
+
+    def __init__(self, directory: Path | None = None) -> None:
+        self.directory = Path(directory) if directory else None
+        self._memory: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "TaskCheckpointStore":
+        """Build a store that persists to ``WORKSHOP_CHECKPOINT_DIR`` when it is set."""
+
+        directory = os.getenv(CHECKPOINT_DIR_ENV, "").strip()
+        return cls(Path(directory) if directory else None)
+
+    @staticmethod
+    def _key(topic: str, task: Any) -> str:
+        raw_key = json.dumps([topic, getattr(task, "name", None), task_prompt_hash(task)])
+        return hashlib.sha256(raw_key.encode("utf-8")).hexdigest()
+
+    def _path_for(self, key: str) -> Path:
+        assert self.directory is not None
+        return self.directory / f"{key}.json"
+
+    def load(self, topic: str, task: Any) -> Optional[str]:
+        """Return the checkpointed output for ``task`` or ``None`` if it never finished."""
+
+        key = self._key(topic, task)
+        with self._lock:
+            record = self._memory.get(key)
+            if record is None and self.directory is not None:
+                path = self._path_for(key)
+                if path.exists():
+                    try:
+                        record = json.loads(path.read_text(encoding="utf-8"))
+                    except (OSError, ValueError):
+                        logger.warning("Ignoring unreadable checkpoint %s", path)
+                        record = None
+                    else:
+                        self._memory[key] = record
+        return None if record is None else str(record["output"])
+
+    def save(self, topic: str, task: Any, output: str) -> None:
+        """Record the output of a finished task."""
+
+        key = self._key(topic, task)
+        record = {
+            "topic": topic,
+            "task": getattr(task, "name", None),
+            "prompt_hash": task_prompt_hash(task),
+            "output": output,
+            "saved_at": time.time(),
+        }
+        with self._lock:
+            self._memory[key] = record
+            if self.directory is not None:
+                self.directory.mkdir(parents=True, exist_ok=True)
+                path = self._path_for(key)
+                tmp_path = path.with_suffix(".tmp")
+                tmp_path.write_text(json.dumps(record), encoding="utf-8")
+                tmp_path.replace(path)
+        logger.info("Checkpointed task '%s' for topic: %s", record["task"], topic)
+
+    def clear(self, topic: str | None = None) -> None:
+        """Forget checkpoints for ``topic`` (or every topic when omitted)."""
+
+        with self._lock:
+            for key in [
+                key
+                for key, record in self._memory.items()
+                if topic is None or record.get("topic") == topic
+            ]:
+                del self._memory[key]
+
+            if self.directory is None or not self.directory.exists():
+                return
+            for path in self.directory.glob("*.json"):
+                if topic is not None:
+                    try:
+                        record = json.loads(path.read_text(encoding="utf-8"))
+                    except (OSError, ValueError):
+                        continue
+                    if record.get("topic") != topic:
+                        continue
+                path.unlink(missing_ok=True)
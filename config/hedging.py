@@ -0,0 +1,195 @@
+"""Hedged LLM requests: re-issue a slow call to a backup model and keep the first answer.
+
+The primary call starts immediately. If it has not answered within the hedge delay
+(a fixed value, or the recent p95 latency of that model), the same request goes to
+the next provider/model; whichever answers first wins. A backup is also started as
+soon as the primary fails. LiteLLM's blocking HTTP calls cannot be interrupted, so
+losing calls are abandoned: their results are discarded when they finish. Backups
+run in a small bounded pool and are skipped while it is full of abandoned calls.
+"""
+from __future__ import annotations
+
+import contextvars
+import logging
+import math
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Callable, Deque, Dict, Optional, Sequence, TypeVar
+
+HEDGE_MODES = ("off", "fixed", "p95")
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class LatencyTracker:
+    """Sliding window of successful call latencies per model."""
+
+    def __init__(self, window: int = 200) -> None:
+        self.window = window
+        self._samples: Dict[str, Deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, key: str, seconds: float) -> None:
+        with self._lock:
+            self._samples.setdefault(key, deque(maxlen=self.window)).append(seconds)
+
+    def percentile(self, key: str, quantile: float) -> Optional[float]:
+        with self._lock:
+            samples = sorted(self._samples.get(key, ()))
+        if not samples:
+            return None
+        return samples[min(len(samples) - 1, math.ceil(quantile * len(samples)) - 1)]
+
+    def count(self, key: str) -> int:
+        with self._lock:
+            return len(self._samples.get(key, ()))
+
+
+_LATENCIES = LatencyTracker()
+
+
+def get_latency_tracker() -> LatencyTracker:
+    return _LATENCIES
+
+
+@dataclass
+class HedgePolicy:
+    """When to fire a backup request.
+
+    ``fixed`` waits ``delay_seconds``; ``p95`` waits for the model's recent p95
+    latency once ``min_samples`` calls were observed (``delay_seconds`` until then),
+    never less than ``min_delay_seconds``.
+    """
+
+    mode: str = "off"
+    delay_seconds: float = 20.0
+    min_delay_seconds: float = 5.0
+    min_samples: int = 20
+
+    def __post_init__(self) -> None:
+        if self.mode not in HEDGE_MODES:
+            raise ValueError(f"Unknown hedge mode '{self.mode}'. Choose from {', '.join(HEDGE_MODES)}.")
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != "off"
+
+    def delay_for(self, key: str, tracker: LatencyTracker = _LATENCIES) -> float:
+        if self.mode == "p95" and tracker.count(key) >= self.min_samples:
+            p95 = tracker.percentile(key, 0.95)
+            if p95 is not None:
+                return max(self.min_delay_seconds, p95)
+        return max(self.min_delay_seconds, self.delay_seconds)
+
+
+# Backups share one bounded pool. Abandoned calls cannot be interrupted and keep their
+# worker until the provider answers, so a backup is only started when a worker is free
+# and never queues behind hung calls.
+_BACKUP_WORKERS = 8
+_BACKUP_EXECUTOR = ThreadPoolExecutor(max_workers=_BACKUP_WORKERS, thread_name_prefix="llm-hedge")
+_BACKUP_SLOTS = threading.BoundedSemaphore(_BACKUP_WORKERS)
+
+
+def _start_primary(call: Callable[[], T]) -> "Future[T]":
+    """Run the primary call on a thread of its own, outside the backup pool.
+
+    The thread stands in for the caller's, which stays free to return a backup's
+    answer; a hung primary costs exactly what an unhedged call would.
+    """
+
+    future: "Future[T]" = Future()
+    # Copy the caller's context so CrewAI/LiteLLM context variables follow the call.
+    context = contextvars.copy_context()
+
+    def run() -> None:
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            result = context.run(call)
+        except BaseException as error:  # noqa: BLE001 - handed to the waiting caller
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    threading.Thread(target=run, name="llm-hedge-primary", daemon=True).start()
+    return future
+
+
+def _submit_backup(call: Callable[[], T]) -> "Optional[Future[T]]":
+    """Start ``call`` in the backup pool, or return ``None`` when every worker is busy."""
+
+    if not _BACKUP_SLOTS.acquire(blocking=False):
+        return None
+    future = _BACKUP_EXECUTOR.submit(contextvars.copy_context().run, call)
+    future.add_done_callback(lambda _: _BACKUP_SLOTS.release())
+    return future
+
+
+def hedged_call(
+    primary: Callable[[], T],
+    backups: Sequence[Callable[[], T]],
+    delay_seconds: float,
+    *,
+    label: str = "LLM call",
+) -> T:
+    """Run ``primary``, racing it against ``backups`` one at a time after each delay."""
+
+    active: Dict["Future[T]", int] = {_start_primary(primary): 0}
+    launched = 0
+    last_error: Optional[BaseException] = None
+    started = time.monotonic()
+
+    while active:
+        timeout = delay_seconds if launched < len(backups) else None
+        done, _ = wait(list(active), timeout=timeout, return_when=FIRST_COMPLETED)
+        failed = False
+        for future in done:
+            position = active.pop(future)
+            error = future.exception()
+            if error is None:
+                for loser in active:
+                    loser.cancel()
+                if position:
+                    logger.info(
+                        "%s answered by backup %d after %.1fs (primary abandoned)",
+                        label,
+                        position,
+                        time.monotonic() - started,
+                    )
+                return future.result()
+            last_error = error
+            failed = True
+            logger.warning("%s attempt %d failed: %s", label, position, error)
+
+        if (failed or not done) and launched < len(backups):
+            backup = backups[launched]
+            future = _submit_backup(backup)
+            if future is None and active:
+                logger.warning("%s: backup pool saturated; still waiting on the running call", label)
+                continue
+            launched += 1
+            logger.info(
+                "%s hedging to backup %d/%d after %.1fs",
+                label,
+                launched,
+                len(backups),
+                time.monotonic() - started,
+            )
+            if future is None:
+                # Nothing left to race against, so try the rest on the caller's thread.
+                for position in range(launched, len(backups) + 1):
+                    try:
+                        return backups[position - 1]()
+                    except Exception as error:  # noqa: BLE001 - later backups may still answer
+                        last_error = error
+                        logger.warning("%s attempt %d failed: %s", label, position, error)
+                break
+            active[future] = launched
+
+    assert last_error is not None
+    raise last_error
@@ -0,0 +1,170 @@
+"""CrewAI LLM subclass carrying the workshop's per-call hooks."""
+from __future__ import annotations
+
+import logging
+import time
+from typing import Any, Callable, Optional
+
+from crewai.llm import LLM
+
+from config.hedging import HedgePolicy, get_latency_tracker, hedged_call
+from config.llm_cache import CacheStats, LLMResponseCache, make_cache_key
+from config.provider_health import get_provider_health
+from config.tokens import PromptStats, message_tokens
+from config.tracing import note_llm_response, trace_llm_call
+
+logger = logging.getLogger(__name__)
+
+
+class WorkshopLLM(LLM):
+    """LiteLLM-backed CrewAI LLM with an optional response cache in front of ``call``.
+
+    Hooks are attached after construction so the underlying ``LLM`` never sees
+    unknown keyword arguments. With hedging attached, uncached calls that are slower
+    than the hedge delay are raced against backup LLMs (other providers or models).
+    Every uncached call is recorded against the LLM's endpoint in the provider health
+    tracker, and its input tokens and latency are counted in ``prompt_stats``.
+    """
+
+    response_cache: Optional[LLMResponseCache] = None
+    cache_stats: Optional[CacheStats] = None
+    hedge_policy: Optional[HedgePolicy] = None
+    hedge_backups: Optional[list[Any]] = None
+    health_key: Optional[str] = None
+    prompt_stats: Optional[PromptStats] = None
+
+    def attach_response_cache(self, cache: LLMResponseCache) -> None:
+        self.response_cache = cache
+        self.cache_stats = CacheStats()
+
+    def attach_hedging(self, policy: HedgePolicy, backups: list["WorkshopLLM"]) -> None:
+        self.hedge_policy = policy
+        self.hedge_backups = list(backups)
+
+    def attach_health_key(self, key: str) -> None:
+        self.health_key = key
+
+    def _timed(self, llm: "WorkshopLLM", call: Callable[[], Any]) -> Callable[[], Any]:
+        def run() -> Any:
+            started = time.monotonic()
+            if llm.health_key is None:
+                response = call()
+            else:
+                response = get_provider_health().record(llm.health_key, call)
+            get_latency_tracker().record(str(llm.model), time.monotonic() - started)
+            return response
+
+        return run
+
+    def _call_uncached(
+        self,
+        messages: Any,
+        tools: Optional[list[dict]],
+        callbacks: Optional[list[Any]],
+        available_functions: Optional[dict[str, Any]],
+        **kwargs: Any,
+    ) -> Any:
+        started = time.monotonic()
+        response = self._call_provider(messages, tools, callbacks, available_functions, **kwargs)
+        if self.prompt_stats is None:
+            self.prompt_stats = PromptStats()
+        self.prompt_stats.record(message_tokens(messages), time.monotonic() - started)
+        return response
+
+    def _call_provider(
+        self,
+        messages: Any,
+        tools: Optional[list[dict]],
+        callbacks: Optional[list[Any]],
+        available_functions: Optional[dict[str, Any]],
+        **kwargs: Any,
+    ) -> Any:
+        base_call = super().call
+        primary = self._timed(
+            self,
+            lambda: base_call(
+                messages,
+                tools=tools,
+                callbacks=callbacks,
+                available_functions=available_functions,
+                **kwargs,
+            ),
+        )
+        policy = self.hedge_policy
+        # Calls that may execute tool functions are never duplicated.
+        if policy is None or not policy.enabled or not self.hedge_backups or available_functions:
+            return primary()
+
+        # Backups go straight to the provider: ``backup.call`` would time and record the
+        # call a second time, double-counting it in the health and latency trackers.
+        backups = [
+            self._timed(
+                backup,
+                lambda backup=backup: (
+                    backup,
+                    LLM.call(backup, messages, tools=tools, callbacks=callbacks, **kwargs),
+                ),
+            )
+            for backup in self.hedge_backups
+        ]
+        winner, response = hedged_call(
+            lambda: (self, primary()),
+            backups,
+            policy.delay_for(str(self.model)),
+            label=f"LLM call to {self.model}",
+        )
+        if winner is not self:
+            note_llm_response(winner)
+        return response
+
+    def call(
+        self,
+        messages: Any,
+        tools: Optional[list[dict]] = None,
+        callbacks: Optional[list[Any]] = None,
+        available_functions: Optional[dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> Any:
+        with trace_llm_call(self, messages) as trace:
+            response = self._call_cached(messages, tools, callbacks, available_functions, trace, **kwargs)
+            trace["response"] = response
+            return response
+
+    def _call_cached(
+        self,
+        messages: Any,
+        tools: Optional[list[dict]],
+        callbacks: Optional[list[Any]],
+        available_functions: Optional[dict[str, Any]],
+        trace: dict[str, Any],
+        **kwargs: Any,
+    ) -> Any:
+        cache = self.response_cache
+        trace["cache_hit"] = False
+        # With available_functions the base call runs the requested tool and returns its
+        # output, which must never be replayed from the cache.
+        if cache is None or available_functions:
+            return self._call_uncached(messages, tools, callbacks, available_functions, **kwargs)
+
+        key = make_cache_key(
+            model=self.model,
+            messages=messages,
+            temperature=getattr(self, "temperature", None),
+            max_tokens=getattr(self, "max_tokens", None),
+            tools=tools,
+            provider=getattr(self, "provider", None) or getattr(self, "custom_llm_provider", None),
+            base_url=getattr(self, "base_url", None) or getattr(self, "api_base", None),
+        )
+        cached = cache.get(key)
+        if cached is not None:
+            self.cache_stats.hits += 1
+            trace["cache_hit"] = True
+            logger.debug("LLM cache hit for model %s", self.model)
+            return cached
+
+        self.cache_stats.misses += 1
+        response = self._call_uncached(messages, tools, callbacks, available_functions, **kwargs)
+        if isinstance(response, str) and response.strip():
+            cache.put(key, response, model=str(self.model))
+            self.cache_stats.writes += 1
+        return response
@@ -0,0 +1,206 @@
+"""SQLite-backed, content-addressed cache for LLM responses."""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def make_cache_key(
+    *,
+    model: str,
+    messages: Any,
+    temperature: Any,
+    max_tokens: Any,
+    tools: Any = None,
+    provider: Any = None,
+    base_url: Any = None,
+) -> str:
+    """Hash every request field that can change the model's answer.
+
+    The provider and base URL are part of the key: the same model name served by
+    another endpoint is a different model as far as cached answers go.
+    """
+
+    payload = json.dumps(
+        {
+            "provider": provider,
+            "base_url": base_url,
+            "model": model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "tools": tools,
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class CacheStats:
+    """Hit/miss counters for a single run (or a single LLM instance)."""
+
+    hits: int = 0
+    misses: int = 0
+    writes: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def merge(self, other: "CacheStats") -> "CacheStats":
+        return CacheStats(
+            hits=self.hits + other.hits,
+            misses=self.misses + other.misses,
+            writes=self.writes + other.writes,
+        )
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {**asdict(self), "hit_rate": round(self.hit_rate, 3)}
+
+
+class LLMResponseCache:
+    """Persist LLM responses with a TTL and least-recently-used eviction.
+
+    ``max_entries`` and ``max_bytes`` bound the cache size; when either is exceeded
+    the least recently read entries are evicted first.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        ttl_seconds: float | None = 7 * 24 * 3600,
+        max_entries: int = 5000,
+        max_bytes: int = 256 * 1024 * 1024,
+    ) -> None:
+        self.path = Path(path)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                response TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS responses_last_access ON responses (last_access)"
+        )
+        self._connection.commit()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response for ``key`` or ``None`` when absent or expired."""
+
+        now = time.time()
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT response, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and self.ttl_seconds is not None and now - row[1] > self.ttl_seconds:
+                self._connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._connection.commit()
+                row = None
+
+            if row is None:
+                self.stats.misses += 1
+                return None
+
+            self._connection.execute(
+                "UPDATE responses SET last_access = ? WHERE key = ?", (now, key)
+            )
+            self._connection.commit()
+            self.stats.hits += 1
+            return str(row[0])
+
+    def put(self, key: str, response: str, *, model: str = "") -> None:
+        """Store ``response`` and evict old entries if the cache grew too large."""
+
+        now = time.time()
+        size = len(response.encode("utf-8"))
+        with self._lock:
+            self._connection.execute(
+                """
+                INSERT OR REPLACE INTO responses (key, model, response, size, created_at, last_access)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (key, model, response, size, now, now),
+            )
+            self.stats.writes += 1
+            self._evict()
+            self._connection.commit()
+
+    def _evict(self) -> None:
+        if self.ttl_seconds is not None:
+            self._connection.execute(
+                "DELETE FROM responses WHERE created_at < ?", (time.time() - self.ttl_seconds,)
+            )
+
+        count, total_bytes = self._connection.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+        if count <= self.max_entries and total_bytes <= self.max_bytes:
+            return
+
+        evicted = 0
+        rows = self._connection.execute(
+            "SELECT key, size FROM responses ORDER BY last_access ASC"
+        ).fetchall()
+        for key, size in rows:
+            if count <= self.max_entries and total_bytes <= self.max_bytes:
+                break
+            self._connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+            count -= 1
+            total_bytes -= size
+            evicted += 1
+        logger.debug("Evicted %d LLM cache entries from %s", evicted, self.path)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._connection.execute("DELETE FROM responses")
+            self._connection.commit()
+
+
+_CACHES: Dict[str, LLMResponseCache] = {}
+_CACHES_LOCK = threading.Lock()
+
+
+def get_response_cache(
+    path: Path,
+    *,
+    ttl_seconds: float | None = 7 * 24 * 3600,
+    max_entries: int = 5000,
+) -> LLMResponseCache:
+    """Return the process-wide cache for ``path``, opening it on first use."""
+
+    resolved = str(Path(path).resolve())
+    with _CACHES_LOCK:
+        cache = _CACHES.get(resolved)
+        if cache is None:
+            cache = LLMResponseCache(Path(path), ttl_seconds=ttl_seconds, max_entries=max_entries)
+            _CACHES[resolved] = cache
+            logger.info("Opened LLM response cache at %s", path)
+        return cache
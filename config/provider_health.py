@@ -0,0 +1,245 @@
+"""Per-endpoint health tracking with circuit breakers for the LLM fallback attempts.
+
+Every LLM call records its latency or failure against its endpoint (provider, model,
+base URL). Errors and rate-limit responses are smoothed with an EWMA; repeated
+failures (or any rate limit) open the endpoint's circuit for a cool-down that
+doubles on every consecutive trip. ``order_attempts`` puts healthy endpoints first
+and open circuits last, and the state is persisted to a small JSON file so the next
+run starts from what this one learned. Writes happen off the call path: changes are
+flushed every few seconds, after every fallback attempt and at exit.
+"""
+from __future__ import annotations
+
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass, fields
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, TypeVar
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_HEALTH_PATH = PROJECT_ROOT / ".cache" / "provider_health.json"
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def endpoint_key(provider: str, model: str, base_url: str) -> str:
+    return f"{provider}|{model}|{base_url}"
+
+
+def is_rate_limit_error(exc: BaseException) -> bool:
+    # LiteLLM raises RateLimitError; other clients only surface the 429 status.
+    return "ratelimit" in type(exc).__name__.lower() or getattr(exc, "status_code", None) == 429
+
+
+@dataclass
+class EndpointHealth:
+    """Smoothed health of one endpoint plus its circuit-breaker state."""
+
+    latency_ewma: Optional[float] = None
+    error_ewma: float = 0.0
+    rate_limit_ewma: float = 0.0
+    successes: int = 0
+    failures: int = 0
+    consecutive_failures: int = 0
+    trips: int = 0
+    open_until: float = 0.0
+
+    def is_open(self, now: float) -> bool:
+        return self.open_until > now
+
+    def penalty(self, slow_seconds: float) -> float:
+        """Lower is healthier; rounded so small fluctuations do not reshuffle endpoints."""
+
+        slow = 0.5 if self.latency_ewma is not None and self.latency_ewma > slow_seconds else 0.0
+        return round(self.error_ewma + self.rate_limit_ewma + slow, 1)
+
+
+class ProviderHealthTracker:
+    """Thread-safe health registry, optionally persisted to ``path``."""
+
+    def __init__(
+        self,
+        path: Optional[Path] = DEFAULT_HEALTH_PATH,
+        *,
+        alpha: float = 0.3,
+        failure_threshold: int = 2,
+        base_cooldown_seconds: float = 30.0,
+        max_cooldown_seconds: float = 1800.0,
+        slow_seconds: float = 60.0,
+        save_interval_seconds: float = 5.0,
+    ) -> None:
+        self.path = Path(path) if path is not None else None
+        self.alpha = alpha
+        self.failure_threshold = failure_threshold
+        self.base_cooldown_seconds = base_cooldown_seconds
+        self.max_cooldown_seconds = max_cooldown_seconds
+        self.slow_seconds = slow_seconds
+        self.save_interval_seconds = save_interval_seconds
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._dirty = False
+        self._timer: Optional[threading.Timer] = None
+        self._endpoints: Dict[str, EndpointHealth] = self._load()
+        if self.path is not None:
+            atexit.register(self.flush)
+
+    def _load(self) -> Dict[str, EndpointHealth]:
+        if self.path is None or not self.path.exists():
+            return {}
+        try:
+            raw = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as exc:
+            logger.warning("Ignoring unreadable provider health file %s: %s", self.path, exc)
+            return {}
+        known = {item.name for item in fields(EndpointHealth)}
+        return {
+            key: EndpointHealth(**{name: value for name, value in state.items() if name in known})
+            for key, state in raw.get("endpoints", {}).items()
+        }
+
+    def _mark_dirty(self) -> None:
+        """Schedule a write of the state (tracker lock held); calls never wait on disk."""
+
+        self._dirty = True
+        if self.path is not None and self._timer is None:
+            self._timer = threading.Timer(self.save_interval_seconds, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self) -> None:
+        """Write pending changes to ``path`` now (atomically, via a temporary file)."""
+
+        if self.path is None:
+            return
+        with self._write_lock:
+            with self._lock:
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                if not self._dirty:
+                    return
+                self._dirty = False
+                payload = {"endpoints": {key: asdict(state) for key, state in self._endpoints.items()}}
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = self.path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+                tmp_path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+                tmp_path.replace(self.path)
+            except OSError as exc:
+                logger.warning("Could not persist provider health to %s: %s", self.path, exc)
+
+    def _ewma(self, current: float, sample: float) -> float:
+        return (1 - self.alpha) * current + self.alpha * sample
+
+    def record_success(self, key: str, latency_seconds: float) -> None:
+        with self._lock:
+            state = self._endpoints.setdefault(key, EndpointHealth())
+            state.latency_ewma = (
+                latency_seconds if state.latency_ewma is None else self._ewma(state.latency_ewma, latency_seconds)
+            )
+            state.error_ewma = self._ewma(state.error_ewma, 0.0)
+            state.rate_limit_ewma = self._ewma(state.rate_limit_ewma, 0.0)
+            state.successes += 1
+            if state.consecutive_failures or state.trips:
+                logger.info("Endpoint %s recovered; closing its circuit", key)
+            state.consecutive_failures = 0
+            state.trips = 0
+            state.open_until = 0.0
+            self._mark_dirty()
+
+    def record_failure(self, key: str, *, rate_limited: bool = False) -> None:
+        with self._lock:
+            state = self._endpoints.setdefault(key, EndpointHealth())
+            state.error_ewma = self._ewma(state.error_ewma, 0.0 if rate_limited else 1.0)
+            state.rate_limit_ewma = self._ewma(state.rate_limit_ewma, 1.0 if rate_limited else 0.0)
+            state.failures += 1
+            state.consecutive_failures += 1
+            # A rate limit is an explicit request to back off, so it trips immediately.
+            if rate_limited or state.consecutive_failures >= self.failure_threshold:
+                cooldown = min(self.max_cooldown_seconds, self.base_cooldown_seconds * 2**state.trips)
+                state.trips += 1
+                state.open_until = time.time() + cooldown
+                logger.warning(
+                    "Opening circuit for %s for %.0fs (%s, trip %d)",
+                    key,
+                    cooldown,
+                    "rate limited" if rate_limited else f"{state.consecutive_failures} consecutive failures",
+                    state.trips,
+                )
+            self._mark_dirty()
+
+    def record(self, key: str, call: Callable[[], T]) -> T:
+        """Run ``call`` and record its latency or failure against ``key``."""
+
+        started = time.monotonic()
+        try:
+            result = call()
+        except Exception as exc:
+            self.record_failure(key, rate_limited=is_rate_limit_error(exc))
+            raise
+        self.record_success(key, time.monotonic() - started)
+        return result
+
+    def is_open(self, key: str) -> bool:
+        with self._lock:
+            state = self._endpoints.get(key)
+            return state is not None and state.is_open(time.time())
+
+    def order_attempts(self, attempts: Sequence[T], keys_for: Callable[[T], Sequence[str]]) -> List[T]:
+        """Sort ``attempts`` healthiest first, keeping the configured order among equals.
+
+        An attempt may call several endpoints (one per routed agent model) and ranks by
+        its least healthy one. Endpoints with an open circuit go last rather than being
+        dropped, so a run still has something to try when every endpoint is cooling down.
+        """
+
+        now = time.time()
+        with self._lock:
+            def rank(attempt: T) -> tuple[bool, float]:
+                states = [self._endpoints.get(key) for key in keys_for(attempt)]
+                states = [state for state in states if state is not None]
+                if not states:
+                    return (False, 0.0)
+                return (
+                    any(state.is_open(now) for state in states),
+                    max(state.penalty(self.slow_seconds) for state in states),
+                )
+
+            return sorted(attempts, key=rank)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        now = time.time()
+        with self._lock:
+            return {
+                key: {**asdict(state), "open": state.is_open(now)} for key, state in self._endpoints.items()
+            }
+
+
+def health_path_from_env() -> Optional[Path]:
+    raw_value = os.getenv("PROVIDER_HEALTH_PATH")
+    if raw_value is None:
+        return DEFAULT_HEALTH_PATH
+    raw_value = raw_value.strip()
+    if not raw_value or raw_value.lower() in ("off", "none", "0"):
+        return None
+    return Path(raw_value)
+
+
+_TRACKER: Optional[ProviderHealthTracker] = None
+_TRACKER_LOCK = threading.Lock()
+
+
+def get_provider_health() -> ProviderHealthTracker:
+    """Return the process-wide tracker so every LLM and attempt loop shares one view."""
+
+    global _TRACKER
+    with _TRACKER_LOCK:
+        if _TRACKER is None:
+            _TRACKER = ProviderHealthTracker(health_path_from_env())
+        return _TRACKER
@@ -3,12 +3,18 @@ from __future__ import annotations
 
 import os
 from dataclasses import dataclass, field
-from typing import Dict, Any, TYPE_CHECKING
+from pathlib import Path
+from typing import Dict, Any, List, Optional, TYPE_CHECKING
 
 from dotenv import load_dotenv
 from langchain_openai import ChatOpenAI
 from crewai.llm import LLM
 
+from config.hedging import HedgePolicy
+from config.llm import WorkshopLLM
+from config.llm_cache import get_response_cache
+from config.provider_health import endpoint_key
+
 if TYPE_CHECKING:  # pragma: no cover - typing helpers only
     from openai import OpenAI
 
@@ -39,6 +45,50 @@ def _split_env_list(env_var: str) -> list[str]:
     return [item.strip() for item in raw_value.split(",") if item.strip()]
 
 
+# Which model profile each agent uses; "fast" falls back to "large" until a fast model is set.
+DEFAULT_AGENT_PROFILES: Dict[str, str] = {
+    "planner": "fast",
+    "researcher": "fast",
+    "writer": "large",
+    "reviewer": "fast",
+}
+MODEL_PROFILE_NAMES = ("fast", "large")
+
+
+def _parse_agent_profiles(env_var: str) -> Dict[str, str]:
+    """Parse ``agent=profile`` pairs (e.g. ``reviewer=large``) on top of the defaults."""
+
+    profiles = dict(DEFAULT_AGENT_PROFILES)
+    for item in _split_env_list(env_var):
+        agent, separator, profile = item.partition("=")
+        profile = profile.strip().lower()
+        if not separator or profile not in MODEL_PROFILE_NAMES:
+            raise ValueError(
+                f"Invalid {env_var} entry '{item}'. Use agent=profile with profile in {', '.join(MODEL_PROFILE_NAMES)}."
+            )
+        profiles[agent.strip().lower()] = profile
+    return profiles
+
+
+@dataclass(frozen=True)
+class ModelProfile:
+    """Model settings for a class of steps; unset fields keep the config defaults."""
+
+    model: Optional[str] = None
+    max_tokens: Optional[int] = None
+    temperature: Optional[float] = None
+
+    def as_overrides(self) -> Dict[str, Any]:
+        overrides: Dict[str, Any] = {}
+        if self.model:
+            overrides["model"] = self.model
+        if self.max_tokens is not None:
+            overrides["max_tokens"] = self.max_tokens
+        if self.temperature is not None:
+            overrides["temperature"] = self.temperature
+        return overrides
+
+
 @dataclass
 class OpenRouterLLMConfig:
     """Helper container to build consistently configured OpenRouter clients."""
@@ -55,6 +105,84 @@ class OpenRouterLLMConfig:
     fallback_models: list[str] = field(
         default_factory=lambda: _split_env_list("OPENROUTER_FALLBACK_MODELS")
     )
+    # Opt-in response cache: set LLM_CACHE_PATH to a SQLite file to replay identical calls.
+    response_cache_path: str = field(default_factory=lambda: os.getenv("LLM_CACHE_PATH", ""))
+    response_cache_ttl_seconds: float = field(
+        default_factory=lambda: float(os.getenv("LLM_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+    )
+    response_cache_max_entries: int = field(
+        default_factory=lambda: int(os.getenv("LLM_CACHE_MAX_ENTRIES", "5000"))
+    )
+    # Opt-in hedging: "fixed" or "p95" re-issues slow calls to the next fallback attempt.
+    hedge_mode: str = field(default_factory=lambda: os.getenv("LLM_HEDGE_MODE", "off").strip().lower())
+    hedge_delay_seconds: float = field(
+        default_factory=lambda: float(os.getenv("LLM_HEDGE_DELAY_SECONDS", "20"))
+    )
+    hedge_min_delay_seconds: float = field(
+        default_factory=lambda: float(os.getenv("LLM_HEDGE_MIN_DELAY_SECONDS", "5"))
+    )
+
+    # Opt-in routing: tool-calling and summarising agents use OPENROUTER_FAST_MODEL.
+    fast_model: str = field(default_factory=lambda: os.getenv("OPENROUTER_FAST_MODEL", "").strip())
+    fast_max_tokens: int = field(
+        default_factory=lambda: int(os.getenv("OPENROUTER_FAST_MAX_TOKENS", str(LLM_CONFIG["max_tokens"])))
+    )
+    fast_temperature: float = field(
+        default_factory=lambda: float(os.getenv("OPENROUTER_FAST_TEMPERATURE", str(LLM_CONFIG["temperature"])))
+    )
+    agent_profiles: Dict[str, str] = field(
+        default_factory=lambda: _parse_agent_profiles("AGENT_MODEL_PROFILES")
+    )
+
+    def model_profiles(self) -> Dict[str, ModelProfile]:
+        large = ModelProfile()
+        fast = (
+            ModelProfile(model=self.fast_model, max_tokens=self.fast_max_tokens, temperature=self.fast_temperature)
+            if self.fast_model
+            else large
+        )
+        return {"fast": fast, "large": large}
+
+    def profile_for(self, agent: str, profile: Optional[str] = None) -> ModelProfile:
+        name = profile or self.agent_profiles.get(agent, "large")
+        if name not in MODEL_PROFILE_NAMES:
+            raise ValueError(f"Unknown model profile '{name}'. Choose from {', '.join(MODEL_PROFILE_NAMES)}.")
+        return self.model_profiles()[name]
+
+    def routed_overrides(
+        self, agent: str, overrides: Dict[str, Any], profile: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Layer ``overrides`` over the model profile of ``agent`` unless they name a model."""
+
+        if "model" in overrides:
+            return dict(overrides)
+        return {**self.profile_for(agent, profile).as_overrides(), **overrides}
+
+    def attempt_endpoint_keys(self, overrides: Dict[str, Any]) -> List[str]:
+        """Endpoint keys of every agent LLM a crew built from ``overrides`` calls.
+
+        Agents record health under their routed model, so attempts are ranked and
+        circuit-checked with the same keys.
+        """
+
+        keys = [self.endpoint_key(self.routed_overrides(agent, overrides)) for agent in self.agent_profiles]
+        return list(dict.fromkeys(keys)) or [self.endpoint_key(overrides)]
+
+    def endpoint_key(self, overrides: Dict[str, Any]) -> str:
+        """Identify the (provider, model, base URL) endpoint an override dict targets."""
+
+        return endpoint_key(
+            str(overrides.get("provider", "openrouter")),
+            str(overrides.get("model", self.model)),
+            str(overrides.get("base_url", self.base_url)),
+        )
+
+    def hedge_policy(self) -> HedgePolicy:
+        return HedgePolicy(
+            mode=self.hedge_mode or "off",
+            delay_seconds=self.hedge_delay_seconds,
+            min_delay_seconds=self.hedge_min_delay_seconds,
+        )
 
 
 def get_openrouter_client() -> "OpenAI":
@@ -92,15 +220,7 @@ def build_openrouter_chat_llm(**overrides: Any) -> ChatOpenAI:
     )
 
 
-def build_crewai_llm(**overrides: Any) -> LLM:
-    """Return a CrewAI LLM instance configured for OpenRouter via LiteLLM."""
-
-    config = OpenRouterLLMConfig()
-    if not config.api_key:
-        raise ValueError(
-            "OPENROUTER_API_KEY is missing. Set it in your environment or .env file."
-        )
-
+def _create_workshop_llm(config: OpenRouterLLMConfig, overrides: Dict[str, Any]) -> WorkshopLLM:
     raw_model = overrides.get("model", config.model)
     provider_override = overrides.get("provider")
 
@@ -139,4 +259,61 @@ def build_crewai_llm(**overrides: Any) -> LLM:
     # Allow callers to extend with LiteLLM-specific parameters.
     llm_kwargs.update(overrides.get("litellm_params", {}))
 
-    return LLM(**llm_kwargs)
+    llm = WorkshopLLM(**llm_kwargs)
+    llm.attach_health_key(config.endpoint_key(overrides))
+    return llm
+
+
+def route_llm_overrides(
+    agent: str,
+    overrides: Optional[Dict[str, Any]] = None,
+    profile: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Apply the model profile of ``agent`` (or the named ``profile``) beneath ``overrides``.
+
+    A fallback attempt that names its own model keeps it: routing only picks the
+    model while the primary model is in use.
+    """
+
+    overrides = dict(overrides or {})
+    if "hedge_overrides" in overrides:
+        overrides["hedge_overrides"] = [
+            route_llm_overrides(agent, backup, profile) for backup in overrides["hedge_overrides"]
+        ]
+    return OpenRouterLLMConfig().routed_overrides(agent, overrides, profile)
+
+
+def build_crewai_llm(**overrides: Any) -> LLM:
+    """Return a CrewAI LLM instance configured for OpenRouter via LiteLLM.
+
+    ``hedge_overrides`` lists the override dicts of backup LLMs that slow calls are
+    hedged to when ``LLM_HEDGE_MODE`` is enabled.
+    """
+
+    config = OpenRouterLLMConfig()
+    if not config.api_key:
+        raise ValueError(
+            "OPENROUTER_API_KEY is missing. Set it in your environment or .env file."
+        )
+
+    llm = _create_workshop_llm(config, overrides)
+
+    response_cache = overrides.get("response_cache")
+    if response_cache is None and config.response_cache_path:
+        response_cache = get_response_cache(
+            Path(config.response_cache_path),
+            ttl_seconds=config.response_cache_ttl_seconds,
+            max_entries=config.response_cache_max_entries,
+        )
+    if response_cache is not None:
+        llm.attach_response_cache(response_cache)
+
+    hedge_policy = config.hedge_policy()
+    hedge_overrides = overrides.get("hedge_overrides") or []
+    if hedge_policy.enabled and hedge_overrides:
+        # Backups answer on the primary's behalf, so only the primary reads and writes the cache.
+        llm.attach_hedging(
+            hedge_policy, [_create_workshop_llm(config, backup) for backup in hedge_overrides]
+        )
+
+    return llm
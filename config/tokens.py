@@ -0,0 +1,104 @@
+"""Token counting shared by context packing and prompt measurement."""
+from __future__ import annotations
+
+import logging
+import math
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+# OpenRouter models do not expose their tokenizers; cl100k_base tracks Llama 3 and
+# GPT-4 class vocabularies closely enough for budgeting.
+DEFAULT_ENCODING = "cl100k_base"
+CHARS_PER_TOKEN = 4
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=4)
+def _encoding(name: str) -> Optional[Any]:
+    try:
+        import tiktoken
+
+        return tiktoken.get_encoding(name)
+    except Exception:  # pragma: no cover - missing package or offline encoding download
+        logger.warning(
+            "tiktoken encoding %s unavailable; estimating tokens as characters / %d",
+            name,
+            CHARS_PER_TOKEN,
+        )
+        return None
+
+
+def count_tokens(text: str, encoding: str = DEFAULT_ENCODING) -> int:
+    """Return the number of tokens in ``text``."""
+
+    if not text:
+        return 0
+    encoder = _encoding(encoding)
+    if encoder is None:
+        return math.ceil(len(text) / CHARS_PER_TOKEN)
+    return len(encoder.encode(text, disallowed_special=()))
+
+
+def truncate_to_tokens(text: str, max_tokens: int, encoding: str = DEFAULT_ENCODING) -> str:
+    """Cut ``text`` to at most ``max_tokens`` tokens, preferring a sentence or line break."""
+
+    if max_tokens <= 0:
+        return ""
+    encoder = _encoding(encoding)
+    if encoder is None:
+        head = text[: max_tokens * CHARS_PER_TOKEN]
+    else:
+        tokens = encoder.encode(text, disallowed_special=())
+        if len(tokens) <= max_tokens:
+            return text
+        head = encoder.decode(tokens[:max_tokens])
+    if len(head) >= len(text):
+        return text
+    boundary = max(head.rfind(". "), head.rfind("\n"))
+    if boundary > len(head) // 2:
+        head = head[: boundary + 1]
+    return head.rstrip() + " ..."
+
+
+def message_tokens(messages: Any, encoding: str = DEFAULT_ENCODING) -> int:
+    """Count the tokens of a prompt given as a string or a list of chat messages."""
+
+    if isinstance(messages, str):
+        return count_tokens(messages, encoding)
+    total = 0
+    for message in messages or []:
+        content = message.get("content") if isinstance(message, dict) else message
+        if isinstance(content, str):
+            total += count_tokens(content, encoding)
+    return total
+
+
+@dataclass
+class PromptStats:
+    """Input tokens and latency of the uncached LLM calls made by one agent."""
+
+    calls: int = 0
+    input_tokens: int = 0
+    seconds: float = 0.0
+
+    def record(self, input_tokens: int, seconds: float) -> None:
+        self.calls += 1
+        self.input_tokens += input_tokens
+        self.seconds += seconds
+
+    def merge(self, other: "PromptStats") -> "PromptStats":
+        return PromptStats(
+            calls=self.calls + other.calls,
+            input_tokens=self.input_tokens + other.input_tokens,
+            seconds=self.seconds + other.seconds,
+        )
+
+    def as_dict(self) -> Dict[str, Any]:
+        calls = max(self.calls, 1)
+        return {
+            "calls": self.calls,
+            "input_tokens_per_call": round(self.input_tokens / calls),
+            "seconds_per_call": round(self.seconds / calls, 2),
+        }
@@ -0,0 +1,394 @@
+"""Structured run tracing: crew, task, LLM-call and tool-call spans with JSONL/OTLP export.
+
+A ``Tracer`` collects the spans of one run. ``trace_crew`` opens the root span and
+binds the crew's LLMs and tools to the tracer, so ``WorkshopLLM.call`` and tool
+``_run`` methods decorated with ``traced_tool`` record spans without threading the
+tracer through CrewAI. Unbound LLMs and tools (tracing off) skip all of this.
+
+LLM calls are attributed to the task of the agent that owns the LLM. Tool calls run
+on the thread of the LLM call that requested them, so they are attributed to the
+task that thread last worked on.
+"""
+from __future__ import annotations
+
+import contextvars
+import functools
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, TypeVar
+
+from config.tokens import count_tokens, message_tokens
+
+SPAN_KINDS = ("crew", "task", "llm", "tool")
+TRACE_FORMATS = ("jsonl", "otlp")
+SERVICE_NAME = "agentic-workshop"
+
+# OTLP span kinds: INTERNAL for crew/task/tool work, CLIENT for calls to a provider.
+_OTLP_KINDS = {"crew": 1, "task": 1, "tool": 1, "llm": 3}
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+@dataclass
+class Span:
+    """One timed unit of work; times are Unix epoch seconds."""
+
+    name: str
+    kind: str
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str]
+    start: float
+    end: Optional[float] = None
+    status: str = "ok"
+    attributes: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def duration(self) -> float:
+        return (self.end if self.end is not None else time.time()) - self.start
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+class Tracer:
+    """Thread-safe span collector for a single pipeline run."""
+
+    def __init__(self) -> None:
+        self.trace_id = uuid.uuid4().hex
+        self.spans: List[Span] = []
+        self.root: Optional[Span] = None
+        self._task_spans: Dict[str, Span] = {}
+        self._lock = threading.Lock()
+
+    def start_span(self, name: str, kind: str, parent: Optional[Span] = None, **attributes: Any) -> Span:
+        span = Span(
+            name=name,
+            kind=kind,
+            trace_id=self.trace_id,
+            span_id=os.urandom(8).hex(),
+            parent_id=parent.span_id if parent is not None else None,
+            start=time.time(),
+            attributes=dict(attributes),
+        )
+        with self._lock:
+            self.spans.append(span)
+        return span
+
+    def end_span(self, span: Span, error: Optional[BaseException] = None, **attributes: Any) -> None:
+        span.end = time.time()
+        span.attributes.update(attributes)
+        if error is not None:
+            span.status = "error"
+            span.attributes["error"] = f"{type(error).__name__}: {error}"
+
+    @contextmanager
+    def span(self, name: str, kind: str, parent: Optional[Span] = None, **attributes: Any) -> Iterator[Span]:
+        span = self.start_span(name, kind, parent, **attributes)
+        try:
+            yield span
+        except BaseException as exc:
+            self.end_span(span, exc)
+            raise
+        self.end_span(span)
+
+    def task_span(self, task_name: str) -> Span:
+        """Return the span of ``task_name``, starting it on the task's first LLM call."""
+
+        with self._lock:
+            span = self._task_spans.get(task_name)
+        if span is None:
+            span = self.start_span(task_name, "task", self.root)
+            with self._lock:
+                span = self._task_spans.setdefault(task_name, span)
+        return span
+
+    def finish_task(self, task_name: str, **attributes: Any) -> None:
+        span = self.task_span(task_name)
+        if span.end is None:
+            self.end_span(span, **attributes)
+
+    def close_tasks(self, error: Optional[BaseException] = None) -> None:
+        """End task spans left open by a failed crew; the next attempt starts fresh ones."""
+
+        with self._lock:
+            open_spans = [span for span in self._task_spans.values() if span.end is None]
+            self._task_spans = {}
+        for span in open_spans:
+            self.end_span(span, error)
+
+    def export_jsonl(self, path: Path) -> None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("w", encoding="utf-8") as handle:
+            for span in list(self.spans):
+                handle.write(json.dumps({**asdict(span), "duration": round(span.duration, 4)}) + "\n")
+
+    def export_otlp(self, path: Path) -> None:
+        """Write the spans as an OTLP/JSON ``ExportTraceServiceRequest`` document."""
+
+        spans = []
+        for span in list(self.spans):
+            end = span.end if span.end is not None else time.time()
+            record: Dict[str, Any] = {
+                "traceId": span.trace_id,
+                "spanId": span.span_id,
+                "name": span.name,
+                "kind": _OTLP_KINDS.get(span.kind, 1),
+                "startTimeUnixNano": str(int(span.start * 1e9)),
+                "endTimeUnixNano": str(int(end * 1e9)),
+                "attributes": [
+                    {"key": key, "value": _otlp_value(value)}
+                    for key, value in {"workshop.span_kind": span.kind, **span.attributes}.items()
+                ],
+                "status": {"code": 2 if span.status == "error" else 1},
+            }
+            if span.parent_id:
+                record["parentSpanId"] = span.parent_id
+            spans.append(record)
+        document = {
+            "resourceSpans": [
+                {
+                    "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": SERVICE_NAME}}]},
+                    "scopeSpans": [{"scope": {"name": __name__}, "spans": spans}],
+                }
+            ]
+        }
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(document), encoding="utf-8")
+
+    def export(self, path: Path, trace_format: str = "jsonl") -> None:
+        if trace_format not in TRACE_FORMATS:
+            raise ValueError(f"Unknown trace format '{trace_format}'. Choose from {', '.join(TRACE_FORMATS)}.")
+        if trace_format == "otlp":
+            self.export_otlp(path)
+        else:
+            self.export_jsonl(path)
+        logger.info("Wrote %d spans to %s (%s)", len(self.spans), path, trace_format)
+
+    def format_summary(self, top: int = 5) -> str:
+        """Human-readable breakdown: wall time, per-task time, LLM and tool totals, slowest spans."""
+
+        spans = list(self.spans)
+        lines = []
+        crews = [span for span in spans if span.kind == "crew"]
+        for attempt, span in enumerate(crews, start=1):
+            label = "Crew" if len(crews) == 1 else f"Crew attempt {attempt}"
+            lines.append(f"{label}: {span.duration:.1f}s ({span.status})")
+        tasks = [span for span in spans if span.kind == "task"]
+        if tasks:
+            lines.append("Tasks:")
+            for span in sorted(tasks, key=lambda item: item.start):
+                llm_calls = [s for s in spans if s.kind == "llm" and s.parent_id == span.span_id]
+                tool_calls = [s for s in spans if s.kind == "tool" and s.parent_id == span.span_id]
+                restored = " restored" if span.attributes.get("restored") else ""
+                lines.append(
+                    f"  {span.name:<28} {span.duration:8.1f}s  llm={len(llm_calls)} "
+                    f"({sum(s.duration for s in llm_calls):.1f}s)  tools={len(tool_calls)} "
+                    f"({sum(s.duration for s in tool_calls):.1f}s){restored}"
+                )
+        llm_spans = [span for span in spans if span.kind == "llm"]
+        if llm_spans:
+            by_model: Dict[str, List[Span]] = {}
+            for span in llm_spans:
+                # Hedged calls count against the model that actually answered.
+                model = span.attributes.get("gen_ai.response.model") or span.attributes.get(
+                    "gen_ai.request.model", "?"
+                )
+                by_model.setdefault(str(model), []).append(span)
+            lines.append("LLM calls:")
+            for model, model_spans in by_model.items():
+                durations = sorted(span.duration for span in model_spans)
+                lines.append(
+                    f"  {model}: {len(model_spans)} calls, {sum(durations):.1f}s total, "
+                    f"p50 {durations[len(durations) // 2]:.1f}s, max {durations[-1]:.1f}s, "
+                    f"tokens in/out {sum(s.attributes.get('gen_ai.usage.input_tokens', 0) for s in model_spans)}"
+                    f"/{sum(s.attributes.get('gen_ai.usage.output_tokens', 0) for s in model_spans)}, "
+                    f"cache hits {sum(1 for s in model_spans if s.attributes.get('cache_hit'))}"
+                )
+        tool_spans = [span for span in spans if span.kind == "tool"]
+        if tool_spans:
+            by_tool: Dict[str, List[Span]] = {}
+            for span in tool_spans:
+                by_tool.setdefault(span.name, []).append(span)
+            lines.append("Tool calls:")
+            for name, named_spans in by_tool.items():
+                lines.append(
+                    f"  {name}: {len(named_spans)} calls, {sum(s.duration for s in named_spans):.1f}s total, "
+                    f"cache hits {sum(1 for s in named_spans if s.attributes.get('cache_hit'))}"
+                )
+        leaves = sorted((span for span in spans if span.kind in ("llm", "tool")), key=lambda s: -s.duration)
+        if leaves:
+            lines.append(f"Slowest {min(top, len(leaves))} calls:")
+            for span in leaves[:top]:
+                lines.append(f"  {span.duration:7.1f}s  {span.kind:<4} {span.name}")
+        return "\n".join(lines)
+
+
+# Bound LLM / tool object ids -> (tracer, task name); mirrors streaming's sink routing.
+_BINDINGS: Dict[int, Tuple[Tracer, Optional[str]]] = {}
+_BINDINGS_LOCK = threading.Lock()
+_THREAD_TASK = threading.local()
+_CALL_NOTES: contextvars.ContextVar[Optional[Dict[str, Any]]] = contextvars.ContextVar(
+    "workshop_trace_call_notes", default=None
+)
+
+
+def _binding(obj: Any) -> Optional[Tuple[Tracer, Optional[str]]]:
+    with _BINDINGS_LOCK:
+        return _BINDINGS.get(id(obj))
+
+
+@contextmanager
+def trace_crew(tracer: Tracer, crew: Any, **attributes: Any) -> Iterator[Span]:
+    """Trace one crew kickoff: root span, task spans, and every LLM/tool call of ``crew``."""
+
+    task_by_agent: Dict[int, str] = {}
+    for task in crew.tasks:
+        if task.agent is not None:
+            task_by_agent.setdefault(id(task.agent), str(task.name))
+
+    bound: List[int] = []
+    with _BINDINGS_LOCK:
+        for agent in crew.agents:
+            task_name = task_by_agent.get(id(agent))
+            llm = getattr(agent, "llm", None)
+            # Hedge backups answer on behalf of the agent's LLM, so they share its binding.
+            llms = [llm, *(getattr(llm, "hedge_backups", None) or [])] if llm is not None else []
+            for obj in [*llms, *(getattr(agent, "tools", None) or [])]:
+                if obj is not None:
+                    _BINDINGS[id(obj)] = (tracer, task_name)
+                    bound.append(id(obj))
+        for task in crew.tasks:
+            for tool in getattr(task, "tools", None) or []:
+                _BINDINGS.setdefault(id(tool), (tracer, str(task.name)))
+                bound.append(id(tool))
+
+    for task in crew.tasks:
+        existing_callback = task.callback
+
+        def _on_task_finished(task_output: Any, task: Any = task, existing_callback=existing_callback) -> None:
+            text = getattr(task_output, "raw", None) or getattr(task_output, "raw_output", None)
+            tracer.finish_task(str(task.name), output_chars=len(str(text or "")))
+            if existing_callback is not None:
+                existing_callback(task_output)
+
+        task.callback = _on_task_finished
+
+    tracer.root = tracer.start_span("crew", "crew", **attributes)
+    error: Optional[BaseException] = None
+    try:
+        yield tracer.root
+    except BaseException as exc:
+        error = exc
+        raise
+    finally:
+        with _BINDINGS_LOCK:
+            for key in bound:
+                _BINDINGS.pop(key, None)
+        tracer.close_tasks(error)
+        tracer.end_span(tracer.root, error)
+
+
+def record_restored_task(tracer: Tracer, task_name: str) -> None:
+    """Add a zero-length span for a task whose output came from a checkpoint."""
+
+    tracer.finish_task(task_name, restored=True)
+
+
+@contextmanager
+def trace_llm_call(llm: Any, messages: Any) -> Iterator[Dict[str, Any]]:
+    """Record an LLM call of a bound ``llm``; callers may add attributes to the yielded dict."""
+
+    binding = _binding(llm)
+    notes: Dict[str, Any] = {}
+    if binding is None:
+        yield notes
+        return
+    tracer, task_name = binding
+    parent = tracer.task_span(task_name) if task_name else tracer.root
+    _THREAD_TASK.name = task_name
+    provider = str(getattr(llm, "health_key", None) or "").split("|")[0] or "openrouter"
+    span = tracer.start_span(
+        "llm.call",
+        "llm",
+        parent,
+        **{
+            "gen_ai.system": provider,
+            "gen_ai.request.model": str(getattr(llm, "model", "")),
+            "gen_ai.usage.input_tokens": message_tokens(messages),
+        },
+    )
+    token = _CALL_NOTES.set(notes)
+    try:
+        yield notes
+    except BaseException as exc:
+        tracer.end_span(span, exc, **notes)
+        raise
+    finally:
+        _CALL_NOTES.reset(token)
+    response = notes.pop("response", None)
+    if isinstance(response, str):
+        notes["gen_ai.usage.output_tokens"] = count_tokens(response)
+    tracer.end_span(span, **notes)
+
+
+def note_llm_response(llm: Any) -> None:
+    """Mark the LLM call in progress as answered by ``llm`` (a hedge backup)."""
+
+    notes = _CALL_NOTES.get()
+    if notes is not None:
+        notes["gen_ai.response.model"] = str(getattr(llm, "model", ""))
+        notes["hedged"] = True
+
+
+def note_cache_hit() -> None:
+    """Mark the tool call in progress as (partly) served from a cache."""
+
+    notes = _CALL_NOTES.get()
+    if notes is not None:
+        notes["cache_hit"] = True
+
+
+def traced_tool(run: F) -> F:
+    """Decorate a tool's ``_run`` so calls on a bound tool record a span."""
+
+    @functools.wraps(run)
+    def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+        binding = _binding(self)
+        if binding is None:
+            return run(self, *args, **kwargs)
+        tracer, task_name = binding
+        task_name = getattr(_THREAD_TASK, "name", None) or task_name
+        parent = tracer.task_span(task_name) if task_name else tracer.root
+        notes: Dict[str, Any] = {"cache_hit": False}
+        token = _CALL_NOTES.set(notes)
+        span = tracer.start_span(str(getattr(self, "name", type(self).__name__)), "tool", parent)
+        try:
+            result = run(self, *args, **kwargs)
+        except BaseException as exc:
+            tracer.end_span(span, exc, **notes)
+            raise
+        finally:
+            _CALL_NOTES.reset(token)
+        tracer.end_span(span, result_chars=len(str(result)), **notes)
+        return result
+
+    return wrapper  # type: ignore[return-value]
@@ -0,0 +1,162 @@
+"""Extractive reduction of task outputs before later tasks receive them as context.
+
+CrewAI passes the full raw output of earlier tasks to every later task, so by the
+Reviewing step the prompt carries the plan, the research and the whole draft. With a
+token budget, a task's output is archived (for the ``task_context_lookup`` tool) and
+then replaced by an extract of at most the budget. The extract keeps headings, lead
+sentences and lines with figures, links or citations, in their original order. The
+final task's output is never reduced.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import re
+from typing import Any, List, Optional, Sequence, Tuple
+
+from config.tokens import count_tokens
+from tools.context_lookup import TaskContextArchive
+
+CONTEXT_BUDGET_ENV = "WORKSHOP_CONTEXT_TOKEN_BUDGET"
+GAP_MARKER = "[...]"
+
+_SENTENCE_BREAK = re.compile(r"(?<=[.!?])\s+(?=[A-Z0-9\[(])")
+_BULLET = re.compile(r"^\s*(?:[-*+]|\d+[.)])\s+")
+_EVIDENCE = re.compile(r"\d|https?://|\[[^\]]+\]|\([^)]*\d{4}[^)]*\)")
+
+logger = logging.getLogger(__name__)
+
+
+def _units(text: str) -> List[Tuple[int, int, str, float]]:
+    """Split ``text`` into (line, sentence, text, score) units; prose lines split per sentence."""
+
+    units: List[Tuple[int, int, str, float]] = []
+    after_heading = True
+    for line_index, line in enumerate(text.splitlines()):
+        stripped = line.strip()
+        if not stripped:
+            continue
+        if stripped.startswith("#"):
+            units.append((line_index, 0, line.rstrip(), 4.0))
+            after_heading = True
+            continue
+        is_bullet = bool(_BULLET.match(line))
+        pieces = [line.rstrip()] if is_bullet else _SENTENCE_BREAK.split(line.rstrip())
+        for sentence_index, piece in enumerate(pieces):
+            score = 1.0
+            if after_heading and sentence_index == 0:
+                score += 1.5
+            if is_bullet:
+                score += 0.5
+            if _EVIDENCE.search(piece):
+                score += 1.0
+            units.append((line_index, sentence_index, piece, score))
+        after_heading = False
+    return units
+
+
+def extract_to_budget(text: str, token_budget: int) -> str:
+    """Return ``text`` unchanged if it fits, otherwise its most salient lines within the budget."""
+
+    if count_tokens(text) <= token_budget:
+        return text
+    units = _units(text)
+    budget = token_budget - count_tokens(GAP_MARKER)
+    chosen: List[int] = []
+    used = 0
+    # Highest score first; earlier units win ties so the extract reads from the top.
+    for position in sorted(range(len(units)), key=lambda index: (-units[index][3], index)):
+        cost = count_tokens(units[position][2]) + 1
+        if used + cost > budget:
+            continue
+        chosen.append(position)
+        used += cost
+
+    lines: List[str] = []
+    previous = -1
+    for position in sorted(chosen):
+        line_index, _, piece, _ = units[position]
+        if position != previous + 1:
+            lines.append(GAP_MARKER)
+        if lines and lines[-1] != GAP_MARKER and previous >= 0 and units[previous][0] == line_index:
+            lines[-1] += " " + piece.strip()
+        else:
+            lines.append(piece)
+        previous = position
+    if previous != len(units) - 1:
+        lines.append(GAP_MARKER)
+    return "\n".join(lines)
+
+
+def _output_text(task_output: Any) -> str:
+    candidate = getattr(task_output, "raw", None) or getattr(task_output, "raw_output", None)
+    return str(candidate) if candidate else str(task_output)
+
+
+def _set_output_text(task_output: Any, text: str) -> None:
+    if hasattr(task_output, "raw"):
+        task_output.raw = text
+    else:
+        task_output.raw_output = text
+
+
+class ContextReducer:
+    """Archive and shrink the outputs of tasks that other tasks use as context."""
+
+    def __init__(self, token_budget: int, archive: Optional[TaskContextArchive] = None) -> None:
+        if token_budget < 64:
+            raise ValueError("The context token budget must be at least 64 tokens.")
+        self.token_budget = token_budget
+        self.archive = archive or TaskContextArchive()
+        self._reduced_task_ids: set[int] = set()
+
+    @classmethod
+    def from_env(cls) -> Optional["ContextReducer"]:
+        """Build a reducer when ``WORKSHOP_CONTEXT_TOKEN_BUDGET`` is set to a positive value."""
+
+        raw_value = os.getenv(CONTEXT_BUDGET_ENV, "").strip()
+        if not raw_value or int(raw_value) <= 0:
+            return None
+        return cls(int(raw_value))
+
+    def reduce(self, task_name: str, text: str) -> str:
+        self.archive.put(task_name, text)
+        reduced = extract_to_budget(text, self.token_budget)
+        if reduced != text:
+            reduced += (
+                f"\n(Condensed from {count_tokens(text)} tokens; call task_context_lookup with "
+                f"task='{task_name}' for the full output.)"
+            )
+            logger.info(
+                "Reduced context from task '%s': %d -> %d tokens",
+                task_name,
+                count_tokens(text),
+                count_tokens(reduced),
+            )
+        return reduced
+
+    def attach(self, tasks: Sequence[Any]) -> None:
+        """Reduce the output of every task that a later task lists in its ``context``."""
+
+        consumed: set[int] = set()
+        for position, task in enumerate(tasks):
+            context = task.context if isinstance(task.context, list) else tasks[:position]
+            consumed.update(id(dependency) for dependency in context)
+        for task in tasks[:-1]:
+            if id(task) not in consumed:
+                continue
+            self._reduced_task_ids.add(id(task))
+            existing_callback = task.callback
+
+            def _reduce(task_output: Any, task: Any = task, existing_callback=existing_callback) -> None:
+                if existing_callback is not None:
+                    existing_callback(task_output)
+                _set_output_text(task_output, self.reduce(str(task.name), _output_text(task_output)))
+
+            task.callback = _reduce
+
+    def reduce_restored(self, task: Any) -> None:
+        """Apply the reduction to an output restored from a checkpoint."""
+
+        if id(task) in self._reduced_task_ids and task.output is not None:
+            _set_output_text(task.output, self.reduce(str(task.name), _output_text(task.output)))
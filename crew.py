@@ -2,9 +2,11 @@
 from __future__ import annotations
 
 import logging
-from typing import Any
+import os
+from contextlib import nullcontext
+from typing import TYPE_CHECKING, Any, Sequence
 
-from crewai import Crew, Process
+from crewai import Crew, Process, Task
 
 from agents import (
     create_planner_agent,
@@ -12,35 +14,77 @@ from agents import (
     create_reviewer_agent,
     create_writer_agent,
 )
+from agents import planner as planner_agent
+from agents import researcher as researcher_agent
+from agents import reviewer as reviewer_agent
+from agents import writer as writer_agent
+from agents.prompting import AgentPersona, prompt_report, prompt_style_from_env
+from checkpoints import TaskCheckpointStore
+from context_reduction import ContextReducer
+from config.llm_cache import CacheStats
+from config.provider_health import get_provider_health
+from config.tokens import PromptStats
+from config.tracing import Tracer, record_restored_task, trace_crew
 from config.settings import OpenRouterLLMConfig
-from tasks import build_workshop_tasks
-from tools import get_default_toolkit
+from streaming import ATTEMPT_FAILED, TASK_RESTORED, EventSink, PipelineEvent, stream_crew_events
+from tasks import RESEARCH_BRANCHES, build_workshop_tasks
+from tools import get_default_toolkit, get_vectorstore_registry
+from tools.context_lookup import TaskContextLookupTool
+
+if TYPE_CHECKING:  # pragma: no cover - typing helpers only
+    from batch import ProviderConcurrencyLimiter
 
 logger = logging.getLogger(__name__)
 
 
-def create_workshop_crew(llm_overrides: dict[str, Any] | None = None) -> Crew:
-    """Instantiate crew with placeholder agents, tasks, and tools."""
+def _parallel_research_enabled() -> bool:
+    return os.getenv("WORKSHOP_PARALLEL_RESEARCH", "1").strip().lower() not in ("0", "false", "no", "off")
+
+
+def create_workshop_crew(
+    llm_overrides: dict[str, Any] | None = None,
+    context_reducer: ContextReducer | None = None,
+) -> Crew:
+    """Instantiate crew with placeholder agents, tasks, and tools.
+
+    Tasks are declared as a dependency graph. Research fans out into concurrent
+    knowledge-base, web and metrics branches (each on its own researcher agent,
+    since an agent cannot run two tasks at once) unless
+    ``WORKSHOP_PARALLEL_RESEARCH=0``. With a ``context_reducer``, agents that receive
+    condensed context also get ``task_context_lookup`` to read the full outputs.
+    """
     planner_tools = get_default_toolkit()
     research_tools = get_default_toolkit()
     writer_tools = get_default_toolkit()
     reviewer_tools = get_default_toolkit()
+    if context_reducer is not None:
+        for toolkit in (research_tools, writer_tools, reviewer_tools):
+            toolkit.append(TaskContextLookupTool(archive=context_reducer.archive))
 
     planner = create_planner_agent(tools=planner_tools, llm_overrides=llm_overrides)
     researcher = create_researcher_agent(tools=research_tools, llm_overrides=llm_overrides)
     writer = create_writer_agent(tools=writer_tools, llm_overrides=llm_overrides)
     reviewer = create_reviewer_agent(tools=reviewer_tools, llm_overrides=llm_overrides)
 
+    branch_researchers: dict[str, Any] = {}
+    if _parallel_research_enabled():
+        branch_researchers = {
+            name: create_researcher_agent(tools=get_default_toolkit(), llm_overrides=llm_overrides)
+            for name, _, _ in RESEARCH_BRANCHES
+        }
+
     tasks = build_workshop_tasks(
         planner,
         researcher,
         writer,
         reviewer,
         research_tools=research_tools,
+        branch_researchers=branch_researchers,
+        context_reducer=context_reducer,
     )
 
     return Crew(
-        agents=[planner, researcher, writer, reviewer],
+        agents=[planner, *branch_researchers.values(), researcher, writer, reviewer],
         tasks=tasks,
         process=Process.sequential,
         verbose=True,
@@ -97,13 +141,160 @@ def _sanitize_overrides(overrides: dict[str, Any]) -> dict[str, Any]:
     for key in ("extra_headers", "default_headers", "api_key"):
         if key in sanitized:
             sanitized[key] = "[set]"
+    if "hedge_overrides" in sanitized:
+        sanitized["hedge_overrides"] = [
+            _sanitize_overrides(backup) for backup in sanitized["hedge_overrides"]
+        ]
     return sanitized
 
 
+def _task_output_text(task_output: Any) -> str:
+    """Extract the raw text from a CrewAI task output across CrewAI versions."""
+
+    candidate = getattr(task_output, "raw", None) or getattr(task_output, "raw_output", None)
+    return str(candidate) if candidate else str(task_output)
+
+
+def _restore_task_output(task: Task, output_text: str) -> None:
+    """Attach a checkpointed output to ``task`` so later tasks can use it as context."""
+
+    from crewai.tasks.task_output import TaskOutput
+
+    agent_role = str(getattr(task.agent, "role", "") or "")
+    try:
+        task.output = TaskOutput(
+            description=task.description,
+            name=task.name,
+            expected_output=task.expected_output,
+            raw=output_text,
+            agent=agent_role,
+        )
+    except (TypeError, ValueError):
+        # Older CrewAI releases expose ``raw_output`` instead of ``raw``.
+        task.output = TaskOutput(
+            description=task.description,
+            raw_output=output_text,
+            agent=agent_role,
+        )
+
+
+def _restore_checkpointed_tasks(
+    tasks: Sequence[Task], topic: str, checkpoints: TaskCheckpointStore
+) -> dict[int, str]:
+    """Restore finished tasks and return their outputs keyed by task position.
+
+    Tasks with explicit ``context`` are restored when their own checkpoint and those of
+    all their context tasks exist, so a finished branch of a parallel fan-out is kept
+    even if a sibling failed. Tasks without explicit context depend on everything
+    before them, so only a prefix of those is restored.
+    """
+
+    positions = {id(task): index for index, task in enumerate(tasks)}
+    restored: dict[int, str] = {}
+    for index, task in enumerate(tasks):
+        if isinstance(task.context, list):
+            dependencies = [positions[id(dep)] for dep in task.context if id(dep) in positions]
+        else:
+            dependencies = list(range(index))
+        if any(dep not in restored for dep in dependencies):
+            continue
+        output_text = checkpoints.load(topic, task)
+        if output_text is None:
+            continue
+        _restore_task_output(task, output_text)
+        restored[index] = output_text
+    return restored
+
+
+def _attach_checkpoint_callbacks(
+    tasks: Sequence[Task], topic: str, checkpoints: TaskCheckpointStore
+) -> None:
+    """Checkpoint every task as soon as CrewAI reports it finished."""
+
+    for task in tasks:
+        existing_callback = task.callback
+
+        def _checkpoint(task_output: Any, task: Task = task, existing_callback=existing_callback) -> None:
+            checkpoints.save(topic, task, _task_output_text(task_output))
+            if existing_callback is not None:
+                existing_callback(task_output)
+
+        task.callback = _checkpoint
+
+
+def _log_llm_cache_stats(crew: Crew) -> None:
+    """Log the response-cache hit rate of this crew's LLMs, if caching is enabled."""
+
+    run_stats: CacheStats | None = None
+    for agent in crew.agents:
+        agent_stats = getattr(agent.llm, "cache_stats", None)
+        if agent_stats is not None:
+            run_stats = agent_stats if run_stats is None else run_stats.merge(agent_stats)
+    if run_stats is not None:
+        logger.info("LLM response cache stats for this run: %s", run_stats.as_dict())
+
+
+def _log_prompt_stats(crew: Crew) -> None:
+    """Log each persona's static prompt size, the tokens the compact style saves and measured call stats."""
+
+    style = prompt_style_from_env()
+    personas = [planner_agent.PERSONA, researcher_agent.PERSONA, writer_agent.PERSONA, reviewer_agent.PERSONA]
+    by_role: dict[str, AgentPersona] = {persona.fields(style)["role"]: persona for persona in personas}
+    run_stats: dict[str, PromptStats] = {}
+    for agent in crew.agents:
+        persona = by_role.get(str(agent.role))
+        agent_stats = getattr(agent.llm, "prompt_stats", None)
+        if persona is None or agent_stats is None:
+            continue
+        previous = run_stats.get(persona.name)
+        run_stats[persona.name] = agent_stats if previous is None else previous.merge(agent_stats)
+    for persona in personas:
+        if persona.name in run_stats:
+            logger.info("Prompt stats for %s: %s", persona.name, prompt_report(persona, style, run_stats[persona.name]))
+
+
 def _execute_crew(
-    topic: str, overrides: dict[str, Any], config: OpenRouterLLMConfig
+    topic: str,
+    overrides: dict[str, Any],
+    config: OpenRouterLLMConfig,
+    checkpoints: TaskCheckpointStore,
+    on_event: EventSink | None = None,
+    tracer: Tracer | None = None,
 ) -> str:
-    crew = create_workshop_crew(llm_overrides=overrides)
+    context_reducer = ContextReducer.from_env()
+    crew = create_workshop_crew(llm_overrides=overrides, context_reducer=context_reducer)
+    all_tasks = list(crew.tasks)
+    restored = _restore_checkpointed_tasks(all_tasks, topic, checkpoints)
+    if context_reducer is not None:
+        # Checkpoints hold full outputs; later tasks should see the same condensed context.
+        for index in restored:
+            context_reducer.reduce_restored(all_tasks[index])
+    if on_event is not None:
+        for index, output_text in restored.items():
+            on_event(PipelineEvent(kind=TASK_RESTORED, task=all_tasks[index].name, text=output_text))
+    if len(restored) == len(all_tasks):
+        logger.info("All %d tasks restored from checkpoints for topic: %s", len(all_tasks), topic)
+        return restored[len(all_tasks) - 1]
+
+    positions = {id(task): index for index, task in enumerate(all_tasks)}
+    pending = [task for index, task in enumerate(all_tasks) if index not in restored]
+    _attach_checkpoint_callbacks(pending, topic, checkpoints)
+    if restored:
+        # Sequential crews pass every earlier output as context; keep that explicit
+        # once the finished tasks are no longer part of the crew.
+        for task in pending:
+            if not isinstance(task.context, list):
+                task.context = all_tasks[: positions[id(task)]]
+        # A crew may not end with an asynchronous task.
+        pending[-1].async_execution = False
+        crew.tasks = pending
+        logger.info(
+            "Resuming crew at task '%s' (%d/%d tasks restored from checkpoints)",
+            pending[0].name,
+            len(restored),
+            len(all_tasks),
+        )
+
     provider_label = overrides.get("provider", "openrouter-liteLLM")
     model_label = overrides.get("model", config.model)
     base_url_label = overrides.get("base_url", config.base_url)
@@ -114,13 +305,26 @@ def _execute_crew(
         model_label,
         base_url_label,
     )
-    result = crew.kickoff(inputs={"topic": topic})
+    trace_context = (
+        trace_crew(tracer, crew, topic=topic, provider=provider_label, model=model_label)
+        if tracer is not None
+        else nullcontext()
+    )
+    with trace_context, stream_crew_events(crew, on_event) if on_event else nullcontext():
+        if tracer is not None:
+            for index in restored:
+                record_restored_task(tracer, str(all_tasks[index].name))
+        result = crew.kickoff(inputs={"topic": topic})
 
     for task in crew.tasks:
         task_output = getattr(task, "output", None)
         if task_output:
             logger.info("Task '%s' output:\n%s", task.name, task_output)
 
+    logger.info("Vector store registry stats: %s", get_vectorstore_registry().snapshot())
+    _log_llm_cache_stats(crew)
+    _log_prompt_stats(crew)
+
     if isinstance(result, str):
         logger.info("Crew completed with final output length=%d characters", len(result))
         return result
@@ -136,16 +340,48 @@ def _execute_crew(
     return output_text
 
 
-def run_workshop_pipeline(topic: str) -> str:
-    """Run the crew for a given workshop topic with OpenRouter fallback attempts."""
+def run_workshop_pipeline(
+    topic: str,
+    checkpoints: TaskCheckpointStore | None = None,
+    limiter: "ProviderConcurrencyLimiter | None" = None,
+    on_event: EventSink | None = None,
+    tracer: Tracer | None = None,
+) -> str:
+    """Run the crew for a given workshop topic with OpenRouter fallback attempts.
+
+    Finished tasks are checkpointed, so a fallback attempt (or a rerun using the same
+    on-disk ``checkpoints`` directory) resumes from the first unfinished task. When a
+    ``limiter`` is given, each attempt holds a concurrency slot for its provider.
+    ``on_event`` receives live token, task and tool events while the crew runs.
+    Attempts are ordered by recent endpoint health, so providers whose circuit is
+    open are only tried after the healthy ones.
+    With ``LLM_HEDGE_MODE`` enabled, slow LLM calls are also raced against the next
+    attempt's provider/model instead of waiting for the whole attempt to fail.
+    A ``tracer`` records crew, task, LLM-call and tool-call spans for every attempt.
+    """
 
     config = OpenRouterLLMConfig()
-    attempts = _build_llm_attempts(config)
+    if checkpoints is None:
+        checkpoints = TaskCheckpointStore.from_env()
+    health = get_provider_health()
+    remaining = _build_llm_attempts(config)
+    hedging = config.hedge_policy().enabled
 
     last_error: Exception | None = None
-    total_attempts = len(attempts)
-
-    for index, overrides in enumerate(attempts, start=1):
+    total_attempts = len(remaining)
+
+    for index in range(1, total_attempts + 1):
+        # Re-rank before every attempt: the failed attempt may have tripped other circuits.
+        remaining = health.order_attempts(remaining, config.attempt_endpoint_keys)
+        overrides = remaining.pop(0)
+        if any(health.is_open(key) for key in config.attempt_endpoint_keys(overrides)):
+            logger.warning(
+                "Attempt %d/%d targets an endpoint whose circuit is still open (no healthy endpoint left)",
+                index,
+                total_attempts,
+            )
+        if hedging and remaining:
+            overrides = {**overrides, "hedge_overrides": remaining[:1]}
         try:
             if overrides:
                 logger.info(
@@ -154,7 +390,9 @@ def run_workshop_pipeline(topic: str) -> str:
                     total_attempts,
                     _sanitize_overrides(overrides),
                 )
-            result = _execute_crew(topic, overrides, config)
+            provider = overrides.get("provider", "openrouter")
+            with limiter.slot(provider) if limiter else nullcontext():
+                result = _execute_crew(topic, overrides, config, checkpoints, on_event, tracer)
             if index > 1:
                 logger.info(
                     "Fallback succeeded on attempt %d/%d with overrides: %s",
@@ -162,6 +400,7 @@ def run_workshop_pipeline(topic: str) -> str:
                     total_attempts,
                     _sanitize_overrides(overrides),
                 )
+            checkpoints.clear(topic)
             return result
         except Exception as exc:  # pragma: no cover - runtime resilience path
             last_error = exc
@@ -171,6 +410,17 @@ def run_workshop_pipeline(topic: str) -> str:
                 total_attempts,
                 _sanitize_overrides(overrides),
             )
+            if on_event is not None:
+                on_event(
+                    PipelineEvent(
+                        kind=ATTEMPT_FAILED,
+                        text=str(exc),
+                        data={"attempt": index, "total_attempts": total_attempts},
+                    )
+                )
+        finally:
+            # Persist what this attempt taught the tracker before the next run reads it.
+            health.flush()
 
     assert last_error is not None  # defensive: should be set if all attempts failed
     raise last_error
@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 import sys
+import time
 from pathlib import Path
 
 import streamlit as st
@@ -12,10 +13,53 @@ PROJECT_ROOT = Path(__file__).resolve().parents[1]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.append(str(PROJECT_ROOT))
 
+from jobs import JobQueueFullError, PipelineJobManager  # noqa: E402  # pylint: disable=wrong-import-position
 from main import run_pipeline  # noqa: E402  # pylint: disable=wrong-import-position
+from streaming import (  # noqa: E402  # pylint: disable=wrong-import-position
+    ATTEMPT_FAILED,
+    TASK_FINISHED,
+    TASK_RESTORED,
+    TOKEN,
+    TOOL_CALLED,
+    PipelineEvent,
+)
 
 load_dotenv()
 
+POLL_INTERVAL_SECONDS = 1
+
+
+@st.cache_resource
+def get_job_manager() -> PipelineJobManager:
+    """One background job manager shared by every session on this Streamlit worker."""
+    return PipelineJobManager.from_env(runner=run_pipeline)
+
+
+def render_progress(events: list[PipelineEvent]) -> None:
+    """Render live per-task progress (status, tool calls and streamed tokens)."""
+    tasks: dict[str, dict[str, object]] = {}
+    for event in events:
+        if not event.task:
+            if event.kind == ATTEMPT_FAILED:
+                st.warning(f"Attempt {event.data.get('attempt')} failed, retrying with a fallback: {event.text}")
+            continue
+        entry = tasks.setdefault(event.task, {"state": "running", "text": "", "tools": []})
+        if event.kind == TOKEN:
+            entry["text"] = f"{entry['text']}{event.text}"
+        elif event.kind == TOOL_CALLED:
+            entry["tools"].append(event.text)
+        elif event.kind in (TASK_FINISHED, TASK_RESTORED):
+            entry["state"] = "restored" if event.kind == TASK_RESTORED else "finished"
+            entry["text"] = event.text
+
+    for task_name, entry in tasks.items():
+        icon = {"running": "⏳", "finished": "✅", "restored": "♻️"}[str(entry["state"])]
+        with st.expander(f"{icon} {task_name}", expanded=entry["state"] == "running"):
+            if entry["tools"]:
+                st.caption("Tool calls: " + ", ".join(entry["tools"]))
+            st.markdown(entry["text"] or "_Waiting for the first tokens..._")
+
+
 st.set_page_config(page_title="Agentic AI Workshop", page_icon="🧠", layout="wide")
 
 st.title("Agentic AI Workshop: Multi-Agent Systems From Idea to Deployment")
@@ -31,17 +75,44 @@ with st.sidebar:
     topic = st.text_input("Workshop Topic", value=default_topic)
     run_button = st.button("Run Pipeline", type="primary")
 
+job_manager = get_job_manager()
+
 if run_button:
-    st.info("Starting the agentic pipeline. This may take a few minutes depending on model latency.")
-    with st.spinner("Agents working..."):
-        try:
-            output = run_pipeline(topic)
-        except Exception as exc:
-            st.error(f"Pipeline failed: {exc}")
-        else:
-            st.success("Pipeline completed successfully!")
-            st.markdown("### Final Output")
-            st.markdown(output)
+    try:
+        st.session_state["job_id"] = job_manager.submit(topic)
+    except JobQueueFullError as exc:
+        st.warning(str(exc))
+
+job_id = st.session_state.get("job_id")
+if job_id:
+    try:
+        job_status = job_manager.status(job_id)
+    except KeyError:
+        st.session_state.pop("job_id", None)
+        job_status = None
+
+    if job_status is None:
+        st.warning("The previous run is no longer available. Start a new one from the sidebar.")
+    elif job_status["state"] == "queued":
+        st.info(f"Waiting for a free worker (position {job_status['queue_position']} in the queue)...")
+    elif job_status["state"] == "running":
+        elapsed = time.time() - job_status["started_at"]
+        st.info(
+            "Agents working on the pipeline. This may take a few minutes depending on model latency "
+            f"({elapsed:.0f}s elapsed)."
+        )
+        render_progress(job_manager.events(job_id))
+    elif job_status["state"] == "failed":
+        st.error(f"Pipeline failed: {job_status['error']}")
+    else:
+        st.success("Pipeline completed successfully!")
+        st.markdown("### Final Output")
+        st.markdown(job_manager.result(job_id))
+
+    if job_status is not None and job_status["state"] in ("queued", "running"):
+        # Poll without holding the script thread for the whole run.
+        time.sleep(POLL_INTERVAL_SECONDS)
+        st.rerun()
 
 st.markdown("---")
 st.caption(
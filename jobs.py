@@ -0,0 +1,179 @@
+"""Background job API so callers can submit pipeline runs without blocking."""
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from crew import run_workshop_pipeline
+from streaming import PipelineEvent
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+
+class JobQueueFullError(RuntimeError):
+    """Raised when the job manager is at capacity and cannot accept more work."""
+
+
+@dataclass
+class PipelineJob:
+    job_id: str
+    topic: str
+    state: str = QUEUED
+    submitted_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Optional[str] = None
+    error: Optional[str] = None
+    events: List[PipelineEvent] = field(default_factory=list, repr=False)
+    future: Optional[Future] = field(default=None, repr=False)
+
+    @property
+    def done(self) -> bool:
+        return self.state in (SUCCEEDED, FAILED)
+
+
+class PipelineJobManager:
+    """Run pipeline jobs on a bounded background executor.
+
+    At most ``max_workers`` jobs run at once and up to ``max_pending`` more wait in
+    the queue; further submissions raise :class:`JobQueueFullError`. Finished jobs
+    are kept for ``retention_seconds`` so clients can poll for their results.
+
+    ``runner`` is called as ``runner(topic, on_event=callback)`` and its streaming
+    events are buffered per job for :meth:`events`.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_workers: int = 2,
+        max_pending: int = 8,
+        retention_seconds: float = 3600,
+        runner: Callable[..., str] = run_workshop_pipeline,
+    ) -> None:
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.retention_seconds = retention_seconds
+        self._runner = runner
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="workshop-job")
+        self._jobs: Dict[str, PipelineJob] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, runner: Callable[..., str] = run_workshop_pipeline) -> "PipelineJobManager":
+        """Build a manager sized by ``WORKSHOP_JOB_WORKERS`` and ``WORKSHOP_JOB_QUEUE``."""
+
+        return cls(
+            max_workers=int(os.getenv("WORKSHOP_JOB_WORKERS", "2")),
+            max_pending=int(os.getenv("WORKSHOP_JOB_QUEUE", "8")),
+            runner=runner,
+        )
+
+    def submit(self, topic: str) -> str:
+        """Queue a pipeline run for ``topic`` and return its job id."""
+
+        with self._lock:
+            self._prune_finished()
+            active = sum(1 for job in self._jobs.values() if not job.done)
+            if active >= self.max_workers + self.max_pending:
+                raise JobQueueFullError(
+                    f"Pipeline queue is full ({active} active jobs). Try again shortly."
+                )
+            job = PipelineJob(job_id=uuid.uuid4().hex, topic=topic)
+            self._jobs[job.job_id] = job
+            job.future = self._executor.submit(self._run_job, job)
+        logger.info("Queued pipeline job %s for topic: %s", job.job_id, topic)
+        return job.job_id
+
+    def status(self, job_id: str) -> Dict[str, Any]:
+        """Return a JSON-serialisable snapshot of the job's progress."""
+
+        job = self._get(job_id)
+        with self._lock:
+            queue_position = None
+            if job.state == QUEUED:
+                queued = sorted(
+                    (other for other in self._jobs.values() if other.state == QUEUED),
+                    key=lambda other: other.submitted_at,
+                )
+                queue_position = queued.index(job) + 1
+            return {
+                "job_id": job.job_id,
+                "topic": job.topic,
+                "state": job.state,
+                "queue_position": queue_position,
+                "submitted_at": job.submitted_at,
+                "started_at": job.started_at,
+                "finished_at": job.finished_at,
+                "error": job.error,
+                "event_count": len(job.events),
+            }
+
+    def events(self, job_id: str, since: int = 0) -> List[PipelineEvent]:
+        """Return the streaming events recorded for the job, starting at index ``since``."""
+
+        job = self._get(job_id)
+        with self._lock:
+            return list(job.events[since:])
+
+    def result(self, job_id: str, timeout: float | None = None) -> str:
+        """Wait up to ``timeout`` seconds for the job and return its output.
+
+        Raises ``TimeoutError`` if the job is still running and ``RuntimeError`` if it failed.
+        """
+
+        job = self._get(job_id)
+        assert job.future is not None
+        job.future.result(timeout=timeout)
+        if job.state == FAILED:
+            raise RuntimeError(f"Pipeline job {job_id} failed: {job.error}")
+        return str(job.result)
+
+    def _get(self, job_id: str) -> PipelineJob:
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is None:
+            raise KeyError(f"Unknown pipeline job: {job_id}")
+        return job
+
+    def _run_job(self, job: PipelineJob) -> None:
+        with self._lock:
+            job.state = RUNNING
+            job.started_at = time.time()
+        try:
+            output = self._runner(job.topic, on_event=job.events.append)
+        except Exception as exc:  # pragma: no cover - runtime resilience path
+            logger.exception("Pipeline job %s failed", job.job_id)
+            with self._lock:
+                job.state = FAILED
+                job.error = str(exc)
+                job.finished_at = time.time()
+            return
+        with self._lock:
+            job.state = SUCCEEDED
+            job.result = output
+            job.finished_at = time.time()
+        logger.info("Pipeline job %s finished in %.1fs", job.job_id, job.finished_at - job.started_at)
+
+    def _prune_finished(self) -> None:
+        cutoff = time.time() - self.retention_seconds
+        for job_id in [
+            job_id
+            for job_id, job in self._jobs.items()
+            if job.done and job.finished_at is not None and job.finished_at < cutoff
+        ]:
+            del self._jobs[job_id]
+
+    def shutdown(self, wait: bool = False) -> None:
+        self._executor.shutdown(wait=wait, cancel_futures=True)
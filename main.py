@@ -3,19 +3,117 @@ from __future__ import annotations
 
 import argparse
 import logging
+import sys
+from pathlib import Path
 
 from dotenv import load_dotenv
 
+from batch import parse_provider_limits, read_topics, run_batch
+from checkpoints import TaskCheckpointStore
 from crew import run_workshop_pipeline
 from config.logging_config import configure_logging
+from config.tracing import TRACE_FORMATS, Tracer
+from streaming import (
+    ATTEMPT_FAILED,
+    PIPELINE_FAILED,
+    PIPELINE_FINISHED,
+    TASK_FINISHED,
+    TASK_RESTORED,
+    TASK_STARTED,
+    TOKEN,
+    TOOL_CALLED,
+    EventSink,
+    PipelineEvent,
+    iter_pipeline_events,
+)
 
 
-def run_pipeline(topic: str) -> str:
-    """Run the configured crew against the provided workshop topic."""
+def run_pipeline(
+    topic: str,
+    checkpoint_dir: Path | None = None,
+    fresh: bool = False,
+    on_event: EventSink | None = None,
+    tracer: Tracer | None = None,
+) -> str:
+    """Run the configured crew against the provided workshop topic.
+
+    With ``checkpoint_dir`` (or ``WORKSHOP_CHECKPOINT_DIR``) finished tasks are stored on
+    disk and a rerun resumes an interrupted run; ``fresh`` discards those checkpoints.
+    ``tracer`` collects timing spans for the crew, its tasks, LLM calls and tool calls.
+    """
     load_dotenv()
     configure_logging()
     logging.getLogger(__name__).info("Starting workshop pipeline for topic: %s", topic)
-    return run_workshop_pipeline(topic)
+    checkpoints = (
+        TaskCheckpointStore(checkpoint_dir) if checkpoint_dir else TaskCheckpointStore.from_env()
+    )
+    if fresh:
+        checkpoints.clear(topic)
+    return run_workshop_pipeline(topic, checkpoints=checkpoints, on_event=on_event, tracer=tracer)
+
+
+def _print_event(event: PipelineEvent) -> None:
+    """Render a streaming event on stdout as soon as it arrives."""
+    if event.kind == TOKEN:
+        sys.stdout.write(event.text)
+    elif event.kind == TASK_STARTED:
+        sys.stdout.write(f"\n\n=== Task started: {event.task} ===\n")
+    elif event.kind == TOOL_CALLED:
+        sys.stdout.write(f"\n[{event.task}] tool call: {event.text}\n")
+    elif event.kind == TASK_FINISHED:
+        sys.stdout.write(f"\n=== Task finished: {event.task} ===\n")
+    elif event.kind == TASK_RESTORED:
+        sys.stdout.write(f"=== Task restored from checkpoint: {event.task} ===\n")
+    elif event.kind == ATTEMPT_FAILED:
+        sys.stdout.write(f"\n!!! Attempt {event.data.get('attempt')} failed: {event.text}\n")
+    elif event.kind == PIPELINE_FINISHED:
+        sys.stdout.write(f"\n\n=== Final output ===\n{event.text}\n")
+    elif event.kind == PIPELINE_FAILED:
+        sys.stdout.write(f"\n\nPipeline failed: {event.text}\n")
+    sys.stdout.flush()
+
+
+def _finish_trace(tracer: Tracer, trace_path: Path, trace_format: str) -> None:
+    """Export the collected spans and print the timing summary to stderr."""
+    tracer.export(trace_path, trace_format)
+    sys.stderr.write(f"\n=== Trace summary ({trace_path}) ===\n{tracer.format_summary()}\n")
+    sys.stderr.flush()
+
+
+def run_batch_pipeline(
+    topics_file: Path | str,
+    output_path: Path,
+    *,
+    workers: int = 4,
+    provider_limits: list[str] | None = None,
+    default_provider_limit: int | None = None,
+    checkpoint_dir: Path | None = None,
+    fresh: bool = False,
+    tracer: Tracer | None = None,
+) -> None:
+    """Run every topic in ``topics_file`` concurrently, streaming results to ``output_path``.
+
+    All crews share one checkpoint store and, when given, one ``tracer``.
+    """
+    load_dotenv()
+    configure_logging()
+    checkpoints = (
+        TaskCheckpointStore(checkpoint_dir) if checkpoint_dir else TaskCheckpointStore.from_env()
+    )
+    summary = run_batch(
+        read_topics(topics_file),
+        output_path,
+        max_workers=workers,
+        provider_limits=parse_provider_limits(provider_limits or []),
+        default_provider_limit=default_provider_limit,
+        checkpoints=checkpoints,
+        fresh=fresh,
+        tracer=tracer,
+    )
+    print(
+        f"Processed {summary.total} topics ({summary.succeeded} succeeded, {summary.failed} failed) "
+        f"in {summary.elapsed_seconds:.1f}s. Results: {output_path}"
+    )
 
 
 def _parse_args() -> argparse.Namespace:
@@ -25,10 +123,113 @@ def _parse_args() -> argparse.Namespace:
         default="Agentic AI Workshop on Multi-Agent Systems",
         help="High-level theme to guide the crew's planning and content creation.",
     )
-    return parser.parse_args()
+    parser.add_argument(
+        "--checkpoint-dir",
+        type=Path,
+        default=None,
+        help="Directory for task checkpoints so an interrupted run resumes on the next invocation.",
+    )
+    parser.add_argument(
+        "--fresh",
+        action="store_true",
+        help="Ignore and discard existing checkpoints for the topic.",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Print LLM tokens, tool calls and task boundaries live while the crew runs.",
+    )
+    parser.add_argument(
+        "--trace",
+        type=Path,
+        default=None,
+        metavar="PATH",
+        help="Record crew, task, LLM-call and tool-call spans to PATH and print a timing summary.",
+    )
+    parser.add_argument(
+        "--trace-format",
+        choices=TRACE_FORMATS,
+        default="jsonl",
+        help="Trace file format: one JSON span per line, or an OpenTelemetry OTLP/JSON document.",
+    )
+    parser.add_argument(
+        "--topics-file",
+        default=None,
+        help="Batch mode: text file with one topic per line or JSONL with a 'topic' field ('-' for stdin).",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=Path("outputs") / "batch_results.jsonl",
+        help="Batch mode: JSONL file that receives one result per topic as it finishes.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="Batch mode: number of crews to run concurrently.",
+    )
+    parser.add_argument(
+        "--provider-limit",
+        action="append",
+        default=[],
+        metavar="PROVIDER=N",
+        help="Batch mode: maximum concurrent crews per provider (e.g. openrouter=3). Repeatable.",
+    )
+    parser.add_argument(
+        "--default-provider-limit",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Batch mode: maximum concurrent crews for providers without a --provider-limit.",
+    )
+    args = parser.parse_args()
+    if args.topics_file and args.stream:
+        parser.error("--stream cannot be combined with --topics-file; batch results go to --output.")
+    if args.default_provider_limit is not None and args.default_provider_limit < 1:
+        parser.error("--default-provider-limit must be at least 1.")
+    return args
 
 
 if __name__ == "__main__":
     args = _parse_args()
-    output = run_pipeline(args.topic)
-    print(output)
+    tracer = Tracer() if args.trace else None
+    if args.topics_file:
+        try:
+            run_batch_pipeline(
+                args.topics_file,
+                args.output,
+                workers=args.workers,
+                provider_limits=args.provider_limit,
+                default_provider_limit=args.default_provider_limit,
+                checkpoint_dir=args.checkpoint_dir,
+                fresh=args.fresh,
+                tracer=tracer,
+            )
+        finally:
+            if tracer is not None:
+                _finish_trace(tracer, args.trace, args.trace_format)
+    else:
+        try:
+            if args.stream:
+                final_event = None
+                for final_event in iter_pipeline_events(
+                    lambda sink: run_pipeline(
+                        args.topic,
+                        checkpoint_dir=args.checkpoint_dir,
+                        fresh=args.fresh,
+                        on_event=sink,
+                        tracer=tracer,
+                    )
+                ):
+                    _print_event(final_event)
+                if final_event is not None and final_event.kind == PIPELINE_FAILED:
+                    sys.exit(1)
+            else:
+                output = run_pipeline(
+                    args.topic, checkpoint_dir=args.checkpoint_dir, fresh=args.fresh, tracer=tracer
+                )
+                print(output)
+        finally:
+            if tracer is not None:
+                _finish_trace(tracer, args.trace, args.trace_format)
@@ -1,8 +1,24 @@
-"""Utility script to build the FAISS vector store backing the local RAG tool."""
+"""Utility script to build the FAISS vector store backing the local RAG tool.
+
+Builds are incremental: a manifest of file and chunk content hashes is stored next to
+the index, and each run only embeds new or changed chunks and removes deleted ones.
+Files are read and split in a process pool while the main process embeds chunks in
+fixed-size batches and appends them to the index, so memory stays bounded. A BM25
+lexical index over the final chunk set is written alongside for hybrid retrieval.
+"""
 from __future__ import annotations
 
+import argparse
+import hashlib
+import inspect
+import json
+import os
 import sys
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Tuple
 
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from langchain_community.vectorstores import FAISS
@@ -12,34 +28,404 @@ PROJECT_ROOT = Path(__file__).resolve().parents[1]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.append(str(PROJECT_ROOT))
 
+from tools.embedding_cache import CachedEmbeddings, EmbeddingCache, embedding_cache_dir_from_env
+from tools.lexical_index import build_lexical_index
+from tools.mmap_store import QUANTIZATIONS, SERVING_INDEX_TYPES, SERVING_META_FILE, export_serving_index
 from tools.rag_tool import DEFAULT_EMBEDDING_MODEL
 
 BASE_DIR = Path(__file__).resolve().parent
 DOCUMENTS_DIR = BASE_DIR / "documents"
 VECTORSTORE_DIR = BASE_DIR / "vectorstore"
-DEFAULT_DOC = DOCUMENTS_DIR / "sample_docs.txt"
+MANIFEST_FILE = "manifest.json"
+MANIFEST_VERSION = 1
+DOCUMENT_SUFFIXES = (".txt", ".md")
+DEFAULT_BATCH_SIZE = 256
+DEFAULT_ENCODE_BATCH_SIZE = 32
+
+
+@dataclass
+class BuildReport:
+    files_scanned: int = 0
+    files_changed: int = 0
+    files_removed: int = 0
+    chunks_added: int = 0
+    chunks_removed: int = 0
+    chunks_unchanged: int = 0
+
 
+def _sha256(data: str) -> str:
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+def discover_documents(documents_dir: Path) -> List[Path]:
+    """Return every supported document below ``documents_dir`` in a stable order."""
+    return sorted(
+        path
+        for path in documents_dir.rglob("*")
+        if path.is_file() and path.suffix.lower() in DOCUMENT_SUFFIXES
+    )
 
-def build_vector_store(doc_path: Path = DEFAULT_DOC, *, chunk_size: int = 600, chunk_overlap: int = 50) -> None:
-    """Build a FAISS index from the supplied document."""
-    if not doc_path.exists():
-        raise FileNotFoundError(f"Document source not found at {doc_path}")
 
-    text = doc_path.read_text(encoding="utf-8")
+def split_document(text: str, *, chunk_size: int, chunk_overlap: int) -> List[str]:
     splitter = RecursiveCharacterTextSplitter(
         chunk_size=chunk_size,
         chunk_overlap=chunk_overlap,
         separators=["\n\n", "\n", " "],
     )
-    chunks = splitter.split_text(text)
+    return splitter.split_text(text)
+
+
+def chunk_ids_for(source: str, chunks: List[str]) -> List[str]:
+    """Content-address chunks so unchanged text keeps its id across edits."""
+    ids: List[str] = []
+    seen: Dict[str, int] = {}
+    for chunk in chunks:
+        base_id = _sha256(f"{source}\0{chunk}")[:32]
+        occurrence = seen.get(base_id, 0)
+        seen[base_id] = occurrence + 1
+        ids.append(base_id if occurrence == 0 else f"{base_id}-{occurrence}")
+    return ids
+
+
+def load_and_split(
+    path: str,
+    previous_hash: Optional[str],
+    chunk_size: int,
+    chunk_overlap: int,
+) -> Tuple[str, Optional[List[str]]]:
+    """Process-pool worker: hash a file and split it unless it is unchanged."""
+    text = Path(path).read_text(encoding="utf-8")
+    file_hash = _sha256(text)
+    if file_hash == previous_hash:
+        return file_hash, None
+    return file_hash, split_document(text, chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+
+
+class BatchEmbedder:
+    """Embed chunk batches, optionally across several CPU worker processes.
+
+    When an embedding cache is configured, only texts missing from it are encoded.
+    """
 
-    embeddings = HuggingFaceEmbeddings(model_name=DEFAULT_EMBEDDING_MODEL)
-    vector_store = FAISS.from_texts(chunks, embedding=embeddings)
+    def __init__(
+        self,
+        embeddings: HuggingFaceEmbeddings,
+        *,
+        cache: CachedEmbeddings | None = None,
+        workers: int = 1,
+        batch_size: int = DEFAULT_ENCODE_BATCH_SIZE,
+    ) -> None:
+        self._embeddings = embeddings
+        self._cache = cache
+        self._pool = None
+        # The encode_kwargs embed_documents passes to ``encode``, plus the build batch size.
+        self._encode_kwargs = {"batch_size": batch_size, **(embeddings.encode_kwargs or {})}
+        if workers > 1:
+            accepted = inspect.signature(embeddings.client.encode_multi_process).parameters
+            unsupported = sorted(set(self._encode_kwargs) - set(accepted))
+            if unsupported:
+                # Vectors must match the single-process path: they share cache keys.
+                print(
+                    "Embedding in one process: encode_multi_process does not accept "
+                    f"encode_kwargs {', '.join(unsupported)}"
+                )
+            else:
+                # sentence-transformers fans encoding out to one process per target device.
+                self._pool = embeddings.client.start_multi_process_pool(target_devices=["cpu"] * workers)
 
-    VECTORSTORE_DIR.mkdir(parents=True, exist_ok=True)
-    vector_store.save_local(str(VECTORSTORE_DIR))
-    print(f"Vector store saved to {VECTORSTORE_DIR}")
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        if self._cache is not None:
+            return self._cache.embed_with(texts, self._encode)
+        return self._encode(texts)
+
+    def _encode(self, texts: List[str]) -> List[List[float]]:
+        if self._pool is None:
+            return self._embeddings.embed_documents(texts)
+        # Mirror HuggingFaceEmbeddings.embed_documents, which replaces newlines before encoding.
+        prepared = [text.replace("\n", " ") for text in texts]
+        vectors = self._embeddings.client.encode_multi_process(prepared, self._pool, **self._encode_kwargs)
+        return vectors.tolist()
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._embeddings.client.stop_multi_process_pool(self._pool)
+            self._pool = None
+
+
+def _load_manifest(vectorstore_dir: Path) -> Dict[str, Any]:
+    manifest_path = vectorstore_dir / MANIFEST_FILE
+    if not manifest_path.exists():
+        return {}
+    return json.loads(manifest_path.read_text(encoding="utf-8"))
+
+
+def _load_serving_meta(vectorstore_dir: Path) -> Dict[str, Any]:
+    meta_path = vectorstore_dir / SERVING_META_FILE
+    if not meta_path.exists():
+        return {}
+    return json.loads(meta_path.read_text(encoding="utf-8"))
+
+
+def _write_manifest(vectorstore_dir: Path, manifest: Dict[str, Any]) -> None:
+    manifest_path = vectorstore_dir / MANIFEST_FILE
+    tmp_path = manifest_path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(manifest, indent=2, sort_keys=True), encoding="utf-8")
+    tmp_path.replace(manifest_path)
+
+
+def build_vector_store(
+    documents_dir: Path = DOCUMENTS_DIR,
+    vectorstore_dir: Path = VECTORSTORE_DIR,
+    *,
+    chunk_size: int = 600,
+    chunk_overlap: int = 50,
+    rebuild: bool = False,
+    workers: int | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    encode_batch_size: int = DEFAULT_ENCODE_BATCH_SIZE,
+    embed_workers: int = 1,
+    serving_index: str | None = None,
+    quantization: str = "none",
+) -> BuildReport:
+    """Incrementally build a FAISS index from every document below ``documents_dir``.
+
+    ``workers`` processes read and split files, chunks are embedded ``batch_size`` at a
+    time (spread over ``embed_workers`` CPU processes, ``encode_batch_size`` texts per
+forward pass) and appended as batches finish.
+    With ``serving_index`` (``flat``, ``ivf`` or ``hnsw``) a memory-mapped serving copy,
+    optionally ``sq8``/``pq`` quantized, is exported for ``RAG_INDEX_MODE=mmap``.
+    """
+    if not documents_dir.exists():
+        raise FileNotFoundError(f"Document source not found at {documents_dir}")
+    documents = discover_documents(documents_dir)
+    if not documents:
+        raise FileNotFoundError(f"No {', '.join(DOCUMENT_SUFFIXES)} documents found under {documents_dir}")
+    if batch_size < 1:
+        raise ValueError("batch_size must be at least 1")
+    if encode_batch_size < 1:
+        raise ValueError("encode_batch_size must be at least 1")
+
+    settings = {
+        "embedding_model": DEFAULT_EMBEDDING_MODEL,
+        "chunk_size": chunk_size,
+        "chunk_overlap": chunk_overlap,
+    }
+    model = HuggingFaceEmbeddings(model_name=DEFAULT_EMBEDDING_MODEL)
+    cache_dir = embedding_cache_dir_from_env()
+    cached_model = (
+        CachedEmbeddings(model, EmbeddingCache(cache_dir, DEFAULT_EMBEDDING_MODEL))
+        if cache_dir is not None
+        else None
+    )
+    embeddings = cached_model or model
+
+    manifest = {} if rebuild else _load_manifest(vectorstore_dir)
+    vector_store: FAISS | None = None
+    if (
+        manifest.get("version") == MANIFEST_VERSION
+        and manifest.get("settings") == settings
+        and (vectorstore_dir / "index.faiss").exists()
+    ):
+        vector_store = FAISS.load_local(
+            folder_path=str(vectorstore_dir),
+            embeddings=embeddings,
+            allow_dangerous_deserialization=True,
+        )
+        previous_files: Dict[str, Dict[str, Any]] = manifest["files"]
+    else:
+        # Settings changed (or first build): every chunk has to be embedded again.
+        previous_files = {}
+
+    report = BuildReport(files_scanned=len(documents))
+    current_files: Dict[str, Dict[str, Any]] = {}
+    ids_to_remove: List[str] = []
+    pending_texts: List[str] = []
+    pending_ids: List[str] = []
+    pending_metadatas: List[Dict[str, Any]] = []
+    embedder = BatchEmbedder(
+        model, cache=cached_model, workers=embed_workers, batch_size=encode_batch_size
+    )
+
+    def _flush() -> None:
+        nonlocal vector_store
+        if not pending_texts:
+            return
+        vectors = embedder.embed(pending_texts)
+        text_embeddings = list(zip(pending_texts, vectors))
+        if vector_store is None:
+            vector_store = FAISS.from_embeddings(
+                text_embeddings, embeddings, metadatas=list(pending_metadatas), ids=list(pending_ids)
+            )
+        else:
+            vector_store.add_embeddings(
+                text_embeddings, metadatas=list(pending_metadatas), ids=list(pending_ids)
+            )
+        report.chunks_added += len(pending_texts)
+        print(f"Embedded {report.chunks_added} chunks so far...")
+        pending_texts.clear()
+        pending_ids.clear()
+        pending_metadatas.clear()
+
+    pool_size = workers or os.cpu_count() or 1
+    pending_files = iter(documents)
+    try:
+        with ProcessPoolExecutor(max_workers=pool_size) as executor:
+            # Keep a bounded window of split jobs in flight so splitting runs ahead of
+            # embedding without buffering the whole corpus in memory.
+            in_flight: Deque[Tuple[str, Future]] = deque()
+
+            def _submit_next() -> None:
+                path = next(pending_files, None)
+                if path is None:
+                    return
+                source = path.relative_to(documents_dir).as_posix()
+                previous_hash = previous_files.get(source, {}).get("sha256")
+                in_flight.append(
+                    (
+                        source,
+                        executor.submit(load_and_split, str(path), previous_hash, chunk_size, chunk_overlap),
+                    )
+                )
+
+            for _ in range(pool_size * 4):
+                _submit_next()
+
+            while in_flight:
+                source, future = in_flight.popleft()
+                _submit_next()
+                file_hash, chunks = future.result()
+                previous = previous_files.get(source)
+                if chunks is None:
+                    current_files[source] = previous
+                    report.chunks_unchanged += len(previous["chunk_ids"])
+                    continue
+
+                report.files_changed += 1
+                chunk_ids = chunk_ids_for(source, chunks)
+                old_ids = set(previous["chunk_ids"]) if previous else set()
+
+                for chunk_index, (chunk_id, chunk) in enumerate(zip(chunk_ids, chunks)):
+                    metadata = {"source": source, "chunk_index": chunk_index}
+                    if chunk_id in old_ids:
+                        # Unchanged text keeps its vector; only its position may have moved.
+                        vector_store.docstore.search(chunk_id).metadata.update(metadata)
+                        report.chunks_unchanged += 1
+                        continue
+                    pending_ids.append(chunk_id)
+                    pending_texts.append(chunk)
+                    pending_metadatas.append(metadata)
+                    if len(pending_texts) >= batch_size:
+                        _flush()
+                ids_to_remove.extend(old_ids.difference(chunk_ids))
+                current_files[source] = {"sha256": file_hash, "chunk_ids": chunk_ids}
+        _flush()
+    finally:
+        embedder.close()
+
+    for source, previous in previous_files.items():
+        if source not in current_files:
+            report.files_removed += 1
+            ids_to_remove.extend(previous["chunk_ids"])
+
+    if vector_store is not None and ids_to_remove:
+        vector_store.delete(ids_to_remove)
+    report.chunks_removed = len(ids_to_remove)
+
+    if vector_store is None:
+        raise ValueError(f"No text chunks could be produced from {documents_dir}")
+
+    vectorstore_dir.mkdir(parents=True, exist_ok=True)
+    vector_store.save_local(str(vectorstore_dir))
+    # Rebuilt from the full chunk set each run: row numbers shift whenever chunks are deleted.
+    lexical_index = build_lexical_index(vector_store)
+    lexical_index.save(vectorstore_dir)
+    print(f"Lexical index saved ({lexical_index.term_count} terms over {len(lexical_index)} chunks)")
+    _write_manifest(
+        vectorstore_dir,
+        {"version": MANIFEST_VERSION, "settings": settings, "files": current_files},
+    )
+    previous_serving = _load_serving_meta(vectorstore_dir)
+    if not serving_index and previous_serving and previous_serving.get("build_id") != lexical_index.build_id:
+        # A stale serving copy would be paired with the fresh lexical index in mmap mode.
+        serving_index = previous_serving["mode"]
+        quantization = previous_serving["quantization"]
+        print(f"Serving index is stale; re-exporting it ({serving_index}, quantization {quantization})")
+    if serving_index:
+        meta = export_serving_index(
+            vector_store, vectorstore_dir, mode=serving_index, quantization=quantization
+        )
+        print(f"Serving index exported ({meta['factory']}, {meta['ntotal']} vectors)")
+    print(
+        f"Vector store saved to {vectorstore_dir} "
+        f"({report.files_changed} changed / {report.files_removed} removed of {report.files_scanned} files; "
+        f"{report.chunks_added} chunks embedded, {report.chunks_removed} removed, "
+        f"{report.chunks_unchanged} reused)"
+    )
+    return report
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Build or update the local FAISS vector store.")
+    parser.add_argument("--documents-dir", type=Path, default=DOCUMENTS_DIR)
+    parser.add_argument("--vectorstore-dir", type=Path, default=VECTORSTORE_DIR)
+    parser.add_argument("--chunk-size", type=int, default=600)
+    parser.add_argument("--chunk-overlap", type=int, default=50)
+    parser.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="Ignore the manifest and re-embed every document.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Processes used to read and split documents (defaults to the CPU count).",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=DEFAULT_BATCH_SIZE,
+        help="Number of chunks embedded and appended to the index at a time.",
+    )
+    parser.add_argument(
+        "--encode-batch-size",
+        type=int,
+        default=DEFAULT_ENCODE_BATCH_SIZE,
+        help="Texts per sentence-transformers forward pass while embedding a batch.",
+    )
+    parser.add_argument(
+        "--embed-workers",
+        type=int,
+        default=1,
+        help="CPU processes used by sentence-transformers to compute embeddings.",
+    )
+    parser.add_argument(
+        "--serving-index",
+        choices=SERVING_INDEX_TYPES,
+        default=None,
+        help="Also export a memory-mapped serving index of this type (used with RAG_INDEX_MODE=mmap).",
+    )
+    parser.add_argument(
+        "--quantization",
+        choices=QUANTIZATIONS,
+        default="none",
+        help="Vector compression for the serving index.",
+    )
+    return parser.parse_args()
 
 
 if __name__ == "__main__":
-    build_vector_store()
+    args = _parse_args()
+    build_vector_store(
+        args.documents_dir,
+        args.vectorstore_dir,
+        chunk_size=args.chunk_size,
+        chunk_overlap=args.chunk_overlap,
+        rebuild=args.rebuild,
+        workers=args.workers,
+        batch_size=args.batch_size,
+        encode_batch_size=args.encode_batch_size,
+        embed_workers=args.embed_workers,
+        serving_index=args.serving_index,
+        quantization=args.quantization,
+    )
@@ -0,0 +1,194 @@
+"""Live progress events (LLM tokens, task boundaries, tool calls) for running crews."""
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+TASK_STARTED = "task_started"
+TASK_FINISHED = "task_finished"
+TASK_RESTORED = "task_restored"
+TOOL_CALLED = "tool_called"
+TOKEN = "token"
+ATTEMPT_FAILED = "attempt_failed"
+PIPELINE_FINISHED = "pipeline_finished"
+PIPELINE_FAILED = "pipeline_failed"
+
+
+@dataclass
+class PipelineEvent:
+    """A single progress update emitted while the pipeline runs."""
+
+    kind: str
+    task: Optional[str] = None
+    text: str = ""
+    data: Dict[str, Any] = field(default_factory=dict)
+    timestamp: float = field(default_factory=time.time)
+
+
+EventSink = Callable[[PipelineEvent], None]
+
+# CrewAI's event bus is process-wide; events are routed back to the run that owns
+# the emitting LLM or task through these registrations.
+_SINKS: Dict[tuple[str, str], tuple[EventSink, Optional[str]]] = {}
+_SINKS_LOCK = threading.Lock()
+_LISTENERS_INSTALLED: Optional[bool] = None
+
+
+def _emit(sink: EventSink, event: PipelineEvent) -> None:
+    try:
+        sink(event)
+    except Exception:  # pragma: no cover - a broken consumer must not kill the crew
+        logger.exception("Pipeline event sink failed for %s event", event.kind)
+
+
+def _lookup(kind: str, key: Any) -> Optional[tuple[EventSink, Optional[str]]]:
+    with _SINKS_LOCK:
+        return _SINKS.get((kind, str(key)))
+
+
+def _install_listeners() -> bool:
+    """Subscribe once to CrewAI's event bus; returns ``False`` on versions without it."""
+
+    global _LISTENERS_INSTALLED
+    if _LISTENERS_INSTALLED is not None:
+        return _LISTENERS_INSTALLED
+
+    try:
+        from crewai.events import (
+            LLMStreamChunkEvent,
+            TaskStartedEvent,
+            ToolUsageStartedEvent,
+            crewai_event_bus,
+        )
+    except ImportError:
+        try:
+            from crewai.utilities.events import (
+                LLMStreamChunkEvent,
+                TaskStartedEvent,
+                ToolUsageStartedEvent,
+                crewai_event_bus,
+            )
+        except ImportError:
+            logger.info("CrewAI event bus unavailable; streaming only reports finished tasks.")
+            _LISTENERS_INSTALLED = False
+            return False
+
+    @crewai_event_bus.on(LLMStreamChunkEvent)
+    def _on_stream_chunk(source: Any, event: Any) -> None:
+        entry = _lookup("llm", id(source))
+        if entry is not None and getattr(event, "chunk", None):
+            sink, task_name = entry
+            _emit(sink, PipelineEvent(kind=TOKEN, task=task_name, text=str(event.chunk)))
+
+    @crewai_event_bus.on(TaskStartedEvent)
+    def _on_task_started(source: Any, event: Any) -> None:
+        task = getattr(event, "task", None) or source
+        entry = _lookup("task", getattr(task, "id", id(task)))
+        if entry is not None:
+            sink, task_name = entry
+            _emit(sink, PipelineEvent(kind=TASK_STARTED, task=task_name))
+
+    @crewai_event_bus.on(ToolUsageStartedEvent)
+    def _on_tool_started(source: Any, event: Any) -> None:
+        task = getattr(source, "task", None)
+        task_id = getattr(event, "task_id", None) or getattr(task, "id", None)
+        entry = _lookup("task", task_id) if task_id is not None else None
+        if entry is not None:
+            sink, task_name = entry
+            _emit(
+                sink,
+                PipelineEvent(
+                    kind=TOOL_CALLED,
+                    task=task_name,
+                    text=str(getattr(event, "tool_name", "")),
+                    data={"tool_args": getattr(event, "tool_args", None)},
+                ),
+            )
+
+    _LISTENERS_INSTALLED = True
+    return True
+
+
+@contextmanager
+def stream_crew_events(crew: Any, sink: EventSink) -> Iterator[None]:
+    """Route token, task and tool events from ``crew`` to ``sink`` while the block runs.
+
+    Every agent LLM is switched to streaming mode so tokens arrive as they are
+    generated; task completions are reported through each task's callback.
+    """
+
+    streaming_available = _install_listeners()
+    keys: list[tuple[str, str]] = []
+    task_by_agent: Dict[int, str] = {}
+    for task in crew.tasks:
+        if task.agent is not None:
+            task_by_agent.setdefault(id(task.agent), task.name)
+
+    with _SINKS_LOCK:
+        for task in crew.tasks:
+            key = ("task", str(getattr(task, "id", id(task))))
+            _SINKS[key] = (sink, task.name)
+            keys.append(key)
+        for agent in crew.agents:
+            llm = getattr(agent, "llm", None)
+            if llm is None:
+                continue
+            # Hedge backups answer on behalf of the agent's LLM, so their tokens go to the same task.
+            for target in [llm, *(getattr(llm, "hedge_backups", None) or [])]:
+                if streaming_available and hasattr(target, "stream"):
+                    target.stream = True
+                key = ("llm", str(id(target)))
+                _SINKS[key] = (sink, task_by_agent.get(id(agent)))
+                keys.append(key)
+
+    for task in crew.tasks:
+        existing_callback = task.callback
+
+        def _on_task_finished(task_output: Any, task: Any = task, existing_callback=existing_callback) -> None:
+            # Read the text first: later callbacks may condense it for downstream tasks.
+            text = getattr(task_output, "raw", None) or getattr(task_output, "raw_output", None)
+            if existing_callback is not None:
+                existing_callback(task_output)
+            _emit(sink, PipelineEvent(kind=TASK_FINISHED, task=task.name, text=str(text or task_output)))
+
+        task.callback = _on_task_finished
+
+    try:
+        yield
+    finally:
+        with _SINKS_LOCK:
+            for key in keys:
+                _SINKS.pop(key, None)
+
+
+def iter_pipeline_events(run: Callable[[EventSink], str]) -> Iterator[PipelineEvent]:
+    """Run ``run(sink)`` on a background thread and yield its events as they arrive.
+
+    The final event is either ``pipeline_finished`` (with the output in ``text``) or
+    ``pipeline_failed`` (with the error message in ``text``).
+    """
+
+    events: "queue.Queue[PipelineEvent]" = queue.Queue()
+
+    def _worker() -> None:
+        try:
+            output = run(events.put)
+        except Exception as exc:  # pragma: no cover - surfaced to the consumer
+            logger.exception("Streaming pipeline run failed")
+            events.put(PipelineEvent(kind=PIPELINE_FAILED, text=str(exc)))
+        else:
+            events.put(PipelineEvent(kind=PIPELINE_FINISHED, text=output))
+
+    threading.Thread(target=_worker, name="workshop-stream", daemon=True).start()
+    while True:
+        event = events.get()
+        yield event
+        if event.kind in (PIPELINE_FINISHED, PIPELINE_FAILED):
+            return
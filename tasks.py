@@ -1,19 +1,27 @@
 #"""Task definitions for the Agentic AI Workshop crew."""
 from __future__ import annotations
 
-from typing import List
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
 
 from crewai import Task
 
 from tools import create_calculator_tool, create_rag_tool, create_web_search_tool
 
+if TYPE_CHECKING:  # pragma: no cover - typing helpers only
+    from context_reduction import ContextReducer
+
+# The topic goes last so every run shares the static instructions as a prompt prefix.
+TOPIC_SUFFIX = "\n\nWorkshop topic: {topic}"
+
 
 def create_planning_task(agent) -> Task:
     """Task 1: draft an execution plan."""
     return Task(
         description=(
-            "Analyze the workshop topic '{topic}' and craft a milestone-based execution plan. "
+            "Analyze the workshop topic and craft a milestone-based execution plan. "
             "List required assets, responsible roles, tooling, and a realistic timeline."
+            + TOPIC_SUFFIX
         ),
         expected_output=(
             "A structured plan including objectives, three to five milestones, resource requirements, "
@@ -33,8 +41,9 @@ def create_research_task(agent, tools=None) -> Task:
     ]
     return Task(
         description=(
-            "Use the local knowledge base and live web results to validate the plan for '{topic}'. "
+            "Use the local knowledge base and live web results to validate the plan. "
             "Cite at least three trustworthy sources and capture data points that justify each milestone."
+            + TOPIC_SUFFIX
         ),
         expected_output=(
             "A bullet list of insights with inline citations, key statistics, and references to the RAG documents."
@@ -45,12 +54,65 @@ def create_research_task(agent, tools=None) -> Task:
     )
 
 
+# Research branches that run concurrently after Planning: (name, focus, tool names).
+RESEARCH_BRANCHES: Tuple[Tuple[str, str, Tuple[str, ...]], ...] = (
+    (
+        "Research: Knowledge Base",
+        "Search the local knowledge base for guidance, best practices and case studies relevant to each milestone.",
+        ("local_rag_search",),
+    ),
+    (
+        "Research: Web",
+        "Search the live web for current tools, releases, statistics and trustworthy references for each milestone.",
+        ("duckduckgo_search",),
+    ),
+    (
+        "Research: Metrics",
+        "Quantify the plan: durations, costs, audience sizes and resource estimates, computed with the calculator.",
+        ("deterministic_calculator", "local_rag_search"),
+    ),
+)
+
+
+def create_research_branch_task(agent, name: str, focus: str, tools=None) -> Task:
+    """Task 2a-c: one independent slice of the research, run concurrently with its siblings."""
+    return Task(
+        description=(
+            f"{focus} Work from the plan and cite every source you use.{TOPIC_SUFFIX}"
+        ),
+        expected_output=(
+            "A short bullet list of findings with inline citations, ready to be merged with the other research notes."
+        ),
+        agent=agent,
+        tools=list(tools or []),
+        name=name,
+    )
+
+
+def create_research_merge_task(agent) -> Task:
+    """Task 2: merge the parallel research branches."""
+    return Task(
+        description=(
+            "Merge the knowledge-base, web and metrics findings into one validated research brief. "
+            "Resolve contradictions, drop duplicates and keep at least three trustworthy sources with the data "
+            "points that justify each milestone."
+            + TOPIC_SUFFIX
+        ),
+        expected_output=(
+            "A bullet list of insights with inline citations, key statistics, and references to the RAG documents."
+        ),
+        agent=agent,
+        name="Research",
+    )
+
+
 def create_writing_task(agent) -> Task:
     """Task 3: author deliverables."""
     return Task(
         description=(
-            "Draft the workshop narrative for '{topic}', including an overview, prerequisites, step-by-step labs, and deployment notes. "
+            "Draft the workshop narrative, including an overview, prerequisites, step-by-step labs, and deployment notes. "
             "Incorporate the research insights and calculator results where helpful."
+            + TOPIC_SUFFIX
         ),
         expected_output=(
             "A Markdown-formatted workshop guide with sections for Goals, Agenda, Hands-on Labs, Deployment, and Resources."
@@ -64,8 +126,9 @@ def create_review_task(agent) -> Task:
     """Task 4: review compiled deliverables."""
     return Task(
         description=(
-            "Review the draft content for '{topic}' for accuracy, completeness, and pedagogy. Provide an executive summary of strengths, "
+            "Review the draft content for accuracy, completeness, and pedagogy. Provide an executive summary of strengths, "
             "list gaps or issues, and suggest concrete improvements."
+            + TOPIC_SUFFIX
         ),
         expected_output=(
             "A review report with sections for Summary, Major Findings, Minor Suggestions, and Final Recommendation."
@@ -75,11 +138,144 @@ def create_review_task(agent) -> Task:
     )
 
 
-def build_workshop_tasks(planner, researcher, writer, reviewer, research_tools=None) -> List[Task]:
-    """Convenience helper to create the full task list order."""
+@dataclass
+class TaskNode:
+    """A task plus the names of the tasks whose output it needs."""
+
+    task: Task
+    depends_on: Tuple[str, ...] = ()
+
+    @property
+    def name(self) -> str:
+        return str(self.task.name)
+
+
+def compile_task_graph(nodes: Sequence[TaskNode]) -> List[Task]:
+    """Turn a task DAG into a CrewAI task list that runs independent tasks concurrently.
+
+    Tasks are ordered level by level (a task's level is one more than its deepest
+    dependency) and receive their dependencies as explicit ``context``. Tasks that
+    share a level with other tasks run with ``async_execution``; the next synchronous
+    task waits for them, which makes it the merge point. CrewAI does not allow an
+    asynchronous task to depend on another one or to end the crew, so such tasks stay
+    synchronous.
+    """
+
+    by_name: Dict[str, TaskNode] = {}
+    for node in nodes:
+        if node.name in by_name:
+            raise ValueError(f"Duplicate task name '{node.name}' in task graph")
+        by_name[node.name] = node
+    for node in nodes:
+        missing = [name for name in node.depends_on if name not in by_name]
+        if missing:
+            raise ValueError(f"Task '{node.name}' depends on unknown task(s): {', '.join(missing)}")
+
+    levels: Dict[str, int] = {}
+
+    def level_of(name: str, path: Tuple[str, ...] = ()) -> int:
+        if name in path:
+            raise ValueError(f"Task graph has a cycle: {' -> '.join((*path, name))}")
+        if name not in levels:
+            depends_on = by_name[name].depends_on
+            levels[name] = 1 + max((level_of(dep, (*path, name)) for dep in depends_on), default=-1)
+        return levels[name]
+
+    # Stable sort keeps the declaration order within a level.
+    ordered = sorted(nodes, key=lambda node: level_of(node.name))
+    level_sizes: Dict[int, int] = {}
+    for node in ordered:
+        level_sizes[levels[node.name]] = level_sizes.get(levels[node.name], 0) + 1
+
+    tasks: List[Task] = []
+    for position, node in enumerate(ordered):
+        task = node.task
+        task.context = [by_name[dep].task for dep in node.depends_on]
+        task.async_execution = (
+            level_sizes[levels[node.name]] > 1
+            and position < len(ordered) - 1
+            and not any(by_name[dep].task.async_execution for dep in node.depends_on)
+        )
+        tasks.append(task)
+    return tasks
+
+
+def _select_tools(tools: Optional[Iterable[object]], names: Sequence[str]) -> List[object]:
+    return [tool for tool in tools or [] if getattr(tool, "name", None) in names]
+
+
+def build_workshop_task_graph(
+    planner,
+    researcher,
+    writer,
+    reviewer,
+    research_tools=None,
+    branch_researchers: Optional[Mapping[str, object]] = None,
+) -> List[TaskNode]:
+    """Declare the workshop tasks and their dependencies.
+
+    With ``branch_researchers`` (branch name -> agent; each concurrent branch needs
+    its own agent) research fans out into the ``RESEARCH_BRANCHES`` after Planning
+    and is merged by ``researcher`` before Writing. Without it, research is a single
+    task as before.
+    """
+
+    if not branch_researchers:
+        return [
+            TaskNode(create_planning_task(planner)),
+            TaskNode(create_research_task(researcher, tools=research_tools), ("Planning",)),
+            TaskNode(create_writing_task(writer), ("Planning", "Research")),
+            TaskNode(create_review_task(reviewer), ("Planning", "Writing", "Research")),
+        ]
+
+    if research_tools is None:
+        research_tools = [create_rag_tool(), create_web_search_tool(), create_calculator_tool()]
+    branches = [
+        TaskNode(
+            create_research_branch_task(
+                branch_researchers[name],
+                name,
+                focus,
+                # Prefer the branch agent's own tool instances so concurrent branches share none.
+                tools=_select_tools(getattr(branch_researchers[name], "tools", None) or research_tools, tool_names),
+            ),
+            ("Planning",),
+        )
+        for name, focus, tool_names in RESEARCH_BRANCHES
+    ]
     return [
-        create_planning_task(planner),
-        create_research_task(researcher, tools=research_tools),
-        create_writing_task(writer),
-        create_review_task(reviewer),
+        TaskNode(create_planning_task(planner)),
+        *branches,
+        TaskNode(create_research_merge_task(researcher), tuple(branch.name for branch in branches)),
+        TaskNode(create_writing_task(writer), ("Planning", "Research")),
+        TaskNode(create_review_task(reviewer), ("Planning", "Writing", "Research")),
     ]
+
+
+def build_workshop_tasks(
+    planner,
+    researcher,
+    writer,
+    reviewer,
+    research_tools=None,
+    branch_researchers: Optional[Mapping[str, object]] = None,
+    context_reducer: Optional["ContextReducer"] = None,
+) -> List[Task]:
+    """Convenience helper to create the full task list, compiled from the task graph.
+
+    With a ``context_reducer``, every output used as context by a later task is
+    archived and cut to the reducer's token budget as soon as its task finishes.
+    """
+    tasks = compile_task_graph(
+        build_workshop_task_graph(
+            planner,
+            researcher,
+            writer,
+            reviewer,
+            research_tools=research_tools,
+            branch_researchers=branch_researchers,
+        )
+    )
+    if context_reducer is not None:
+        context_reducer.attach(tasks)
+    return tasks
@@ -0,0 +1,16 @@
+import importlib.util
+import sys
+import types
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# The backend modules live at the repository root rather than in an installed package.
+sys.path.insert(0, str(ROOT))
+
+if importlib.util.find_spec("crewai") is None:
+    # tools/__init__ builds the CrewAI toolkit. Without crewai, register the package
+    # bare so its pure modules (embedding cache, expressions, ...) can still be tested.
+    tools_package = types.ModuleType("tools")
+    tools_package.__path__ = [str(ROOT / "tools")]
+    sys.modules["tools"] = tools_package
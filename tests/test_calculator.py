@@ -0,0 +1,62 @@
+import pytest
+
+pytest.importorskip("numpy")
+
+from tools.expressions import (
+    MAX_EXPONENT,
+    MAX_EXPRESSION_LENGTH,
+    compile_expression,
+    format_result,
+    prepare_variables,
+)
+
+
+def evaluate(expression, variables=None, exact=False):
+    return format_result(compile_expression(expression, exact)(prepare_variables(variables, exact)))
+
+
+@pytest.mark.parametrize(
+    "expression, expected",
+    [
+        ("12 * 40 * 1.2", "576"),
+        ("2 ** 10 % 7", "2"),
+        ("max(3, 9, 4) - min([5, 2])", "7"),
+        ("round(10 / 3, 2)", "3.33"),
+    ],
+)
+def test_arithmetic_and_functions(expression, expected):
+    assert evaluate(expression) == expected
+
+
+def test_exact_mode_has_no_float_rounding_noise():
+    assert evaluate("0.1 + 0.2") == "0.30000000000000004"
+    assert evaluate("0.1 + 0.2", exact=True) == "0.3"
+    assert evaluate("1 / 3", exact=True) == "1/3 (~0.333333333333)"
+
+
+def test_list_variables_evaluate_every_scenario():
+    assert evaluate("hours * rate", {"hours": [10, 20, 40], "rate": 85}) == "[850, 1700, 3400]"
+
+
+def test_units_and_dates():
+    assert evaluate("date('2025-03-01') - date('2025-01-15')") == "45 days"
+    assert evaluate("3 * days + 12 * h") == "3.5 days"
+
+
+@pytest.mark.parametrize(
+    "expression",
+    [
+        "__import__('os').system('true')",
+        "(1).real",
+        "undefined_name + 1",
+        f"2 ** {MAX_EXPONENT + 1}",
+        "1 +" * MAX_EXPRESSION_LENGTH + "1",
+    ],
+)
+def test_unsafe_or_oversized_expressions_are_rejected(expression):
+    with pytest.raises(ValueError):
+        evaluate(expression)
+
+
+def test_compiled_expressions_are_memoised():
+    assert compile_expression("a + b") is compile_expression("a + b")
@@ -0,0 +1,38 @@
+import pytest
+
+pytest.importorskip("crewai")
+
+from checkpoints import TaskCheckpointStore
+from tasks import create_planning_task
+
+TOPIC = "Agentic AI Workshop on Robotics Deployments"
+
+
+def _interpolate(task):
+    # Mirror what CrewAI does to every task at kickoff.
+    interpolate = getattr(task, "interpolate_inputs_and_add_conversation_history", None)
+    if interpolate is None:
+        interpolate = task.interpolate_inputs
+    interpolate({"topic": TOPIC})
+
+
+@pytest.mark.parametrize("persist", [False, True])
+def test_checkpoint_saved_during_run_loads_on_fresh_crew(tmp_path, persist):
+    store = TaskCheckpointStore(tmp_path if persist else None)
+    running_task = create_planning_task(agent=None)
+    _interpolate(running_task)
+    assert TOPIC in running_task.description
+
+    store.save(TOPIC, running_task, "the plan")
+
+    reader = TaskCheckpointStore(tmp_path) if persist else store
+    assert reader.load(TOPIC, create_planning_task(agent=None)) == "the plan"
+
+
+def test_checkpoint_is_scoped_to_topic(tmp_path):
+    store = TaskCheckpointStore(tmp_path)
+    running_task = create_planning_task(agent=None)
+    _interpolate(running_task)
+    store.save(TOPIC, running_task, "the plan")
+
+    assert store.load("Another topic", create_planning_task(agent=None)) is None
@@ -0,0 +1,75 @@
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("langchain_core")
+
+from tools.embedding_cache import CachedEmbeddings, EmbeddingCache
+
+
+class CountingEmbeddings:
+    """Deterministic stand-in for a sentence-transformers model."""
+
+    def __init__(self):
+        self.embedded = []
+
+    def _vector(self, text):
+        return [float(len(text)), float(sum(map(ord, text)) % 97), 1.0]
+
+    def embed_documents(self, texts):
+        self.embedded.extend(texts)
+        return [self._vector(text) for text in texts]
+
+    def embed_query(self, text):
+        self.embedded.append(text)
+        return self._vector(text)
+
+
+def test_vectors_persist_across_cache_instances(tmp_path):
+    cache = EmbeddingCache(tmp_path, "sentence-transformers/all-MiniLM-L6-v2")
+    cache.put_many(["alpha", "beta"], [[1.0, 2.0], [3.0, 4.0]])
+
+    reopened = EmbeddingCache(tmp_path, "sentence-transformers/all-MiniLM-L6-v2")
+
+    assert reopened.get_many(["beta", "gamma", "alpha"]) == [[3.0, 4.0], None, [1.0, 2.0]]
+    assert (reopened.hits, reopened.misses) == (2, 1)
+
+
+def test_mismatched_dimension_is_rejected(tmp_path):
+    cache = EmbeddingCache(tmp_path, "model")
+    cache.put_many(["alpha"], [[1.0, 2.0]])
+
+    with pytest.raises(ValueError):
+        cache.put_many(["beta"], [[1.0, 2.0, 3.0]])
+
+
+def test_orphaned_rows_from_an_interrupted_write_are_dropped(tmp_path):
+    cache = EmbeddingCache(tmp_path, "model")
+    cache.put_many(["alpha"], [[1.0, 2.0]])
+    # Simulate a crash after the vectors were appended but before their keys were.
+    with open(cache.directory / "vectors.f32", "ab") as handle:
+        handle.write(b"\0" * 8)
+
+    cache.put_many(["beta"], [[3.0, 4.0]])
+
+    assert EmbeddingCache(tmp_path, "model").get_many(["alpha", "beta"]) == [[1.0, 2.0], [3.0, 4.0]]
+
+
+def test_cached_embeddings_only_compute_missing_texts(tmp_path):
+    inner = CountingEmbeddings()
+    embeddings = CachedEmbeddings(inner, EmbeddingCache(tmp_path, "model"))
+
+    first = embeddings.embed_documents(["alpha", "beta"])
+    second = embeddings.embed_documents(["beta", "gamma", "alpha"])
+
+    assert second == [first[1], inner._vector("gamma"), first[0]]
+    assert inner.embedded == ["alpha", "beta", "gamma"]
+
+
+def test_read_only_cache_does_not_store_queries(tmp_path):
+    inner = CountingEmbeddings()
+    embeddings = CachedEmbeddings(inner, EmbeddingCache(tmp_path, "model"), store_misses=False)
+
+    embeddings.embed_query("robot arms")
+    embeddings.embed_query("robot arms")
+
+    assert inner.embedded == ["robot arms", "robot arms"]
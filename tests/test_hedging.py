@@ -0,0 +1,64 @@
+import threading
+
+import pytest
+
+from config.hedging import HedgePolicy, LatencyTracker, hedged_call
+
+
+def test_fast_primary_wins_without_starting_a_backup():
+    backup_started = threading.Event()
+
+    def backup():
+        backup_started.set()
+        return "backup"
+
+    assert hedged_call(lambda: "primary", [backup], delay_seconds=5) == "primary"
+    assert not backup_started.is_set()
+
+
+def test_slow_primary_is_raced_against_the_backup():
+    release = threading.Event()
+
+    def slow_primary():
+        release.wait(5)
+        return "primary"
+
+    try:
+        assert hedged_call(slow_primary, [lambda: "backup"], delay_seconds=0.05) == "backup"
+    finally:
+        release.set()
+
+
+def test_failed_primary_starts_the_backup_immediately():
+    def failing():
+        raise RuntimeError("provider down")
+
+    assert hedged_call(failing, [lambda: "backup"], delay_seconds=60) == "backup"
+
+
+def test_last_error_is_raised_when_every_call_fails():
+    def failing(message):
+        def call():
+            raise RuntimeError(message)
+
+        return call
+
+    with pytest.raises(RuntimeError, match="backup down"):
+        hedged_call(failing("primary down"), [failing("backup down")], delay_seconds=0.01)
+
+
+def test_p95_policy_waits_for_enough_samples():
+    tracker = LatencyTracker()
+    policy = HedgePolicy(mode="p95", delay_seconds=20, min_delay_seconds=1, min_samples=20)
+    for seconds in range(1, 20):
+        tracker.record("model", float(seconds))
+
+    assert policy.delay_for("model", tracker) == 20
+    tracker.record("model", 20.0)
+    assert policy.delay_for("model", tracker) == 19
+    assert HedgePolicy(mode="fixed", delay_seconds=0.5, min_delay_seconds=2).delay_for("model") == 2
+
+
+def test_unknown_hedge_mode_is_rejected():
+    with pytest.raises(ValueError):
+        HedgePolicy(mode="always")
@@ -0,0 +1,60 @@
+import time
+
+from config.llm_cache import LLMResponseCache, make_cache_key
+
+REQUEST = {
+    "model": "openrouter/meta-llama/llama-3.1-8b-instruct",
+    "messages": [{"role": "user", "content": "Plan a robotics workshop."}],
+    "temperature": 0.2,
+    "max_tokens": 512,
+}
+
+
+def test_cache_key_is_stable_and_covers_every_request_field():
+    key = make_cache_key(**REQUEST)
+
+    assert make_cache_key(**REQUEST) == key
+    for field, value in [
+        ("temperature", 0.7),
+        ("max_tokens", 1024),
+        ("tools", [{"name": "calculator"}]),
+        ("provider", "openai"),
+        ("base_url", "https://example.invalid/v1"),
+    ]:
+        assert make_cache_key(**{**REQUEST, field: value}) != key, field
+
+
+def test_put_and_get_round_trip_and_count_hits(tmp_path):
+    cache = LLMResponseCache(tmp_path / "llm.sqlite")
+
+    assert cache.get("missing") is None
+    cache.put("key", "the answer", model="m")
+
+    assert cache.get("key") == "the answer"
+    assert LLMResponseCache(tmp_path / "llm.sqlite").get("key") == "the answer"
+    assert (cache.stats.hits, cache.stats.misses, cache.stats.writes) == (1, 1, 1)
+
+
+def test_expired_entries_are_dropped(tmp_path, monkeypatch):
+    cache = LLMResponseCache(tmp_path / "llm.sqlite", ttl_seconds=60)
+    cache.put("key", "stale")
+
+    later = time.time() + 120
+    monkeypatch.setattr(time, "time", lambda: later)
+
+    assert cache.get("key") is None
+
+
+def test_least_recently_read_entries_are_evicted_first(tmp_path, monkeypatch):
+    clock = iter(range(1_000_000, 2_000_000))
+    monkeypatch.setattr(time, "time", lambda: float(next(clock)))
+    cache = LLMResponseCache(tmp_path / "llm.sqlite", ttl_seconds=None, max_entries=2)
+    cache.put("first", "1")
+    cache.put("second", "2")
+    cache.get("first")
+
+    cache.put("third", "3")
+
+    assert cache.get("second") is None
+    assert cache.get("first") == "1"
+    assert cache.get("third") == "3"
@@ -0,0 +1,63 @@
+import time
+
+import pytest
+
+from config.provider_health import ProviderHealthTracker, endpoint_key
+
+HEALTHY = endpoint_key("openrouter", "llama", "https://openrouter.ai/api/v1")
+FLAKY = endpoint_key("openrouter", "mistral", "https://openrouter.ai/api/v1")
+
+
+class RateLimitError(Exception):
+    pass
+
+
+def test_consecutive_failures_open_the_circuit_until_a_success():
+    health = ProviderHealthTracker(None, failure_threshold=2)
+
+    health.record_failure(FLAKY)
+    assert not health.is_open(FLAKY)
+    health.record_failure(FLAKY)
+    assert health.is_open(FLAKY)
+
+    health.record_success(FLAKY, 1.0)
+    assert not health.is_open(FLAKY)
+
+
+def test_rate_limit_trips_immediately_and_cooldown_doubles():
+    health = ProviderHealthTracker(None, base_cooldown_seconds=30)
+
+    with pytest.raises(RateLimitError):
+        health.record(FLAKY, lambda: (_ for _ in ()).throw(RateLimitError()))
+    first = health.snapshot()[FLAKY]["open_until"] - time.time()
+    health.record_failure(FLAKY, rate_limited=True)
+    second = health.snapshot()[FLAKY]["open_until"] - time.time()
+
+    assert health.is_open(FLAKY)
+    assert 25 < first <= 30
+    assert 55 < second <= 60
+
+
+def test_attempts_rank_by_their_least_healthy_endpoint():
+    health = ProviderHealthTracker(None)
+    health.record_success(HEALTHY, 1.0)
+    health.record_failure(FLAKY)
+    health.record_failure(FLAKY)
+    attempts = [("mixed", [HEALTHY, FLAKY]), ("unknown", ["other"]), ("healthy", [HEALTHY])]
+
+    ordered = health.order_attempts(attempts, lambda attempt: attempt[1])
+
+    assert [name for name, _ in ordered] == ["unknown", "healthy", "mixed"]
+
+
+def test_state_is_written_on_flush_and_reloaded(tmp_path):
+    path = tmp_path / "health.json"
+    health = ProviderHealthTracker(path, save_interval_seconds=3600)
+    health.record_failure(FLAKY, rate_limited=True)
+
+    assert not path.exists()
+    health.flush()
+
+    reloaded = ProviderHealthTracker(path)
+    assert reloaded.is_open(FLAKY)
+    assert reloaded.snapshot()[FLAKY]["failures"] == 1
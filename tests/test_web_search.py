@@ -0,0 +1,113 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+pytest.importorskip("crewai")
+
+from tools import page_fetcher
+from tools.search_backends import HTTPSearchBackend, SearchClient
+from tools.web_search import DuckDuckGoSearchTool
+
+ARTICLE = (
+    "<html><body><nav>Home | About</nav><article>"
+    "<p>Robot arms on assembly lines need calibrated grippers and a safety review before deployment.</p>"
+    "<p>Unrelated paragraph about the weather in the city where the conference takes place.</p>"
+    "</article></body></html>"
+)
+
+
+class _StubSearchHandler(BaseHTTPRequestHandler):
+    """Search endpoint plus the result pages it links to.
+
+    Every query returns three results: a page that fetches, one that 404s and one
+    whose body is cut off mid-transfer.
+    """
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, content_type, body, length=None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(length if length is not None else len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        base = f"http://{self.headers['Host']}"
+        if url.path == "/search":
+            query = parse_qs(url.query)["q"][0]
+            self.server.queries.append(query)
+            slug = query.replace(" ", "-")
+            results = [
+                {"title": f"{query} {kind}", "href": f"{base}/{kind}/{slug}", "body": f"{kind} snippet on {query}"}
+                for kind in ("article", "missing", "truncated")
+            ]
+            self._send(200, "application/json", json.dumps({"results": results}).encode("utf-8"))
+        elif url.path.startswith("/article/"):
+            self._send(200, "text/html", ARTICLE.encode("utf-8"))
+        elif url.path.startswith("/truncated/"):
+            self._send(200, "text/html", b"<p>Robot arms", length=4096)
+            self.close_connection = True
+        else:
+            self._send(404, "text/plain", b"not found")
+
+
+@pytest.fixture
+def stub_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubSearchHandler)
+    server.queries = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def make_tool(stub_server, tmp_path, monkeypatch):
+    monkeypatch.setattr(page_fetcher, "_FETCHER", page_fetcher.PageFetcher(tmp_path / "pages", timeout=5))
+    backend = HTTPSearchBackend(f"http://127.0.0.1:{stub_server.server_port}/search", timeout=5)
+
+    def _make(**fields):
+        client = SearchClient(backend, rate_per_second=100, burst=10, max_retries=0)
+        return DuckDuckGoSearchTool(client=client, **fields)
+
+    return _make
+
+
+def test_queries_fan_out_and_are_deduplicated(stub_server, make_tool):
+    output = make_tool()._run(queries=["robot arms", "drone swarms", "robot arms "])
+
+    assert sorted(stub_server.queries) == ["drone swarms", "robot arms"]
+    assert "Query 1: robot arms" in output
+    assert "Query 2: drone swarms" in output
+    assert "article snippet on drone swarms" in output
+    assert "Page extract" not in output
+
+
+def test_repeated_query_is_served_from_the_cache(stub_server, make_tool):
+    tool = make_tool()
+    first = tool._run(query="robot arms")
+
+    assert tool._run(query="robot arms") == first
+    assert stub_server.queries == ["robot arms"]
+
+
+def test_failed_page_fetches_fall_back_to_snippets(make_tool):
+    output = make_tool(fetch_pages=True, fetch_top_n=3)._run(query="robot arms")
+
+    assert output.count("Page extract:") == 1
+    assert "calibrated grippers" in output
+    for kind in ("article", "missing", "truncated"):
+        assert f"{kind} snippet on robot arms" in output
+
+
+def test_page_extracts_are_fetched_for_every_query(make_tool):
+    output = make_tool(fetch_pages=True, fetch_top_n=1)._run(queries=["robot arms", "drone swarms"])
+
+    assert output.count("Page extract:") == 2
@@ -1,6 +1,7 @@
 """Tool factories used across the workshop agents and tasks."""
 from __future__ import annotations
 
+import os
 from pathlib import Path
 from typing import List
 
@@ -8,6 +9,7 @@ from crewai.tools import BaseTool
 
 from .calculator import CalculatorTool
 from .rag_tool import LocalRAGTool
+from .vectorstore_registry import get_vectorstore_registry
 from .web_search import create_web_search_tool
 
 __all__ = [
@@ -15,16 +17,41 @@ __all__ = [
     "create_web_search_tool",
     "create_calculator_tool",
     "get_default_toolkit",
+    "get_vectorstore_registry",
 ]
 
 
 DEFAULT_VECTORSTORE_DIR = Path(__file__).resolve().parents[1] / "rag" / "vectorstore"
 
 
-def create_rag_tool(vectorstore_path: Path | None = None, *, top_k: int = 4) -> LocalRAGTool:
-    """Instantiate the local RAG retrieval tool."""
+def create_rag_tool(
+    vectorstore_path: Path | None = None,
+    *,
+    top_k: int = 4,
+    index_mode: str | None = None,
+    retrieval_mode: str | None = None,
+    candidate_depth: int | None = None,
+    token_budget: int | None = None,
+) -> LocalRAGTool:
+    """Instantiate the local RAG retrieval tool.
+
+    ``index_mode`` defaults to ``RAG_INDEX_MODE`` (``flat`` or ``mmap``),
+    ``retrieval_mode`` to ``RAG_RETRIEVAL_MODE`` (``hybrid`` or ``dense``),
+    ``candidate_depth`` to ``RAG_CANDIDATE_DEPTH`` and ``token_budget`` to
+    ``RAG_TOKEN_BUDGET`` (``0`` disables trimming).
+    """
     target_path = vectorstore_path or DEFAULT_VECTORSTORE_DIR
-    return LocalRAGTool(vectorstore_path=target_path, top_k=top_k)
+    return LocalRAGTool(
+        vectorstore_path=target_path,
+        top_k=top_k,
+        index_mode=index_mode or os.getenv("RAG_INDEX_MODE", "flat"),
+        retrieval_mode=retrieval_mode or os.getenv("RAG_RETRIEVAL_MODE", "hybrid"),
+        candidate_depth=candidate_depth or int(os.getenv("RAG_CANDIDATE_DEPTH", "20")),
+        token_budget=(
+            token_budget if token_budget is not None else int(os.getenv("RAG_TOKEN_BUDGET", "700"))
+        )
+        or None,
+    )
 
 
 def create_calculator_tool() -> CalculatorTool:
@@ -1,52 +1,82 @@
 """Deterministic calculator tool for quick quantitative reasoning."""
 from __future__ import annotations
 
-import ast
 import logging
-import operator
-from typing import Any, Dict
+from typing import Any, Dict, List, Mapping, Optional, Type, Union
 
 from crewai.tools import BaseTool
+from pydantic import BaseModel, Field
 
-_ALLOWED_OPERATORS: Dict[type[ast.AST], Any] = {
-    ast.Add: operator.add,
-    ast.Sub: operator.sub,
-    ast.Mult: operator.mul,
-    ast.Div: operator.truediv,
-    ast.Mod: operator.mod,
-    ast.Pow: operator.pow,
-    ast.USub: operator.neg,
-}
+from config.tracing import traced_tool
+
+from .expressions import compile_expression, format_result, prepare_variables
+
+MAX_EXPRESSIONS_PER_CALL = 50
+
+
+class CalculatorInput(BaseModel):
+    query: str = Field(default="", description="A single arithmetic expression, e.g. '12 * 40 * 1.2'.")
+    expressions: Optional[List[str]] = Field(
+        default=None,
+        description=f"Several expressions (up to {MAX_EXPRESSIONS_PER_CALL}) evaluated in one call.",
+    )
+    variables: Optional[Dict[str, Union[float, List[float]]]] = Field(
+        default=None,
+        description=(
+            "Named values used by the expressions. A list evaluates the expression once per "
+            "element, e.g. {'hours': [10, 20, 40], 'rate': 85}."
+        ),
+    )
+    exact: bool = Field(
+        default=False,
+        description="Use exact decimal/fraction arithmetic (no float rounding noise), e.g. for budgets.",
+    )
 
 
 class CalculatorTool(BaseTool):
     name: str = "deterministic_calculator"
     description: str = (
         "Perform precise arithmetic on simple expressions. "
-        "Supports addition, subtraction, multiplication, division, modulus, and powers."
+        "Supports addition, subtraction, multiplication, division, modulus, powers and "
+        "min/max/sum/round/abs. Units are multipliers (40*hours * 85*usd/hour, 3*days + 4*h, "
+        "2*gb) and date('2025-03-01') - date('2025-01-15') gives days between dates. "
+        "Pass 'expressions' to evaluate several at once, 'variables' (numbers or lists of "
+        "numbers) to reuse one formula across scenarios and exact=true for exact decimals."
     )
+    args_schema: Type[BaseModel] = CalculatorInput
 
     _logger = logging.getLogger(__name__)
 
-    def _run(self, query: str) -> str:
+    @traced_tool
+    def _run(
+        self,
+        query: str = "",
+        expressions: Optional[List[str]] = None,
+        variables: Optional[Dict[str, Any]] = None,
+        exact: bool = False,
+    ) -> str:
+        requested = [expr for expr in [query, *(expressions or [])] if expr and expr.strip()]
+        if not requested:
+            raise ValueError("Provide an expression in 'query' or a list of 'expressions'.")
+        if len(requested) > MAX_EXPRESSIONS_PER_CALL:
+            raise ValueError(f"At most {MAX_EXPRESSIONS_PER_CALL} expressions per call")
+        env = prepare_variables(variables, exact)
+
+        if len(requested) == 1:
+            return self._evaluate(requested[0], env, exact)
+        lines = []
+        for expression in requested:
+            try:
+                lines.append(f"{expression.strip()} = {self._evaluate(expression, env, exact)}")
+            except ValueError as exc:
+                lines.append(f"{expression.strip()} = error: {exc}")
+        return "\n".join(lines)
+
+    def _evaluate(self, expression: str, env: Mapping[str, Any], exact: bool = False) -> str:
         try:
-            expression = ast.parse(query, mode="eval").body
-            result = self._eval(expression)
-            self._logger.info("Calculator evaluated '%s' -> %s", query, result)
-            return str(result)
+            result = format_result(compile_expression(expression.strip(), exact)(env))
+            self._logger.info("Calculator evaluated '%s' -> %s", expression, result)
+            return result
         except Exception as exc:  # pragma: no cover - defensive layer
-            self._logger.exception("Calculator failed for expression '%s'", query)
-            raise ValueError(f"Failed to evaluate expression '{query}': {exc}") from exc
-
-    def _eval(self, node: ast.AST) -> float:
-        if isinstance(node, ast.Num):  # type: ignore[attr-defined]
-            return float(node.n)
-        if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)):
-            return float(node.value)
-        if isinstance(node, ast.UnaryOp) and type(node.op) in _ALLOWED_OPERATORS:
-            return _ALLOWED_OPERATORS[type(node.op)](self._eval(node.operand))
-        if isinstance(node, ast.BinOp) and type(node.op) in _ALLOWED_OPERATORS:
-            left = self._eval(node.left)
-            right = self._eval(node.right)
-            return _ALLOWED_OPERATORS[type(node.op)](left, right)
-        raise ValueError(f"Unsupported expression: {ast.dump(node, include_attributes=False)}")
+            self._logger.exception("Calculator failed for expression '%s'", expression)
+            raise ValueError(f"Failed to evaluate expression '{expression}': {exc}") from exc
@@ -0,0 +1,70 @@
+"""Archive of full task outputs and the tool agents use to read them back."""
+from __future__ import annotations
+
+import logging
+import threading
+from typing import Dict, List, Optional, Type
+
+from crewai.tools import BaseTool
+from pydantic import BaseModel, Field
+
+from config.tokens import truncate_to_tokens
+from config.tracing import traced_tool
+
+from .page_fetcher import condense
+
+MAX_LOOKUP_TOKENS = 1500
+
+
+class TaskContextArchive:
+    """Thread-safe map of task name -> full output, filled before context is reduced."""
+
+    def __init__(self) -> None:
+        self._outputs: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def put(self, task_name: str, text: str) -> None:
+        with self._lock:
+            self._outputs[task_name] = text
+
+    def get(self, task_name: str) -> Optional[str]:
+        with self._lock:
+            return self._outputs.get(task_name)
+
+    def names(self) -> List[str]:
+        with self._lock:
+            return list(self._outputs)
+
+
+class TaskContextLookupInput(BaseModel):
+    task: str = Field(..., description="Name of the earlier task, e.g. 'Research' or 'Writing'.")
+    query: str = Field(
+        default="",
+        description="Optional focus; only the passages of that output matching it are returned.",
+    )
+
+
+class TaskContextLookupTool(BaseTool):
+    name: str = "task_context_lookup"
+    description: str = (
+        "Read the full output of an earlier task when the condensed context you were given "
+        "is not enough. Pass the task name and, optionally, a query to get only the matching passages."
+    )
+    args_schema: Type[BaseModel] = TaskContextLookupInput
+    archive: TaskContextArchive = Field(default_factory=TaskContextArchive, exclude=True)
+    max_tokens: int = Field(default=MAX_LOOKUP_TOKENS, ge=64, description="Upper bound on returned tokens.")
+
+    model_config = {"arbitrary_types_allowed": True}
+
+    _logger = logging.getLogger(__name__)
+
+    @traced_tool
+    def _run(self, task: str, query: str = "") -> str:
+        text = self.archive.get(task.strip())
+        if text is None:
+            available = ", ".join(self.archive.names()) or "none yet"
+            raise ValueError(f"No archived output for task '{task}'. Available: {available}.")
+        self._logger.info("Context lookup for task '%s' (query=%r)", task, query)
+        if query.strip():
+            return condense(text, query, self.max_tokens)
+        return truncate_to_tokens(text, self.max_tokens)
@@ -0,0 +1,151 @@
+"""Pack retrieved chunks into a token budget before they reach the agent prompt.
+
+Neighbouring chunks from the splitter share ``chunk_overlap`` characters, so the
+raw ``top_k`` snippets often repeat text. Packing merges adjacent chunks of the
+same source (dropping the shared overlap), removes duplicates and trims the result
+to a token budget.
+"""
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+from langchain_core.documents import Document
+
+from config.tokens import count_tokens, truncate_to_tokens
+
+# Longest overlap searched for when stitching neighbouring chunks together.
+MAX_OVERLAP_CHARS = 400
+MIN_OVERLAP_CHARS = 12
+# A passage is only truncated into the remaining budget if at least this much is left.
+MIN_TRUNCATED_TOKENS = 48
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Passage:
+    source: Optional[str]
+    text: str
+    first_chunk: Optional[int]
+    last_chunk: Optional[int]
+    rank: int
+
+
+@dataclass
+class PackedContext:
+    text: str
+    passages: int
+    chunks: int
+    tokens_before: int
+    tokens_after: int
+
+    @property
+    def tokens_saved(self) -> int:
+        return max(0, self.tokens_before - self.tokens_after)
+
+
+def _strip_overlap(head: str, tail: str) -> str:
+    """Return ``tail`` without the prefix it shares with the end of ``head``."""
+
+    limit = min(len(head), len(tail), MAX_OVERLAP_CHARS)
+    for size in range(limit, MIN_OVERLAP_CHARS - 1, -1):
+        if head.endswith(tail[:size]):
+            return tail[size:]
+    return tail
+
+
+def _join(head: str, tail: str) -> str:
+    remainder = _strip_overlap(head, tail)
+    if remainder is tail:
+        # No shared text (the splitter cut on a separator): keep the chunks apart.
+        return f"{head}\n{tail}"
+    return head + remainder
+
+
+def merge_chunks(docs: Sequence[Document]) -> List[Passage]:
+    """Collapse duplicate and adjacent chunks into passages, keeping retrieval order."""
+
+    seen_text = set()
+    passages: List[Passage] = []
+    # Documents without a chunk position are kept as-is.
+    by_source: Dict[str, List[Passage]] = {}
+    for rank, doc in enumerate(docs):
+        text = doc.page_content.strip()
+        if not text or text in seen_text:
+            continue
+        seen_text.add(text)
+        source = doc.metadata.get("source")
+        chunk_index = doc.metadata.get("chunk_index")
+        passage = Passage(source, text, chunk_index, chunk_index, rank)
+        if source is None or chunk_index is None:
+            passages.append(passage)
+        else:
+            by_source.setdefault(source, []).append(passage)
+
+    for group in by_source.values():
+        group.sort(key=lambda passage: passage.first_chunk)
+        merged = [group[0]]
+        for passage in group[1:]:
+            current = merged[-1]
+            if passage.first_chunk == current.last_chunk + 1:
+                current.text = _join(current.text, passage.text)
+                current.last_chunk = passage.last_chunk
+                current.rank = min(current.rank, passage.rank)
+            else:
+                merged.append(passage)
+        passages.extend(merged)
+
+    passages.sort(key=lambda passage: passage.rank)
+    return passages
+
+
+def _label(index: int, passage: Passage) -> str:
+    if passage.source is None:
+        return f"Snippet {index}:"
+    if passage.first_chunk is None or passage.first_chunk == passage.last_chunk:
+        return f"Snippet {index} ({passage.source}):"
+    return f"Snippet {index} ({passage.source}, chunks {passage.first_chunk}-{passage.last_chunk}):"
+
+
+def pack_documents(docs: Sequence[Document], token_budget: Optional[int]) -> PackedContext:
+    """Merge ``docs`` into passages and keep as many as fit into ``token_budget`` tokens.
+
+    The passage that crosses the budget is truncated when enough room is left for it
+    to be useful. ``token_budget=None`` only deduplicates and merges.
+    """
+
+    unpacked = "\n\n".join(
+        f"Snippet {index}:\n{doc.page_content.strip()}" for index, doc in enumerate(docs, start=1)
+    )
+    blocks: List[str] = []
+    used = 0
+    passages = merge_chunks(docs)
+    for index, passage in enumerate(passages, start=1):
+        block = f"{_label(index, passage)}\n{passage.text}"
+        cost = count_tokens(block) + (2 if blocks else 0)
+        if token_budget is not None and used + cost > token_budget:
+            remaining = token_budget - used - count_tokens(_label(index, passage)) - 2
+            if remaining >= MIN_TRUNCATED_TOKENS or not blocks:
+                blocks.append(f"{_label(index, passage)}\n{truncate_to_tokens(passage.text, remaining)}")
+            break
+        blocks.append(block)
+        used += cost
+
+    packed = "\n\n".join(blocks)
+    context = PackedContext(
+        text=packed,
+        passages=len(blocks),
+        chunks=len(docs),
+        tokens_before=count_tokens(unpacked),
+        tokens_after=count_tokens(packed),
+    )
+    logger.debug(
+        "Packed %d chunks into %d passages: %d -> %d tokens",
+        context.chunks,
+        context.passages,
+        context.tokens_before,
+        context.tokens_after,
+    )
+    return context
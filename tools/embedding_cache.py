@@ -0,0 +1,223 @@
+"""Persistent embedding cache keyed by (embedding model, text hash).
+
+Vectors live in an append-only float32 file that is read through ``numpy.memmap``;
+a sidecar ``keys.txt`` maps text hashes to row numbers. Rows are only considered
+valid once their key line is written, and rows an interrupted write left without
+keys are trimmed before the next append, so a key never maps to the wrong vector.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_EMBEDDING_CACHE_DIR = PROJECT_ROOT / ".cache" / "embeddings"
+EMBEDDING_CACHE_DIR_ENV = "EMBEDDING_CACHE_DIR"
+EMBEDDING_CACHE_QUERIES_ENV = "EMBEDDING_CACHE_QUERIES"
+
+logger = logging.getLogger(__name__)
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def embedding_cache_dir_from_env() -> Optional[Path]:
+    """Return the configured cache directory, or ``None`` when caching is disabled."""
+
+    raw_value = os.getenv(EMBEDDING_CACHE_DIR_ENV)
+    if raw_value is None:
+        return DEFAULT_EMBEDDING_CACHE_DIR
+    raw_value = raw_value.strip()
+    if not raw_value or raw_value.lower() in ("off", "none", "0"):
+        return None
+    return Path(raw_value)
+
+
+def cache_query_embeddings_from_env() -> bool:
+    """Whether query-time embeddings are written to the cache (opt-in; it has no eviction)."""
+
+    return os.getenv(EMBEDDING_CACHE_QUERIES_ENV, "0").strip().lower() in ("1", "true", "yes", "on")
+
+
+@contextmanager
+def _file_lock(lock_path: Path) -> Iterator[None]:
+    """Serialise appends across processes where ``fcntl`` is available."""
+
+    try:
+        import fcntl
+    except ImportError:  # pragma: no cover - Windows falls back to in-process locking
+        yield
+        return
+
+    with open(lock_path, "a+") as handle:
+        fcntl.flock(handle, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+class EmbeddingCache:
+    """Memory-mapped store of embeddings for a single embedding model."""
+
+    def __init__(self, directory: Path, model_name: str) -> None:
+        slug = re.sub(r"[^A-Za-z0-9_.-]+", "_", model_name)
+        self.directory = Path(directory) / slug
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.model_name = model_name
+        self._vectors_path = self.directory / "vectors.f32"
+        self._keys_path = self.directory / "keys.txt"
+        self._meta_path = self.directory / "meta.json"
+        self._lock_path = self.directory / ".lock"
+        self._lock = threading.Lock()
+        self._rows: Dict[str, int] = {}
+        self._row_count = 0
+        self._keys_offset = 0
+        self._matrix: Optional[np.memmap] = None
+        self._dim: Optional[int] = None
+        if self._meta_path.exists():
+            self._dim = int(json.loads(self._meta_path.read_text(encoding="utf-8"))["dim"])
+        self.hits = 0
+        self.misses = 0
+
+    def _refresh_keys(self) -> None:
+        """Pick up rows appended by this or other processes since the last read."""
+
+        if not self._keys_path.exists():
+            return
+        with open(self._keys_path, encoding="ascii") as handle:
+            handle.seek(self._keys_offset)
+            for line in handle:
+                if not line.endswith("\n"):
+                    break
+                self._rows.setdefault(line.strip(), self._row_count)
+                self._row_count += 1
+                self._keys_offset += len(line)
+
+    def _drop_orphans(self) -> None:
+        """Trim rows and key fragments left by an interrupted write (file lock held).
+
+        Keys map to rows by position, so vectors appended without their keys would
+        shift every later key onto the wrong vector.
+        """
+
+        assert self._dim is not None
+        expected = self._row_count * self._dim * np.dtype(np.float32).itemsize
+        if self._vectors_path.exists() and self._vectors_path.stat().st_size > expected:
+            logger.warning("Dropping orphaned rows from interrupted write in %s", self._vectors_path)
+            os.truncate(self._vectors_path, expected)
+        if self._keys_path.exists() and self._keys_path.stat().st_size > self._keys_offset:
+            os.truncate(self._keys_path, self._keys_offset)
+
+    def _matrix_view(self) -> Optional[np.memmap]:
+        if self._dim is None or not self._row_count:
+            return None
+        if self._matrix is None or self._matrix.shape[0] < self._row_count:
+            self._matrix = np.memmap(
+                self._vectors_path, dtype=np.float32, mode="r", shape=(self._row_count, self._dim)
+            )
+        return self._matrix
+
+    def get_many(self, texts: Sequence[str]) -> List[Optional[List[float]]]:
+        """Return cached vectors for ``texts`` (``None`` for texts never embedded)."""
+
+        hashes = [text_hash(text) for text in texts]
+        with self._lock:
+            if any(key not in self._rows for key in hashes):
+                self._refresh_keys()
+            matrix = self._matrix_view()
+            results: List[Optional[List[float]]] = []
+            for key in hashes:
+                row = self._rows.get(key)
+                if row is None or matrix is None:
+                    results.append(None)
+                    self.misses += 1
+                else:
+                    results.append(matrix[row].tolist())
+                    self.hits += 1
+            return results
+
+    def put_many(self, texts: Sequence[str], vectors: Sequence[Sequence[float]]) -> None:
+        """Append vectors for texts that are not cached yet."""
+
+        if not texts:
+            return
+        array = np.asarray(vectors, dtype=np.float32)
+        with self._lock, _file_lock(self._lock_path):
+            self._refresh_keys()
+            if self._dim is None:
+                self._dim = int(array.shape[1])
+                self._meta_path.write_text(json.dumps({"dim": self._dim}), encoding="utf-8")
+            elif array.shape[1] != self._dim:
+                raise ValueError(
+                    f"Embedding dimension {array.shape[1]} does not match cached dimension {self._dim}"
+                )
+
+            new_keys: List[str] = []
+            new_rows: List[np.ndarray] = []
+            for text, vector in zip(texts, array):
+                key = text_hash(text)
+                if key in self._rows or key in new_keys:
+                    continue
+                new_keys.append(key)
+                new_rows.append(vector)
+            if not new_keys:
+                return
+
+            self._drop_orphans()
+            # Vectors first, keys second: a row only becomes visible once its key exists.
+            with open(self._vectors_path, "ab") as handle:
+                handle.write(np.stack(new_rows).astype(np.float32).tobytes())
+            with open(self._keys_path, "a", encoding="ascii") as handle:
+                handle.write("".join(f"{key}\n" for key in new_keys))
+            self._refresh_keys()
+
+
+class CachedEmbeddings(Embeddings):
+    """Wrap an embedding model so repeated texts skip the transformer forward pass.
+
+    With ``store_misses=False`` the cache is read-only: newly computed vectors are
+    returned but not appended. Query-serving processes use that, since the store is
+    append-only and every distinct query text would otherwise grow it forever.
+    """
+
+    def __init__(self, inner: Embeddings, cache: EmbeddingCache, *, store_misses: bool = True) -> None:
+        self.inner = inner
+        self.cache = cache
+        self.store_misses = store_misses
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.embed_with(texts, self.inner.embed_documents)
+
+    def embed_with(self, texts: List[str], compute) -> List[List[float]]:
+        """Serve cached vectors and compute the rest with ``compute(missing_texts)``."""
+
+        vectors = self.cache.get_many(texts)
+        missing = [index for index, vector in enumerate(vectors) if vector is None]
+        if missing:
+            computed = compute([texts[index] for index in missing])
+            if self.store_misses:
+                self.cache.put_many([texts[index] for index in missing], computed)
+            for index, vector in zip(missing, computed):
+                vectors[index] = list(vector)
+        logger.debug(
+            "Embedding cache served %d/%d texts for %s",
+            len(texts) - len(missing),
+            len(texts),
+            self.cache.model_name,
+        )
+        return vectors  # type: ignore[return-value]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_with([text], lambda missing: [self.inner.embed_query(missing[0])])[0]
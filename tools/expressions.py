@@ -0,0 +1,239 @@
+"""Safe arithmetic expression engine behind the calculator tool.
+
+Expressions are parsed with :mod:`ast`, checked against a small whitelist of
+operators and functions and compiled into closures over a variables mapping.
+"""
+from __future__ import annotations
+
+import ast
+import operator
+from decimal import Decimal, localcontext
+from fractions import Fraction
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+from .units import UNITS, CalendarDate, Quantity
+
+MAX_EXPRESSION_LENGTH = 500
+MAX_AST_NODES = 200
+MAX_EXPONENT = 1000
+MAX_RESULT_BITS = 4096
+MAX_VECTOR_SIZE = 10_000
+
+Compiled = Callable[[Mapping[str, Any]], Any]
+
+
+def _bits(value: Any) -> int:
+    if isinstance(value, int):
+        return value.bit_length()
+    if isinstance(value, Fraction):
+        return max(value.numerator.bit_length(), value.denominator.bit_length())
+    if isinstance(value, Quantity):
+        return _bits(value.value)
+    return 0
+
+
+def _check_magnitude(value: Any) -> Any:
+    if _bits(value) > MAX_RESULT_BITS:
+        raise ValueError(f"Result exceeds {MAX_RESULT_BITS} bits")
+    return value
+
+
+def _bounded_pow(base: Any, exponent: Any) -> Any:
+    """``base ** exponent`` that refuses exponents and results too large to compute quickly."""
+
+    largest_exponent = float(np.max(np.abs(exponent))) if isinstance(exponent, np.ndarray) else float(abs(exponent))
+    if largest_exponent > MAX_EXPONENT:
+        raise ValueError(f"Exponent {largest_exponent:g} exceeds the limit of {MAX_EXPONENT}")
+    if _bits(base) > 1 and not isinstance(exponent, np.ndarray) and exponent > 0:
+        if exponent * (_bits(base) - 1) > MAX_RESULT_BITS:
+            raise ValueError(f"Power result would exceed {MAX_RESULT_BITS} bits")
+    return _check_magnitude(base**exponent)
+
+
+def _checked(op: Callable[[Any, Any], Any]) -> Callable[[Any, Any], Any]:
+    def apply(left: Any, right: Any) -> Any:
+        return _check_magnitude(op(left, right))
+
+    return apply
+
+
+_ALLOWED_OPERATORS: Dict[type[ast.AST], Any] = {
+    ast.Add: _checked(operator.add),
+    ast.Sub: _checked(operator.sub),
+    ast.Mult: _checked(operator.mul),
+    ast.Div: operator.truediv,
+    ast.Mod: operator.mod,
+    ast.Pow: _bounded_pow,
+    ast.USub: operator.neg,
+    ast.UAdd: operator.pos,
+}
+
+
+def _exact_number(value: Any) -> Any:
+    # repr() gives the shortest literal that round-trips, i.e. what was typed: 0.1 -> 1/10.
+    return Fraction(repr(value)) if isinstance(value, float) else Fraction(value)
+
+
+def _items(args: Sequence[Any]) -> List[Any]:
+    """Arguments of min/max/sum: either several values or a single list/array."""
+
+    if len(args) == 1 and isinstance(args[0], (list, np.ndarray)):
+        return list(args[0])
+    return list(args)
+
+
+def _minmax(pick: Callable[..., Any], elementwise: Callable[..., Any]) -> Callable[..., Any]:
+    def apply(*args: Any) -> Any:
+        if not args:
+            raise ValueError("min()/max() need at least one value")
+        if len(args) > 1 and any(isinstance(arg, np.ndarray) for arg in args):
+            # Several scenario columns: compare them row by row.
+            result = args[0]
+            for arg in args[1:]:
+                result = elementwise(result, arg)
+            return result
+        return pick(_items(args))
+
+    return apply
+
+
+def _sum(*args: Any) -> Any:
+    items = _items(args)
+    if not items:
+        return 0
+    total = items[0]
+    for item in items[1:]:
+        total = _check_magnitude(total + item)
+    return total
+
+
+def _round(value: Any, ndigits: Any = None) -> Any:
+    digits = None if ndigits is None else int(ndigits)
+    if isinstance(value, np.ndarray):
+        if value.dtype == object:
+            return np.array([round(item, digits) for item in value], dtype=object)
+        return np.round(value, digits or 0)
+    return round(value, digits)
+
+
+_FUNCTIONS: Dict[str, Callable[..., Any]] = {
+    "min": _minmax(min, np.minimum),
+    "max": _minmax(max, np.maximum),
+    "sum": _sum,
+    "round": _round,
+    "abs": abs,
+    "date": CalendarDate.parse,
+}
+
+
+def _compile_node(node: ast.AST, exact: bool) -> Compiled:
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)) and not isinstance(node.value, bool):
+        value = _exact_number(node.value) if exact else node.value
+        return lambda env: value
+    if isinstance(node, ast.Name):
+        name = node.id
+        unit = Quantity.unit(name, exact) if name in UNITS else None
+
+        def lookup(env: Mapping[str, Any]) -> Any:
+            # Variables shadow unit names, so a variable called 'h' still works.
+            if name in env:
+                return env[name]
+            if unit is not None:
+                return unit
+            raise ValueError(f"Unknown variable '{name}'")
+
+        return lookup
+    if isinstance(node, (ast.List, ast.Tuple)):
+        elements = [_compile_node(element, exact) for element in node.elts]
+        return lambda env: [element(env) for element in elements]
+    if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id in _FUNCTIONS:
+        if node.keywords:
+            raise ValueError(f"{node.func.id}() does not take keyword arguments")
+        function = _FUNCTIONS[node.func.id]
+        if node.func.id == "date":
+            if len(node.args) != 1 or not isinstance(node.args[0], ast.Constant) or not isinstance(node.args[0].value, str):
+                raise ValueError("date() takes one 'YYYY-MM-DD' string")
+            parsed = function(node.args[0].value)
+            return lambda env: parsed
+        args = [_compile_node(arg, exact) for arg in node.args]
+        return lambda env: function(*(arg(env) for arg in args))
+    if isinstance(node, ast.UnaryOp) and type(node.op) in _ALLOWED_OPERATORS:
+        unary = _ALLOWED_OPERATORS[type(node.op)]
+        operand = _compile_node(node.operand, exact)
+        return lambda env: unary(operand(env))
+    if isinstance(node, ast.BinOp) and type(node.op) in _ALLOWED_OPERATORS:
+        binary = _ALLOWED_OPERATORS[type(node.op)]
+        left = _compile_node(node.left, exact)
+        right = _compile_node(node.right, exact)
+        return lambda env: binary(left(env), right(env))
+    raise ValueError(f"Unsupported expression: {ast.dump(node, include_attributes=False)}")
+
+
+@lru_cache(maxsize=512)
+def compile_expression(expression: str, exact: bool = False) -> Compiled:
+    """Parse and compile ``expression`` into a closure over a variables mapping.
+
+    Compiled closures are memoised per (expression, mode), so repeated formulas skip
+    parsing and validation entirely. In exact mode every literal becomes a
+    ``Fraction``, so decimal arithmetic carries no binary rounding error.
+    """
+
+    if len(expression) > MAX_EXPRESSION_LENGTH:
+        raise ValueError(f"Expression longer than {MAX_EXPRESSION_LENGTH} characters")
+    tree = ast.parse(expression.strip(), mode="eval")
+    if sum(1 for _ in ast.walk(tree)) > MAX_AST_NODES:
+        raise ValueError(f"Expression has more than {MAX_AST_NODES} parts")
+    return _compile_node(tree.body, exact)
+
+
+def prepare_variables(variables: Optional[Mapping[str, Any]], exact: bool = False) -> Dict[str, Any]:
+    """Turn list-valued variables into NumPy arrays so one evaluation covers every row."""
+
+    prepared: Dict[str, Any] = {}
+    for name, value in (variables or {}).items():
+        if not name.isidentifier():
+            raise ValueError(f"Invalid variable name '{name}'")
+        if isinstance(value, (list, tuple)):
+            if len(value) > MAX_VECTOR_SIZE:
+                raise ValueError(f"Variable '{name}' has more than {MAX_VECTOR_SIZE} values")
+            if exact:
+                prepared[name] = np.array([_exact_number(item) for item in value], dtype=object)
+            else:
+                prepared[name] = np.asarray(value, dtype=float)
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            prepared[name] = _exact_number(value) if exact else value
+        else:
+            raise ValueError(f"Variable '{name}' must be a number or a list of numbers")
+    return prepared
+
+
+def _format_fraction(value: Fraction) -> str:
+    if value.denominator == 1:
+        return str(value.numerator)
+    denominator = value.denominator
+    for prime in (2, 5):
+        while denominator % prime == 0:
+            denominator //= prime
+    if denominator == 1:
+        # Terminating decimal: print it exactly.
+        with localcontext() as context:
+            context.prec = max(28, len(str(value.numerator)) + len(str(value.denominator)))
+            return format(Decimal(value.numerator) / Decimal(value.denominator), "f")
+    return f"{value} (~{float(value):.12g})"
+
+
+def format_result(value: Any) -> str:
+    if isinstance(value, np.ndarray):
+        return "[" + ", ".join(format_result(item.item() if hasattr(item, "item") else item) for item in value.ravel()) + "]"
+    if isinstance(value, list):
+        return "[" + ", ".join(format_result(item) for item in value) + "]"
+    if isinstance(value, Quantity):
+        return f"{format_result(value.display_value())} {value.unit_label()}"
+    if isinstance(value, Fraction):
+        return _format_fraction(value)
+    if isinstance(value, float) and value.is_integer() and abs(value) < 1e15:
+        return str(int(value))
+    return str(value)
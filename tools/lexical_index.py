@@ -0,0 +1,307 @@
+"""BM25 inverted index stored next to the FAISS index for keyword-heavy queries.
+
+Dense embeddings blur exact identifiers (``ERR_CONN_RESET``, ``--chunk-size``,
+``build_vector_db.py``); the lexical index keeps them as tokens. Documents are
+addressed by their row in the FAISS index, so lexical and dense rankings can be
+fused without a separate id mapping. Each index is stamped with the build id of the
+rows it covers (see ``store_build_id``), so a stale index is never paired with a
+rebuilt vector store. The postings are ``.npy`` arrays next to ``lexical.json`` and
+are memory-mapped on load, like the serving index.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import math
+import re
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+LEXICAL_INDEX_FILE = "lexical.json"
+LEXICAL_TERMS_FILE = "lexical.terms.npy"
+LEXICAL_TERMS_OFFSETS_FILE = "lexical.terms.offsets.npy"
+LEXICAL_POSTINGS_OFFSETS_FILE = "lexical.postings.offsets.npy"
+LEXICAL_ROWS_FILE = "lexical.rows.npy"
+LEXICAL_FREQS_FILE = "lexical.freqs.npy"
+LEXICAL_DOC_LENGTHS_FILE = "lexical.doc_lengths.npy"
+LEXICAL_FILES = (
+    LEXICAL_INDEX_FILE,
+    LEXICAL_TERMS_FILE,
+    LEXICAL_TERMS_OFFSETS_FILE,
+    LEXICAL_POSTINGS_OFFSETS_FILE,
+    LEXICAL_ROWS_FILE,
+    LEXICAL_FREQS_FILE,
+    LEXICAL_DOC_LENGTHS_FILE,
+)
+LEXICAL_INDEX_VERSION = 2
+RRF_K = 60
+
+# Flags (``--rebuild``), dotted/dashed/underscored identifiers and plain words.
+_TOKEN_PATTERN = re.compile(r"--?[a-z0-9][a-z0-9_-]*|[a-z0-9_]+(?:[./:-][a-z0-9_]+)*")
+_PART_SEPARATORS = re.compile(r"[-_./:]+")
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from how in is it of on or that the this to was what when "
+    "where which with".split()
+)
+
+logger = logging.getLogger(__name__)
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into BM25 terms.
+
+    Compound tokens are kept whole so exact identifiers match, and their parts are
+    added as well so ``chunk size`` still finds ``--chunk-size``.
+    """
+
+    terms: List[str] = []
+    for token in _TOKEN_PATTERN.findall(text.lower()):
+        if token in _STOPWORDS:
+            continue
+        terms.append(token)
+        parts = [part for part in _PART_SEPARATORS.split(token) if part]
+        if len(parts) > 1 or (parts and parts[0] != token):
+            terms.extend(part for part in parts if part not in _STOPWORDS)
+    return terms
+
+
+def row_fingerprint(doc_ids: Iterable[str]) -> str:
+    """Hash docstore ids in row order; artifacts built from the same rows share it."""
+
+    digest = hashlib.sha256()
+    for doc_id in doc_ids:
+        digest.update(str(doc_id).encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()[:32]
+
+
+def store_build_id(store: Any) -> str:
+    """Build id of a LangChain FAISS store: the fingerprint of its row -> chunk mapping."""
+
+    return row_fingerprint(store.index_to_docstore_id[row] for row in range(int(store.index.ntotal)))
+
+
+class BM25Index:
+    """Okapi BM25 over row-addressed documents, stored as flat arrays.
+
+    Terms are kept sorted in one UTF-8 blob (found by binary search) and postings in
+    CSR form: ``term_offsets[i]:term_offsets[i + 1]`` slices ``rows``/``freqs`` for
+    term ``i``. Loaded indexes memory-map every array, so worker processes share them
+    through the page cache instead of each parsing the index into RAM.
+    """
+
+    def __init__(
+        self,
+        terms_blob: np.ndarray,
+        terms_offsets: np.ndarray,
+        term_offsets: np.ndarray,
+        rows: np.ndarray,
+        freqs: np.ndarray,
+        doc_lengths: np.ndarray,
+        *,
+        k1: float = 1.5,
+        b: float = 0.75,
+        build_id: Optional[str] = None,
+        avg_length: Optional[float] = None,
+    ) -> None:
+        self._terms_blob = terms_blob
+        self._terms_offsets = terms_offsets
+        self._term_offsets = term_offsets
+        self._rows = rows
+        self._freqs = freqs
+        self.doc_lengths = doc_lengths
+        self.k1 = k1
+        self.b = b
+        self.build_id = build_id
+        if avg_length is None:
+            avg_length = float(doc_lengths.mean()) if len(doc_lengths) else 0.0
+        self.avg_length = avg_length
+
+    def __len__(self) -> int:
+        return int(self.doc_lengths.shape[0])
+
+    @property
+    def term_count(self) -> int:
+        return int(self._terms_offsets.shape[0]) - 1
+
+    @classmethod
+    def build(cls, texts: Iterable[str], *, k1: float = 1.5, b: float = 0.75) -> "BM25Index":
+        """Index ``texts``; the n-th text becomes row n."""
+
+        raw_postings: Dict[str, Tuple[List[int], List[int]]] = {}
+        lengths: List[int] = []
+        for row, text in enumerate(texts):
+            terms = tokenize(text)
+            lengths.append(len(terms))
+            counts: Dict[str, int] = {}
+            for term in terms:
+                counts[term] = counts.get(term, 0) + 1
+            for term, count in counts.items():
+                rows, freqs = raw_postings.setdefault(term, ([], []))
+                rows.append(row)
+                freqs.append(count)
+
+        # Sorting str matches sorting their UTF-8 bytes, which the lookup compares.
+        vocabulary = sorted(raw_postings)
+        encoded = [term.encode("utf-8") for term in vocabulary]
+        terms_offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        terms_offsets[1:] = np.cumsum([len(term) for term in encoded])
+        term_offsets = np.zeros(len(vocabulary) + 1, dtype=np.int64)
+        term_offsets[1:] = np.cumsum([len(raw_postings[term][0]) for term in vocabulary])
+        rows = [row for term in vocabulary for row in raw_postings[term][0]]
+        freqs = [freq for term in vocabulary for freq in raw_postings[term][1]]
+        return cls(
+            np.frombuffer(b"".join(encoded), dtype=np.uint8),
+            terms_offsets,
+            term_offsets,
+            np.asarray(rows, dtype=np.int32),
+            np.asarray(freqs, dtype=np.float32),
+            np.asarray(lengths, dtype=np.float32),
+            k1=k1,
+            b=b,
+        )
+
+    def _arrays(self) -> Dict[str, np.ndarray]:
+        return {
+            LEXICAL_TERMS_FILE: self._terms_blob,
+            LEXICAL_TERMS_OFFSETS_FILE: self._terms_offsets,
+            LEXICAL_POSTINGS_OFFSETS_FILE: self._term_offsets,
+            LEXICAL_ROWS_FILE: self._rows,
+            LEXICAL_FREQS_FILE: self._freqs,
+            LEXICAL_DOC_LENGTHS_FILE: self.doc_lengths,
+        }
+
+    def save(self, directory: Path) -> Path:
+        """Write the arrays and ``lexical.json`` into ``directory``.
+
+        Everything is written under temporary names and swapped in at the end, the
+        metadata file last, so running readers never map a half-written index.
+        """
+
+        directory = Path(directory)
+        staged = []
+        for name, array in self._arrays().items():
+            tmp_path = directory / f"{name}.tmp"
+            with open(tmp_path, "wb") as handle:
+                np.save(handle, np.ascontiguousarray(array))
+            staged.append((tmp_path, directory / name))
+        payload: Dict[str, Any] = {
+            "version": LEXICAL_INDEX_VERSION,
+            "k1": self.k1,
+            "b": self.b,
+            "build_id": self.build_id,
+            "documents": len(self),
+            "terms": self.term_count,
+            "avg_length": self.avg_length,
+        }
+        target = directory / LEXICAL_INDEX_FILE
+        tmp_meta = target.with_suffix(".tmp")
+        tmp_meta.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+        for tmp_path, final_path in staged:
+            tmp_path.replace(final_path)
+        tmp_meta.replace(target)
+        return target
+
+    @classmethod
+    def load(cls, directory: Path) -> "BM25Index":
+        """Memory-map an index written by :meth:`save`."""
+
+        directory = Path(directory)
+        path = directory / LEXICAL_INDEX_FILE
+        payload = json.loads(path.read_text(encoding="utf-8"))
+        if payload.get("version") != LEXICAL_INDEX_VERSION:
+            raise ValueError(f"Unsupported lexical index version in {path}; rebuild the vector store.")
+        arrays = {
+            name: np.load(directory / name, mmap_mode="r")
+            for name in (
+                LEXICAL_TERMS_FILE,
+                LEXICAL_TERMS_OFFSETS_FILE,
+                LEXICAL_POSTINGS_OFFSETS_FILE,
+                LEXICAL_ROWS_FILE,
+                LEXICAL_FREQS_FILE,
+                LEXICAL_DOC_LENGTHS_FILE,
+            )
+        }
+        return cls(
+            *arrays.values(),
+            k1=float(payload["k1"]),
+            b=float(payload["b"]),
+            build_id=payload.get("build_id"),
+            avg_length=float(payload["avg_length"]),
+        )
+
+    def _term_at(self, position: int) -> bytes:
+        start, end = int(self._terms_offsets[position]), int(self._terms_offsets[position + 1])
+        return self._terms_blob[start:end].tobytes()
+
+    def posting(self, term: str) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """Return the (rows, freqs) of ``term`` or ``None`` if it never occurs."""
+
+        wanted = term.encode("utf-8")
+        low, high = 0, self.term_count
+        while low < high:
+            middle = (low + high) // 2
+            if self._term_at(middle) < wanted:
+                low = middle + 1
+            else:
+                high = middle
+        if low == self.term_count or self._term_at(low) != wanted:
+            return None
+        start, end = int(self._term_offsets[low]), int(self._term_offsets[low + 1])
+        return np.asarray(self._rows[start:end]), np.asarray(self._freqs[start:end])
+
+    def search(self, query: str, k: int) -> List[int]:
+        """Return up to ``k`` rows ranked by BM25 score (rows without a match are skipped)."""
+
+        total = len(self)
+        if not total or k < 1:
+            return []
+        # Scores are accumulated over matching rows only, never a dense per-document array.
+        matched_rows: List[np.ndarray] = []
+        contributions: List[np.ndarray] = []
+        for term in set(tokenize(query)):
+            posting = self.posting(term)
+            if posting is None:
+                continue
+            rows, freqs = posting
+            idf = math.log(1.0 + (total - len(rows) + 0.5) / (len(rows) + 0.5))
+            norm = self.k1 * (1.0 - self.b + self.b * self.doc_lengths[rows] / max(self.avg_length, 1e-9))
+            matched_rows.append(rows)
+            contributions.append(idf * freqs * (self.k1 + 1.0) / (freqs + norm))
+        if not matched_rows:
+            return []
+
+        unique_rows, inverse = np.unique(np.concatenate(matched_rows), return_inverse=True)
+        scores = np.bincount(inverse, weights=np.concatenate(contributions))
+        order = np.arange(len(unique_rows))
+        if order.size > k:
+            order = np.argpartition(-scores, k - 1)[:k]
+        # Highest score first; ties go to the lower row.
+        order = order[np.lexsort((unique_rows[order], -scores[order]))]
+        return [int(unique_rows[position]) for position in order]
+
+
+def reciprocal_rank_fusion(rankings: Sequence[Sequence[int]], *, k: int = RRF_K) -> List[int]:
+    """Merge ranked row lists with RRF: each list contributes ``1 / (k + rank)`` per row."""
+
+    scores: Dict[int, float] = {}
+    for ranking in rankings:
+        for rank, row in enumerate(ranking, start=1):
+            scores[row] = scores.get(row, 0.0) + 1.0 / (k + rank)
+    # Ties keep the order in which rows were first seen (dense results come first).
+    return sorted(scores, key=lambda row: scores[row], reverse=True)
+
+
+def build_lexical_index(store: Any) -> BM25Index:
+    """Index every chunk of a LangChain FAISS store in FAISS row order."""
+
+    texts = (
+        store.docstore.search(store.index_to_docstore_id[row]).page_content
+        for row in range(int(store.index.ntotal))
+    )
+    index = BM25Index.build(texts)
+    index.build_id = store_build_id(store)
+    return index
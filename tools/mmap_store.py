@@ -0,0 +1,199 @@
+"""Memory-mapped serving index (IVF/HNSW, optionally quantized) for large knowledge bases.
+
+The builder keeps the canonical LangChain FAISS store for incremental updates and
+exports a read-only serving copy next to it:
+
+- ``serving.faiss``: a FAISS index built with ``faiss.index_factory`` and read with
+  ``IO_FLAG_MMAP`` so several worker processes share the page cache.
+- ``docstore.bin`` + ``docstore.offsets.npy``: chunk records (JSON with id, text and
+  metadata) concatenated into one file and addressed by row through ``numpy.memmap``,
+  replacing the pickled docstore.
+- ``serving.json``: how the index was built, its default search parameters and the
+  build id of the rows it covers, which must match the lexical index's.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import math
+from pathlib import Path
+from typing import Any, Dict, List, Sequence
+
+import faiss
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+from .lexical_index import store_build_id
+
+SERVING_INDEX_FILE = "serving.faiss"
+DOCSTORE_FILE = "docstore.bin"
+DOCSTORE_OFFSETS_FILE = "docstore.offsets.npy"
+SERVING_META_FILE = "serving.json"
+SERVING_FILES = (SERVING_INDEX_FILE, DOCSTORE_FILE, DOCSTORE_OFFSETS_FILE, SERVING_META_FILE)
+
+SERVING_INDEX_TYPES = ("flat", "ivf", "hnsw")
+QUANTIZATIONS = ("none", "sq8", "pq")
+
+logger = logging.getLogger(__name__)
+
+
+# FAISS wants ~39 training points per centroid; 8-bit PQ codebooks have 256 centroids.
+PQ_MIN_TRAINING_VECTORS = 39 * 256
+
+
+def _pq_subquantizers(dim: int) -> int:
+    # Prefer sub-vectors of at least four dimensions; 1-d codebooks waste training time.
+    for candidate in (64, 48, 32, 24, 16, 8, 4, 2, 1):
+        if dim % candidate == 0 and dim // candidate >= 4:
+            return candidate
+    return 1
+
+
+def index_factory_string(mode: str, quantization: str, *, dim: int, ntotal: int) -> str:
+    """Translate a (mode, quantization) pair into a FAISS ``index_factory`` description."""
+
+    if mode not in SERVING_INDEX_TYPES:
+        raise ValueError(f"Unknown index type '{mode}'. Choose from {', '.join(SERVING_INDEX_TYPES)}.")
+    if quantization not in QUANTIZATIONS:
+        raise ValueError(f"Unknown quantization '{quantization}'. Choose from {', '.join(QUANTIZATIONS)}.")
+
+    if quantization == "pq" and ntotal < PQ_MIN_TRAINING_VECTORS:
+        logger.warning("Only %d vectors: falling back from PQ to SQ8 quantization", ntotal)
+        quantization = "sq8"
+    codec = {"none": "Flat", "sq8": "SQ8", "pq": f"PQ{_pq_subquantizers(dim)}"}[quantization]
+
+    if mode == "flat":
+        return codec
+    if mode == "hnsw":
+        return f"HNSW32,{codec}"
+    # Rule of thumb: ~4*sqrt(n) lists, but keep >= 39 training points per list.
+    nlist = max(1, min(int(4 * math.sqrt(ntotal)), ntotal // 39))
+    return f"IVF{nlist},{codec}"
+
+
+def export_serving_index(
+    store: Any,
+    directory: Path,
+    *,
+    mode: str = "ivf",
+    quantization: str = "none",
+    nprobe: int = 16,
+    ef_search: int = 64,
+) -> Dict[str, Any]:
+    """Write a memory-mappable serving copy of a LangChain FAISS store into ``directory``."""
+
+    ntotal = int(store.index.ntotal)
+    if ntotal == 0:
+        raise ValueError("Cannot export an empty vector store")
+    vectors = np.asarray(store.index.reconstruct_n(0, ntotal), dtype=np.float32)
+    dim = int(vectors.shape[1])
+
+    description = index_factory_string(mode, quantization, dim=dim, ntotal=ntotal)
+    index = faiss.index_factory(dim, description, faiss.METRIC_L2)
+    if not index.is_trained:
+        index.train(vectors)
+    index.add(vectors)
+
+    offsets = np.zeros(ntotal + 1, dtype=np.uint64)
+    directory.mkdir(parents=True, exist_ok=True)
+    # Write everything under temporary names and swap them in at the end, so running
+    # readers never map a half-written file.
+    tmp = {name: directory / f"{name}.tmp" for name in SERVING_FILES}
+    with open(tmp[DOCSTORE_FILE], "wb") as handle:
+        position = 0
+        for row in range(ntotal):
+            doc_id = store.index_to_docstore_id[row]
+            document = store.docstore.search(doc_id)
+            record = json.dumps(
+                {"id": doc_id, "text": document.page_content, "metadata": document.metadata},
+                ensure_ascii=False,
+            ).encode("utf-8")
+            handle.write(record)
+            position += len(record)
+            offsets[row + 1] = position
+    with open(tmp[DOCSTORE_OFFSETS_FILE], "wb") as handle:
+        np.save(handle, offsets)
+    faiss.write_index(index, str(tmp[SERVING_INDEX_FILE]))
+
+    meta = {
+        "mode": mode,
+        "quantization": quantization,
+        "factory": description,
+        "ntotal": ntotal,
+        "dim": dim,
+        "nprobe": nprobe,
+        "ef_search": ef_search,
+        "build_id": store_build_id(store),
+    }
+    tmp[SERVING_META_FILE].write_text(json.dumps(meta, indent=2), encoding="utf-8")
+    for name in SERVING_FILES:
+        tmp[name].replace(directory / name)
+    return meta
+
+
+class MmapDocstore:
+    """Row-addressed chunk records read lazily from a memory-mapped file."""
+
+    def __init__(self, directory: Path) -> None:
+        self._offsets = np.load(directory / DOCSTORE_OFFSETS_FILE, mmap_mode="r")
+        self._data = np.memmap(directory / DOCSTORE_FILE, dtype=np.uint8, mode="r")
+
+    def __len__(self) -> int:
+        return int(self._offsets.shape[0]) - 1
+
+    def record(self, row: int) -> Dict[str, Any]:
+        start, end = int(self._offsets[row]), int(self._offsets[row + 1])
+        return json.loads(self._data[start:end].tobytes().decode("utf-8"))
+
+    def document(self, row: int) -> Document:
+        record = self.record(row)
+        return Document(page_content=record["text"], metadata={**record["metadata"], "id": record["id"]})
+
+
+class MmapVectorStore:
+    """Read-only vector store over the exported serving index and docstore."""
+
+    def __init__(self, directory: Path, embeddings: Embeddings) -> None:
+        self.directory = Path(directory)
+        self.embeddings = embeddings
+        self.meta = json.loads((self.directory / SERVING_META_FILE).read_text(encoding="utf-8"))
+        self.build_id = self.meta.get("build_id")
+        index_path = str(self.directory / SERVING_INDEX_FILE)
+        try:
+            self.index = faiss.read_index(index_path, faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY)
+        except RuntimeError:
+            # Some index types cannot be mapped by older FAISS builds; read them normally.
+            logger.warning("FAISS could not memory-map %s; loading it into RAM", index_path)
+            self.index = faiss.read_index(index_path)
+        self._apply_search_params()
+        self.docstore = MmapDocstore(self.directory)
+
+    def _apply_search_params(self) -> None:
+        ivf = faiss.try_extract_index_ivf(self.index)
+        if ivf is not None:
+            ivf.nprobe = int(self.meta.get("nprobe", 16))
+        hnsw = getattr(self.index, "hnsw", None)
+        if hnsw is not None:
+            hnsw.efSearch = int(self.meta.get("ef_search", 64))
+
+    def search_rows(self, vectors: Sequence[Sequence[float]], k: int) -> List[List[int]]:
+        """Run one batched FAISS search and return the matching rows for each vector."""
+
+        if not len(vectors):
+            return []
+        _, rows = self.index.search(np.asarray(vectors, dtype=np.float32), k)
+        return [[int(row) for row in query_rows if row >= 0] for query_rows in rows]
+
+    def document_at(self, row: int) -> Document:
+        return self.docstore.document(row)
+
+    def similarity_search_by_vectors(
+        self, vectors: Sequence[Sequence[float]], k: int
+    ) -> List[List[Document]]:
+        """Run one batched FAISS search and return the documents for each vector."""
+
+        return [[self.document_at(row) for row in rows] for rows in self.search_rows(vectors, k)]
+
+    def similarity_search(self, query: str, k: int = 4) -> List[Document]:
+        return self.similarity_search_by_vectors([self.embeddings.embed_query(query)], k)[0]
@@ -0,0 +1,280 @@
+"""Fetch web result pages, extract their main text and condense it around the query.
+
+Pages are fetched concurrently over one pooled ``requests`` session and cached on
+disk. Cached pages are revalidated with ``If-None-Match`` / ``If-Modified-Since``
+once they are older than ``fresh_seconds``, so unchanged pages cost a 304.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import requests
+import urllib3
+from requests.compat import chardet
+
+from config.tokens import count_tokens, truncate_to_tokens
+
+from .lexical_index import tokenize
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_PAGE_CACHE_DIR = PROJECT_ROOT / ".cache" / "pages"
+USER_AGENT = "Mozilla/5.0 (compatible; AgenticWorkshopResearch/1.0)"
+MAX_PAGE_BYTES = 2 * 1024 * 1024
+
+_SKIPPED_TAGS = {"script", "style", "noscript", "svg", "nav", "header", "footer", "aside", "form", "iframe"}
+_BLOCK_TAGS = {
+    "p", "div", "section", "article", "main", "li", "ul", "ol", "pre", "blockquote",
+    "h1", "h2", "h3", "h4", "h5", "h6", "tr", "td", "th", "br", "table", "dd", "dt",
+}
+_MAIN_TAGS = {"article", "main"}
+_HEADER_CHARSET = re.compile(r"charset=[\"']?([\w.:-]+)", re.IGNORECASE)
+_META_CHARSET = re.compile(rb"<meta[^>]+charset=[\"']?([\w.:-]+)", re.IGNORECASE)
+
+logger = logging.getLogger(__name__)
+
+
+class _TextExtractor(HTMLParser):
+    """Collect visible text blocks, separately tracking those inside <article>/<main>."""
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.blocks: List[str] = []
+        self.main_blocks: List[str] = []
+        self._current: List[str] = []
+        self._skip_depth = 0
+        self._main_depth = 0
+
+    def _flush(self) -> None:
+        text = re.sub(r"\s+", " ", "".join(self._current)).strip()
+        self._current = []
+        if len(text) < 2:
+            return
+        self.blocks.append(text)
+        if self._main_depth:
+            self.main_blocks.append(text)
+
+    def handle_starttag(self, tag: str, attrs: Any) -> None:
+        if tag in _SKIPPED_TAGS:
+            self._skip_depth += 1
+        elif tag in _BLOCK_TAGS:
+            self._flush()
+        if tag in _MAIN_TAGS:
+            self._main_depth += 1
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in _SKIPPED_TAGS:
+            self._skip_depth = max(0, self._skip_depth - 1)
+        elif tag in _BLOCK_TAGS:
+            self._flush()
+        if tag in _MAIN_TAGS:
+            self._flush()
+            self._main_depth = max(0, self._main_depth - 1)
+
+    def handle_data(self, data: str) -> None:
+        if not self._skip_depth:
+            self._current.append(data)
+
+
+def extract_main_text(html: str) -> str:
+    """Return the readable text of an HTML page, one block per line."""
+
+    parser = _TextExtractor()
+    parser.feed(html)
+    parser.close()
+    parser._flush()
+    # Prefer the article body when the page marks one up; otherwise keep every block.
+    main_text = sum(len(block) for block in parser.main_blocks)
+    blocks = parser.main_blocks if main_text >= 200 else parser.blocks
+    return "\n".join(blocks)
+
+
+def condense(text: str, query: str, max_tokens: int) -> str:
+    """Keep the paragraphs that best match ``query`` (in page order) within ``max_tokens``."""
+
+    paragraphs = [line for line in text.split("\n") if len(line) > 40]
+    if not paragraphs:
+        return truncate_to_tokens(text, max_tokens)
+    terms = set(tokenize(query))
+    scored = sorted(
+        range(len(paragraphs)),
+        key=lambda index: (-len(terms.intersection(tokenize(paragraphs[index]))), index),
+    )
+    chosen: List[int] = []
+    used = 0
+    for index in scored:
+        cost = count_tokens(paragraphs[index])
+        if used + cost > max_tokens:
+            if not chosen:
+                return truncate_to_tokens(paragraphs[index], max_tokens)
+            continue
+        chosen.append(index)
+        used += cost
+    return "\n".join(paragraphs[index] for index in sorted(chosen))
+
+
+def _decode_body(body: bytes, content_type: str) -> str:
+    """Decode a page using its declared charset, falling back to detection.
+
+    ``requests`` assumes ISO-8859-1 for text/* responses without a charset, which
+    garbles UTF-8 pages, so the header is only trusted when it names a charset.
+    """
+
+    match = _HEADER_CHARSET.search(content_type) or _META_CHARSET.search(body[:4096])
+    candidates = []
+    if match:
+        declared = match.group(1)
+        candidates.append(declared.decode("ascii") if isinstance(declared, bytes) else declared)
+    candidates.append("utf-8")
+    for encoding in candidates:
+        try:
+            return body.decode(encoding)
+        except (LookupError, UnicodeDecodeError):
+            continue
+    detected = chardet.detect(body).get("encoding") if chardet is not None else None
+    try:
+        return body.decode(detected or "utf-8", errors="replace")
+    except LookupError:
+        return body.decode("utf-8", errors="replace")
+
+
+class PageFetcher:
+    """Concurrent page fetcher with an ETag/Last-Modified aware disk cache."""
+
+    def __init__(
+        self,
+        cache_dir: Optional[Path] = DEFAULT_PAGE_CACHE_DIR,
+        *,
+        max_workers: int = 4,
+        timeout: float = 10.0,
+        fresh_seconds: float = 3600,
+    ) -> None:
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        if self.cache_dir is not None:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.fresh_seconds = fresh_seconds
+        self._session = requests.Session()
+        self._session.headers["User-Agent"] = USER_AGENT
+        adapter = requests.adapters.HTTPAdapter(pool_connections=max_workers * 2, pool_maxsize=max_workers)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="page-fetch")
+
+    def _cache_path(self, url: str) -> Optional[Path]:
+        if self.cache_dir is None:
+            return None
+        return self.cache_dir / f"{hashlib.sha256(url.encode('utf-8')).hexdigest()}.json"
+
+    def _read_cache(self, url: str) -> Optional[Dict[str, Any]]:
+        path = self._cache_path(url)
+        if path is None or not path.exists():
+            return None
+        try:
+            return json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+    def _write_cache(self, url: str, entry: Dict[str, Any]) -> None:
+        path = self._cache_path(url)
+        if path is None:
+            return
+        tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+        tmp_path.write_text(json.dumps(entry), encoding="utf-8")
+        tmp_path.replace(path)
+
+    def fetch(self, url: str) -> Optional[str]:
+        """Return the extracted text of ``url`` (``None`` if it cannot be fetched)."""
+
+        cached = self._read_cache(url)
+        if cached is not None and time.time() - cached["fetched_at"] < self.fresh_seconds:
+            return cached["text"]
+
+        headers = {}
+        if cached is not None:
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
+        response = None
+        try:
+            response = self._session.get(url, headers=headers, timeout=self.timeout, stream=True)
+            if response.status_code == 304 and cached is not None:
+                cached["fetched_at"] = time.time()
+                self._write_cache(url, cached)
+                return cached["text"]
+            response.raise_for_status()
+            content_type = response.headers.get("Content-Type", "")
+            if "html" not in content_type and not content_type.startswith("text/"):
+                logger.info("Skipping %s (content type %s)", url, content_type or "unknown")
+                return None
+            body = response.raw.read(MAX_PAGE_BYTES, decode_content=True)
+            raw_text = _decode_body(body, content_type)
+        except (requests.RequestException, urllib3.exceptions.HTTPError, OSError) as exc:
+            logger.warning("Could not fetch %s: %s", url, exc)
+            return cached["text"] if cached is not None else None
+        finally:
+            if response is not None:
+                response.close()
+
+        text = extract_main_text(raw_text) if "html" in content_type else raw_text
+        self._write_cache(
+            url,
+            {
+                "url": url,
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "fetched_at": time.time(),
+                "text": text,
+            },
+        )
+        return text
+
+    def fetch_many(self, urls: Sequence[str]) -> Dict[str, Optional[str]]:
+        """Fetch ``urls`` concurrently; the result maps every URL to its text or ``None``."""
+
+        unique = list(dict.fromkeys(url for url in urls if url))
+        return dict(zip(unique, self._executor.map(self._fetch_or_none, unique)))
+
+    def _fetch_or_none(self, url: str) -> Optional[str]:
+        # One bad page must not fail the search that already has its snippets.
+        try:
+            return self.fetch(url)
+        except Exception as exc:  # noqa: BLE001 - anything page specific
+            logger.warning("Could not extract %s: %s", url, exc)
+            cached = self._read_cache(url)
+            return cached["text"] if cached is not None else None
+
+
+def page_cache_dir_from_env() -> Optional[Path]:
+    raw_value = os.getenv("WEB_PAGE_CACHE_DIR")
+    if raw_value is None:
+        return DEFAULT_PAGE_CACHE_DIR
+    raw_value = raw_value.strip()
+    if not raw_value or raw_value.lower() in ("off", "none", "0"):
+        return None
+    return Path(raw_value)
+
+
+_FETCHER: Optional[PageFetcher] = None
+_FETCHER_LOCK = threading.Lock()
+
+
+def get_page_fetcher() -> PageFetcher:
+    """Return the process-wide fetcher so the HTTP pool and disk cache are shared."""
+
+    global _FETCHER
+    with _FETCHER_LOCK:
+        if _FETCHER is None:
+            _FETCHER = PageFetcher(page_cache_dir_from_env())
+        return _FETCHER
@@ -2,40 +2,148 @@
 from __future__ import annotations
 
 import logging
+import re
+import threading
+from collections import OrderedDict
 from pathlib import Path
-from typing import Optional
+from typing import Hashable, List, Optional, Sequence, Tuple, Type
 
+import numpy as np
 from langchain_core.documents import Document
 from crewai.tools import BaseTool
-from langchain_community.vectorstores import FAISS
-from langchain_community.embeddings import HuggingFaceEmbeddings
-from pydantic import Field, PrivateAttr
+from langchain_core.embeddings import Embeddings
+from pydantic import BaseModel, Field
+
+from config.tracing import note_cache_hit, traced_tool
+
+from .context_packing import pack_documents
+from .lexical_index import reciprocal_rank_fusion
+from .mmap_store import MmapVectorStore
+from .vectorstore_registry import LoadedIndex, VectorStore, get_vectorstore_registry
 
 DEFAULT_EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
 DEFAULT_VECTORSTORE_DIR = Path(__file__).resolve().parents[1] / "rag" / "vectorstore"
+QUERY_CACHE_SIZE = 256
+RETRIEVAL_MODES = ("dense", "hybrid")
+MAX_QUERIES_PER_CALL = 8
+
+
+def normalize_query(query: str) -> str:
+    """Collapse case, whitespace and trailing punctuation so near-identical queries match."""
+    return re.sub(r"\s+", " ", query).strip().strip("?!.").strip().lower()
+
+
+class QueryResultCache:
+    """Thread-safe LRU of retrieved FAISS rows shared by every RAG tool instance.
+
+    Rows are only meaningful for one index version, which is part of every key.
+    """
+
+    def __init__(self, maxsize: int = QUERY_CACHE_SIZE) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, Tuple[int, ...]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Tuple[int, ...]]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Tuple[int, ...]) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+
+_QUERY_CACHE = QueryResultCache()
+
+
+def search_rows(store: VectorStore, vectors: Sequence[Sequence[float]], k: int) -> List[List[int]]:
+    """Nearest FAISS rows for each query vector, for either store type."""
+
+    if isinstance(store, MmapVectorStore):
+        return store.search_rows(vectors, k)
+    _, rows = store.index.search(np.asarray(vectors, dtype=np.float32), k)
+    return [[int(row) for row in query_rows if row >= 0] for query_rows in rows]
+
+
+def document_at(store: VectorStore, row: int) -> Document:
+    if isinstance(store, MmapVectorStore):
+        return store.document_at(row)
+    return store.docstore.search(store.index_to_docstore_id[row])
+
+
+def embed_queries(embeddings: Embeddings, queries: List[str]) -> List[List[float]]:
+    """Embed several queries in one forward pass.
+
+    The sentence-transformers models used here encode queries and documents the
+    same way, so ``embed_documents`` doubles as a batched ``embed_query``.
+    """
+
+    if len(queries) == 1:
+        return [embeddings.embed_query(queries[0])]
+    return embeddings.embed_documents(queries)
+
+
+class LocalRAGInput(BaseModel):
+    query: str = Field(default="", description="A single search query.")
+    queries: Optional[List[str]] = Field(
+        default=None,
+        description=(
+            f"Several related queries (up to {MAX_QUERIES_PER_CALL}) answered in one call; "
+            "snippets already returned for an earlier query are not repeated."
+        ),
+    )
 
 
 class LocalRAGTool(BaseTool):
     name: str = "local_rag_search"
     description: str = (
         "Access the local FAISS vector store built from workshop materials. "
-        "Use this to retrieve background information, code snippets, and deployment tips."
+        "Use this to retrieve background information, code snippets, and deployment tips. "
+        "Pass 'queries' with a list of related questions to look them all up in one call."
     )
+    args_schema: Type[BaseModel] = LocalRAGInput
     vectorstore_path: Path = Field(default_factory=lambda: DEFAULT_VECTORSTORE_DIR)
     top_k: int = 4
     embedding_model: str = DEFAULT_EMBEDDING_MODEL
+    index_mode: str = Field(
+        default="flat",
+        description="'flat' loads the pickled LangChain store; 'mmap' serves the exported IVF/HNSW index.",
+    )
+    retrieval_mode: str = Field(
+        default="hybrid",
+        description="'dense' uses embeddings only; 'hybrid' fuses them with BM25 keyword matches.",
+    )
+    candidate_depth: int = Field(
+        default=20,
+        description="How many dense and lexical candidates are ranked before fusion.",
+    )
+    token_budget: Optional[int] = Field(
+        default=700,
+        description="Maximum tokens of packed snippets returned per call (None disables trimming).",
+    )
 
-    _vectorstore: Optional[FAISS] = PrivateAttr(default=None)
     _logger = logging.getLogger(__name__)
 
     def __init__(self, **data) -> None:
         super().__init__(**data)
         self.vectorstore_path = Path(self.vectorstore_path)
+        if self.retrieval_mode not in RETRIEVAL_MODES:
+            raise ValueError(
+                f"Unknown retrieval mode '{self.retrieval_mode}'. Choose from {', '.join(RETRIEVAL_MODES)}."
+            )
 
-    def _load_vectorstore(self) -> FAISS:
-        if self._vectorstore is not None:
-            return self._vectorstore
-
+    def _load_vectorstore(self) -> LoadedIndex:
         if not self.vectorstore_path.exists():
             self._logger.error(
                 "Vector store missing at %s. Did you run rag/build_vector_db.py?",
@@ -45,34 +153,117 @@ class LocalRAGTool(BaseTool):
                 f"Vector store not found at {self.vectorstore_path}. Run 'python rag/build_vector_db.py' first."
             )
 
-        embeddings = HuggingFaceEmbeddings(model_name=self.embedding_model)
-        self._vectorstore = FAISS.load_local(
-            folder_path=str(self.vectorstore_path),
-            embeddings=embeddings,
-            allow_dangerous_deserialization=True,
+        # The registry shares one model and index per process and reloads on rebuilds.
+        return get_vectorstore_registry().resolve(
+            self.vectorstore_path, self.embedding_model, self.index_mode
         )
-        self._logger.info(
-            "Loaded FAISS vector store from %s using embedding model %s",
-            self.vectorstore_path,
+
+    @traced_tool
+    def _run(self, query: str = "", queries: Optional[List[str]] = None) -> str:
+        requested: List[str] = []
+        seen_queries = set()
+        for candidate in [query, *(queries or [])]:
+            normalized = normalize_query(candidate or "")
+            if normalized and normalized not in seen_queries:
+                seen_queries.add(normalized)
+                requested.append(candidate.strip())
+        if not requested:
+            raise ValueError("Provide a 'query' or a non-empty list of 'queries'.")
+        if len(requested) > MAX_QUERIES_PER_CALL:
+            self._logger.warning(
+                "Local RAG received %d queries; only the first %d are answered",
+                len(requested),
+                MAX_QUERIES_PER_CALL,
+            )
+            requested = requested[:MAX_QUERIES_PER_CALL]
+
+        loaded = self._load_vectorstore()
+        rows_by_query = self._rows_for(loaded, requested)
+        if not any(rows_by_query):
+            return "No relevant documents found in the local knowledge base."
+        if len(requested) == 1:
+            return self._format_docs([document_at(loaded.store, row) for row in rows_by_query[0]])
+        return self._format_multi(loaded.store, requested, rows_by_query)
+
+    def _cache_key(self, loaded: LoadedIndex, query: str) -> Hashable:
+        # The index version changes whenever the store is rebuilt, which invalidates old entries.
+        return (
+            str(self.vectorstore_path),
             self.embedding_model,
+            self.index_mode,
+            self.retrieval_mode,
+            self.candidate_depth,
+            loaded.version,
+            normalize_query(query),
+            self.top_k,
         )
-        return self._vectorstore
 
-    def _run(self, query: str) -> str:
-        store = self._load_vectorstore()
-        docs = store.similarity_search(query, k=self.top_k)
-        if not docs:
-            return "No relevant documents found in the local knowledge base."
+    def _rows_for(self, loaded: LoadedIndex, queries: List[str]) -> List[Tuple[int, ...]]:
+        """Return the ranked rows for each query, serving repeats from the query cache."""
+
+        keys = [self._cache_key(loaded, query) for query in queries]
+        results: List[Optional[Tuple[int, ...]]] = [_QUERY_CACHE.get(key) for key in keys]
+        missing = [index for index, rows in enumerate(results) if rows is None]
+        if len(missing) < len(queries):
+            note_cache_hit()
+        if missing:
+            retrieved = self._retrieve(loaded, [queries[index] for index in missing])
+            for index, rows in zip(missing, retrieved):
+                results[index] = rows
+                _QUERY_CACHE.put(keys[index], rows)
+        self._logger.info(
+            "Local RAG answered %d queries (%d from cache; cache hits=%d misses=%d)",
+            len(queries),
+            len(queries) - len(missing),
+            _QUERY_CACHE.hits,
+            _QUERY_CACHE.misses,
+        )
+        return results  # type: ignore[return-value]
+
+    def _retrieve(self, loaded: LoadedIndex, queries: List[str]) -> List[Tuple[int, ...]]:
+        """Embed ``queries`` in one batch and run a single batched FAISS search."""
+
+        embeddings = get_vectorstore_registry().get_embeddings(self.embedding_model)
+        vectors = embed_queries(embeddings, queries)
+        if self.retrieval_mode == "dense" or loaded.lexical is None:
+            return [tuple(rows) for rows in search_rows(loaded.store, vectors, self.top_k)]
+
+        depth = max(self.candidate_depth, self.top_k)
+        dense_rankings = search_rows(loaded.store, vectors, depth)
+        return [
+            tuple(reciprocal_rank_fusion([dense_rows, loaded.lexical.search(query, depth)])[: self.top_k])
+            for query, dense_rows in zip(queries, dense_rankings)
+        ]
+
+    def _format_multi(
+        self, store: VectorStore, queries: List[str], rows_by_query: List[Tuple[int, ...]]
+    ) -> str:
+        # Each query gets an equal share of the budget; chunks shown for an earlier
+        # query are left out instead of being packed twice.
+        share = self.token_budget // len(queries) if self.token_budget else None
+        sections = []
+        shown: set[int] = set()
+        for query_index, (query, rows) in enumerate(zip(queries, rows_by_query), start=1):
+            fresh = [row for row in rows if row not in shown]
+            shown.update(fresh)
+            lines = [f"Query {query_index}: {query}"]
+            if fresh:
+                lines.append(self._format_docs([document_at(store, row) for row in fresh], share))
+            if len(fresh) < len(rows):
+                lines.append(f"({len(rows) - len(fresh)} matching snippets already shown above.)")
+            elif not rows:
+                lines.append("No relevant documents found.")
+            sections.append("\n\n".join(lines))
+        return "\n\n".join(sections)
 
-        formatted = self._format_docs(docs)
+    def _format_docs(self, docs: List[Document], token_budget: Optional[int] = None) -> str:
+        packed = pack_documents(docs, token_budget if token_budget is not None else self.token_budget)
         self._logger.info(
-            "Local RAG served %d snippets for query '%s'", len(docs), query
+            "Local RAG packed %d chunks into %d passages (%d -> %d tokens, %d saved)",
+            packed.chunks,
+            packed.passages,
+            packed.tokens_before,
+            packed.tokens_after,
+            packed.tokens_saved,
         )
-        return formatted
-
-    @staticmethod
-    def _format_docs(docs: list[Document]) -> str:
-        formatted = []
-        for idx, doc in enumerate(docs, start=1):
-            formatted.append(f"Snippet {idx}:\n{doc.page_content.strip()}")
-        return "\n\n".join(formatted)
+        return packed.text
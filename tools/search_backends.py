@@ -0,0 +1,297 @@
+"""Pluggable web search backends with session pooling, caching and rate limiting.
+
+``DDGSBackend`` talks to DuckDuckGo through a small pool of reusable ``DDGS``
+sessions. ``HTTPSearchBackend`` queries any JSON endpoint with the same contract
+(``GET <url>?q=...&kind=...&max_results=...`` returning a list of result objects),
+which lets tests run against a local stub server without network access.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import queue
+import random
+import re
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Protocol, Tuple
+
+import requests
+
+from config.tracing import note_cache_hit
+
+SEARCH_KINDS = ("text", "news", "images")
+DEFAULT_CACHE_TTL_SECONDS = 15 * 60
+# Lets one multi-query tool call (up to MAX_QUERIES_PER_CALL = 5) start without waiting.
+DEFAULT_BURST = 5
+
+logger = logging.getLogger(__name__)
+
+SearchResult = Dict[str, Any]
+
+
+class SearchBackend(Protocol):
+    name: str
+
+    def search(self, kind: str, query: str, max_results: int) -> List[SearchResult]:
+        ...
+
+
+class RateLimitedError(RuntimeError):
+    """Raised by backends when the upstream service asks us to slow down."""
+
+
+def _is_rate_limit(exc: Exception) -> bool:
+    # duckduckgo_search raises RatelimitException; HTTP backends surface 429s.
+    return isinstance(exc, RateLimitedError) or "ratelimit" in type(exc).__name__.lower()
+
+
+class RateLimiter:
+    """Token bucket shared by every search issued through one backend."""
+
+    def __init__(self, rate_per_second: float, burst: int = 1) -> None:
+        if rate_per_second <= 0:
+            raise ValueError("The search rate limit must be a positive number of requests per second.")
+        self.rate = rate_per_second
+        self.capacity = max(1, burst)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class SearchResultCache:
+    """Thread-safe TTL + LRU cache of search results keyed on (backend, kind, query, max_results)."""
+
+    def __init__(self, ttl_seconds: float = DEFAULT_CACHE_TTL_SECONDS, maxsize: int = 512) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Tuple[str, str, str, int], Tuple[float, List[SearchResult]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(backend: str, kind: str, query: str, max_results: int) -> Tuple[str, str, str, int]:
+        return (backend, kind, re.sub(r"\s+", " ", query).strip().lower(), max_results)
+
+    def get(self, key: Tuple[str, str, str, int]) -> Optional[List[SearchResult]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                self._entries.pop(key, None)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: Tuple[str, str, str, int], results: List[SearchResult]) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, results)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+
+class DDGSBackend:
+    """DuckDuckGo search over a pool of long-lived ``DDGS`` sessions."""
+
+    name = "ddgs"
+    POOL_WAIT_SECONDS = 0.5
+
+    def __init__(self, pool_size: int = 4, timeout: int = 10) -> None:
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self._idle: "queue.LifoQueue[Any]" = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+
+    def _reserve_slot(self) -> bool:
+        with self._lock:
+            if self._created < self.pool_size:
+                self._created += 1
+                return True
+            return False
+
+    def _acquire(self) -> Any:
+        """Take an idle session, or create one while the pool has room.
+
+        Waiters poll rather than block on the idle queue: when in-flight sessions fail
+        they free pool slots without returning a session, and a blocked waiter would
+        never notice.
+        """
+
+        while True:
+            try:
+                return self._idle.get_nowait()
+            except queue.Empty:
+                pass
+            if self._reserve_slot():
+                try:
+                    from duckduckgo_search import DDGS
+
+                    return DDGS(timeout=self.timeout)
+                except Exception:
+                    with self._lock:
+                        self._created -= 1
+                    raise
+            try:
+                return self._idle.get(timeout=self.POOL_WAIT_SECONDS)
+            except queue.Empty:
+                continue
+
+    @staticmethod
+    def _close(session: Any) -> None:
+        """Release the HTTP client of a session that is dropped from the pool."""
+
+        close = getattr(session, "close", None)
+        try:
+            if callable(close):
+                close()
+            elif hasattr(session, "__exit__"):
+                session.__exit__(None, None, None)
+        except Exception:  # pragma: no cover - best effort cleanup
+            logger.debug("Closing a DDGS session failed", exc_info=True)
+
+    @contextmanager
+    def _session(self) -> Iterator[Any]:
+        session = self._acquire()
+        try:
+            yield session
+        except Exception:
+            # A failed session may hold a broken connection; replace it next time.
+            with self._lock:
+                self._created -= 1
+            self._close(session)
+            raise
+        else:
+            self._idle.put(session)
+
+    def search(self, kind: str, query: str, max_results: int) -> List[SearchResult]:
+        with self._session() as ddgs:
+            if kind == "news":
+                return list(ddgs.news(query, max_results=max_results))
+            if kind == "images":
+                return list(ddgs.images(query, max_results=max_results))
+            return list(ddgs.text(query, max_results=max_results))
+
+
+class HTTPSearchBackend:
+    """Search through a JSON HTTP endpoint (e.g. a local stub server in tests)."""
+
+    name = "http"
+
+    def __init__(self, url: str, timeout: float = 10.0, pool_size: int = 4) -> None:
+        self.url = url
+        self.timeout = timeout
+        self._session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+
+    def search(self, kind: str, query: str, max_results: int) -> List[SearchResult]:
+        response = self._session.get(
+            self.url,
+            params={"q": query, "kind": kind, "max_results": max_results},
+            timeout=self.timeout,
+        )
+        if response.status_code == 429:
+            raise RateLimitedError(f"{self.url} returned 429 Too Many Requests")
+        response.raise_for_status()
+        payload = response.json()
+        results = payload.get("results", []) if isinstance(payload, dict) else payload
+        return list(results)[:max_results]
+
+
+class SearchClient:
+    """Cached, rate-limited and retrying front end for a :class:`SearchBackend`."""
+
+    def __init__(
+        self,
+        backend: SearchBackend,
+        *,
+        cache: Optional[SearchResultCache] = None,
+        rate_per_second: float = 1.0,
+        burst: int = DEFAULT_BURST,
+        max_retries: int = 3,
+        backoff_seconds: float = 1.0,
+    ) -> None:
+        self.backend = backend
+        self.cache = cache if cache is not None else SearchResultCache()
+        self.limiter = RateLimiter(rate_per_second, burst)
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+
+    def search(self, kind: str, query: str, max_results: int) -> List[SearchResult]:
+        key = SearchResultCache.key(self.backend.name, kind, query, max_results)
+        cached = self.cache.get(key)
+        if cached is not None:
+            logger.info("Web search cache hit for %s query: %s", kind, query)
+            note_cache_hit()
+            return cached
+
+        attempt = 0
+        while True:
+            self.limiter.acquire()
+            try:
+                results = self.backend.search(kind, query, max_results)
+                break
+            except Exception as exc:
+                if not _is_rate_limit(exc) or attempt >= self.max_retries:
+                    raise
+                delay = self.backoff_seconds * (2**attempt) * (1 + random.random())
+                attempt += 1
+                logger.warning(
+                    "Web search rate limited (%s); retry %d/%d in %.1fs", exc, attempt, self.max_retries, delay
+                )
+                time.sleep(delay)
+        self.cache.put(key, results)
+        return results
+
+
+def backend_from_env() -> SearchBackend:
+    """Build the backend selected by ``WEB_SEARCH_BACKEND`` (``ddgs`` or an ``http(s)://`` URL)."""
+
+    configured = os.getenv("WEB_SEARCH_BACKEND", "ddgs").strip()
+    if configured.startswith(("http://", "https://")):
+        return HTTPSearchBackend(configured)
+    if configured != "ddgs":
+        raise ValueError(
+            f"Unknown WEB_SEARCH_BACKEND '{configured}'. Use 'ddgs' or an http(s):// search endpoint."
+        )
+    return DDGSBackend(pool_size=int(os.getenv("WEB_SEARCH_POOL_SIZE", "4")))
+
+
+_CLIENT: Optional[SearchClient] = None
+_CLIENT_LOCK = threading.Lock()
+
+
+def get_search_client() -> SearchClient:
+    """Return the process-wide search client so sessions and cache are shared by every tool."""
+
+    global _CLIENT
+    with _CLIENT_LOCK:
+        if _CLIENT is None:
+            _CLIENT = SearchClient(
+                backend_from_env(),
+                cache=SearchResultCache(
+                    ttl_seconds=float(os.getenv("WEB_SEARCH_CACHE_TTL_SECONDS", DEFAULT_CACHE_TTL_SECONDS))
+                ),
+                rate_per_second=float(os.getenv("WEB_SEARCH_RATE_PER_SECOND", "1")),
+                burst=int(os.getenv("WEB_SEARCH_BURST", str(DEFAULT_BURST))),
+            )
+        return _CLIENT
@@ -0,0 +1,200 @@
+"""Unit-aware quantities and calendar dates for the calculator.
+
+Units are written as multipliers inside expressions (``40*hours * 85*usd/hour``,
+``3*days + 4*h``) and dates with ``date('2025-03-01')``. Quantities keep their
+magnitude in base units (seconds, bytes, currency units) together with the unit
+each dimension should be displayed in.
+"""
+from __future__ import annotations
+
+import datetime as dt
+from dataclasses import dataclass, field
+from fractions import Fraction
+from typing import Any, Dict, Tuple
+
+# name -> (dimension, factor to the base unit)
+UNITS: Dict[str, Tuple[str, int]] = {
+    "s": ("time", 1),
+    "sec": ("time", 1),
+    "second": ("time", 1),
+    "seconds": ("time", 1),
+    "min": ("time", 60),
+    "mins": ("time", 60),
+    "minute": ("time", 60),
+    "minutes": ("time", 60),
+    "h": ("time", 3600),
+    "hr": ("time", 3600),
+    "hrs": ("time", 3600),
+    "hour": ("time", 3600),
+    "hours": ("time", 3600),
+    "day": ("time", 86400),
+    "days": ("time", 86400),
+    "week": ("time", 604800),
+    "weeks": ("time", 604800),
+    "usd": ("usd", 1),
+    "eur": ("eur", 1),
+    "gbp": ("gbp", 1),
+    "byte": ("data", 1),
+    "bytes": ("data", 1),
+    "kb": ("data", 10**3),
+    "mb": ("data", 10**6),
+    "gb": ("data", 10**9),
+    "tb": ("data", 10**12),
+}
+# Canonical display names so '3*hours' prints as '3 h'.
+_DISPLAY = {"second": "s", "seconds": "s", "sec": "s", "mins": "min", "minute": "min", "minutes": "min",
+            "hr": "h", "hrs": "h", "hour": "h", "hours": "h", "day": "days", "week": "weeks",
+            "byte": "bytes"}
+
+
+def _merge_dims(left: Dict[str, int], right: Dict[str, int], sign: int) -> Dict[str, int]:
+    dims = dict(left)
+    for name, power in right.items():
+        dims[name] = dims.get(name, 0) + sign * power
+        if dims[name] == 0:
+            del dims[name]
+    return dims
+
+
+@dataclass
+class Quantity:
+    """A magnitude in base units plus its dimensions, e.g. 306000 with {'time': 1}."""
+
+    value: Any
+    dims: Dict[str, int]
+    display: Dict[str, str] = field(default_factory=dict)
+
+    @classmethod
+    def unit(cls, name: str, exact: bool = False) -> "Quantity":
+        dimension, factor = UNITS[name]
+        return cls(Fraction(factor) if exact else factor, {dimension: 1}, {dimension: _DISPLAY.get(name, name)})
+
+    def _wrap(self, value: Any, dims: Dict[str, int], display: Dict[str, str]) -> Any:
+        if not dims:
+            return value
+        return Quantity(value, dims, {name: unit for name, unit in display.items() if name in dims})
+
+    def _coerce(self, other: Any) -> "Quantity":
+        if isinstance(other, Quantity):
+            return other
+        return Quantity(other, {}, {})
+
+    def _same_dims(self, other: Any, verb: str) -> "Quantity":
+        other = self._coerce(other)
+        if other.dims != self.dims:
+            raise ValueError(f"Cannot {verb} {self.describe()} and {other.describe()}")
+        return other
+
+    def __add__(self, other: Any) -> Any:
+        other = self._same_dims(other, "add")
+        return self._wrap(self.value + other.value, self.dims, {**other.display, **self.display})
+
+    __radd__ = __add__
+
+    def __sub__(self, other: Any) -> Any:
+        other = self._same_dims(other, "subtract")
+        return self._wrap(self.value - other.value, self.dims, {**other.display, **self.display})
+
+    def __rsub__(self, other: Any) -> Any:
+        return (-self) + other
+
+    def __mul__(self, other: Any) -> Any:
+        other = self._coerce(other)
+        return self._wrap(
+            self.value * other.value, _merge_dims(self.dims, other.dims, 1), {**other.display, **self.display}
+        )
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other: Any) -> Any:
+        other = self._coerce(other)
+        return self._wrap(
+            self.value / other.value, _merge_dims(self.dims, other.dims, -1), {**other.display, **self.display}
+        )
+
+    def __rtruediv__(self, other: Any) -> Any:
+        return self._coerce(other) / self
+
+    def __pow__(self, exponent: Any) -> Any:
+        if int(exponent) != exponent:
+            raise ValueError("Quantities can only be raised to whole powers")
+        power = int(exponent)
+        return self._wrap(self.value**power, {name: p * power for name, p in self.dims.items()}, self.display)
+
+    def __neg__(self) -> "Quantity":
+        return Quantity(-self.value, self.dims, self.display)
+
+    def __pos__(self) -> "Quantity":
+        return self
+
+    def __abs__(self) -> "Quantity":
+        return Quantity(abs(self.value), self.dims, self.display)
+
+    def __lt__(self, other: Any) -> bool:
+        return self.value < self._same_dims(other, "compare").value
+
+    def __gt__(self, other: Any) -> bool:
+        return self.value > self._same_dims(other, "compare").value
+
+    def __round__(self, ndigits: Any = None) -> "Quantity":
+        factor = self.display_factor()
+        return Quantity(round(self.value / factor, ndigits) * factor, self.dims, self.display)
+
+    def display_factor(self) -> Any:
+        factor: Any = 1
+        for name, power in self.dims.items():
+            unit = self.display.get(name)
+            if unit is not None:
+                factor *= UNITS[unit][1] ** power
+        return factor
+
+    def display_value(self) -> Any:
+        return self.value / self.display_factor()
+
+    def describe(self) -> str:
+        return f"'{self.unit_label()}'" if self.dims else "a plain number"
+
+    def unit_label(self) -> str:
+        numerator = [self._power_label(name, power) for name, power in self.dims.items() if power > 0]
+        denominator = [self._power_label(name, -power) for name, power in self.dims.items() if power < 0]
+        label = "*".join(numerator) or "1"
+        if denominator:
+            label += "/" + "/".join(denominator)
+        return label
+
+    def _power_label(self, name: str, power: int) -> str:
+        unit = self.display.get(name, name)
+        return unit if power == 1 else f"{unit}^{power}"
+
+
+@dataclass(frozen=True)
+class CalendarDate:
+    """A calendar date; subtracting two dates gives a duration in days."""
+
+    day: dt.date
+
+    @classmethod
+    def parse(cls, text: str) -> "CalendarDate":
+        try:
+            return cls(dt.date.fromisoformat(text.strip()))
+        except ValueError as exc:
+            raise ValueError(f"Dates must be written as YYYY-MM-DD, got '{text}'") from exc
+
+    def __sub__(self, other: Any) -> Any:
+        if isinstance(other, CalendarDate):
+            days = (self.day - other.day).days
+            return Quantity(days * 86400, {"time": 1}, {"time": "days"})
+        return self + (-other)
+
+    def __add__(self, other: Any) -> "CalendarDate":
+        if not isinstance(other, Quantity) or other.dims != {"time": 1}:
+            raise ValueError("Only durations (e.g. 3*days) can be added to a date")
+        return CalendarDate(self.day + dt.timedelta(seconds=float(other.value)))
+
+    __radd__ = __add__
+
+    def __lt__(self, other: "CalendarDate") -> bool:
+        return self.day < other.day
+
+    def __str__(self) -> str:
+        return self.day.isoformat()
@@ -0,0 +1,278 @@
+"""Process-wide registry that shares embedding models and FAISS indexes across RAG tools."""
+from __future__ import annotations
+
+import logging
+import sys
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple, Union
+
+from langchain_community.embeddings import HuggingFaceEmbeddings
+from langchain_community.vectorstores import FAISS
+from langchain_core.embeddings import Embeddings
+
+from .embedding_cache import (
+    CachedEmbeddings,
+    EmbeddingCache,
+    cache_query_embeddings_from_env,
+    embedding_cache_dir_from_env,
+)
+from .lexical_index import LEXICAL_FILES, LEXICAL_INDEX_FILE, BM25Index, store_build_id
+from .mmap_store import SERVING_FILES, MmapVectorStore
+
+INDEX_FILES = ("index.faiss", "index.pkl")
+INDEX_MODES = ("flat", "mmap")
+
+VectorStore = Union[FAISS, MmapVectorStore]
+IndexKey = Tuple[str, str, str]
+IndexSignature = Tuple[Tuple[str, int, int], ...]
+
+
+@dataclass
+class LoadedIndex:
+    """A loaded vector store plus its BM25 index (``None`` for stores built without one)."""
+
+    store: VectorStore
+    lexical: Optional[BM25Index]
+    signature: IndexSignature
+    version: int
+
+
+@dataclass
+class RegistryStats:
+    """Counters describing how often loaded models and indexes were reused."""
+
+    hits: int = 0
+    misses: int = 0
+    reloads: int = 0
+    embedding_hits: int = 0
+    embedding_loads: int = 0
+
+
+def _index_signature(vectorstore_path: Path, index_mode: str) -> IndexSignature:
+    """Return a cheap fingerprint of the on-disk index files."""
+
+    signature = []
+    filenames = SERVING_FILES if index_mode == "mmap" else INDEX_FILES
+    for filename in (*filenames, *LEXICAL_FILES):
+        target = vectorstore_path / filename
+        try:
+            stat = target.stat()
+        except FileNotFoundError:
+            signature.append((filename, -1, -1))
+            continue
+        signature.append((filename, stat.st_mtime_ns, stat.st_size))
+    return tuple(signature)
+
+
+def _current_rss_bytes() -> int:
+    """Best-effort resident set size of the current process."""
+
+    try:
+        import resource
+    except ImportError:  # pragma: no cover - Windows has no resource module
+        return 0
+
+    try:
+        with open("/proc/self/statm", encoding="utf-8") as handle:
+            resident_pages = int(handle.read().split()[1])
+        return resident_pages * resource.getpagesize()
+    except (OSError, ValueError, IndexError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is reported in bytes on macOS and kilobytes elsewhere.
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _embedding_model_bytes(embeddings: Embeddings) -> int:
+    embeddings = getattr(embeddings, "inner", embeddings)
+    client = getattr(embeddings, "client", None)
+    try:
+        return sum(param.numel() * param.element_size() for param in client.parameters())
+    except Exception:  # pragma: no cover - depends on the embedding backend
+        return 0
+
+
+def _index_bytes(store: VectorStore) -> int:
+    index = getattr(store, "index", None)
+    if index is None or isinstance(store, MmapVectorStore):
+        # Memory-mapped indexes live in the shared page cache, not in this process's heap.
+        return 0
+    # Flat FAISS indexes keep one float32 vector per entry.
+    return int(getattr(index, "ntotal", 0)) * int(getattr(index, "d", 0)) * 4
+
+
+class VectorStoreRegistry:
+    """Share one embedding model and one FAISS index per (vectorstore_path, embedding_model).
+
+    Every agent, fallback attempt and Streamlit session in the process resolves its
+    vector store through the same registry, so the transformer weights and the index
+    are loaded once. Indexes are reloaded when their files change on disk.
+
+    ``index_mode`` selects the pickled LangChain store (``"flat"``) or the exported,
+    memory-mapped serving index (``"mmap"``); each mode is cached separately.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._embeddings: Dict[str, Embeddings] = {}
+        self._indexes: Dict[IndexKey, LoadedIndex] = {}
+        self.stats = RegistryStats()
+        self._logger = logging.getLogger(__name__)
+
+    def get_embeddings(self, embedding_model: str) -> Embeddings:
+        """Return the shared embedding model, loading it on first use.
+
+        Unless ``EMBEDDING_CACHE_DIR`` is set to ``off``, the model is wrapped in the
+        persistent embedding cache so previously seen texts are not re-encoded. Query
+        embeddings are only added to it with ``EMBEDDING_CACHE_QUERIES=1``.
+        """
+
+        with self._lock:
+            embeddings = self._embeddings.get(embedding_model)
+            if embeddings is not None:
+                self.stats.embedding_hits += 1
+                return embeddings
+
+            embeddings = HuggingFaceEmbeddings(model_name=embedding_model)
+            cache_dir = embedding_cache_dir_from_env()
+            if cache_dir is not None:
+                embeddings = CachedEmbeddings(
+                    embeddings,
+                    EmbeddingCache(cache_dir, embedding_model),
+                    store_misses=cache_query_embeddings_from_env(),
+                )
+            self._embeddings[embedding_model] = embeddings
+            self.stats.embedding_loads += 1
+            self._logger.info("Loaded embedding model %s", embedding_model)
+            return embeddings
+
+    def get_vectorstore(
+        self, vectorstore_path: Path, embedding_model: str, index_mode: str = "flat"
+    ) -> VectorStore:
+        """Return the shared vector store, reloading it if the index files changed."""
+
+        return self._get_entry(Path(vectorstore_path), embedding_model, index_mode).store
+
+    def resolve(
+        self, vectorstore_path: Path, embedding_model: str, index_mode: str = "flat"
+    ) -> LoadedIndex:
+        """Return the shared vector store with its lexical index and version stamp."""
+
+        return self._get_entry(Path(vectorstore_path), embedding_model, index_mode)
+
+    def index_version(
+        self, vectorstore_path: Path, embedding_model: str, index_mode: str = "flat"
+    ) -> int:
+        """Return a counter that increases every time the index is (re)loaded."""
+
+        return self._get_entry(Path(vectorstore_path), embedding_model, index_mode).version
+
+    def _get_entry(self, vectorstore_path: Path, embedding_model: str, index_mode: str) -> LoadedIndex:
+        if index_mode not in INDEX_MODES:
+            raise ValueError(f"Unknown index mode '{index_mode}'. Choose from {', '.join(INDEX_MODES)}.")
+        key: IndexKey = (str(vectorstore_path.resolve()), embedding_model, index_mode)
+        signature = _index_signature(vectorstore_path, index_mode)
+
+        with self._lock:
+            entry = self._indexes.get(key)
+            if entry is not None and entry.signature == signature:
+                self.stats.hits += 1
+                return entry
+
+            embeddings = self.get_embeddings(embedding_model)
+            if index_mode == "mmap":
+                store: VectorStore = MmapVectorStore(vectorstore_path, embeddings)
+            else:
+                store = FAISS.load_local(
+                    folder_path=str(vectorstore_path),
+                    embeddings=embeddings,
+                    allow_dangerous_deserialization=True,
+                )
+            lexical = self._load_lexical(vectorstore_path, store)
+            if entry is None:
+                self.stats.misses += 1
+                version = 1
+            else:
+                self.stats.reloads += 1
+                version = entry.version + 1
+            entry = LoadedIndex(store=store, lexical=lexical, signature=signature, version=version)
+            self._indexes[key] = entry
+            self._logger.info(
+                "Loaded %s FAISS vector store from %s using embedding model %s (version %d)",
+                index_mode,
+                vectorstore_path,
+                embedding_model,
+                version,
+            )
+            return entry
+
+    def _load_lexical(self, vectorstore_path: Path, store: VectorStore) -> Optional[BM25Index]:
+        if not (vectorstore_path / LEXICAL_INDEX_FILE).exists():
+            self._logger.warning(
+                "No lexical index in %s; hybrid retrieval falls back to dense search. "
+                "Re-run rag/build_vector_db.py to create it.",
+                vectorstore_path,
+            )
+            return None
+        try:
+            lexical = BM25Index.load(vectorstore_path)
+        except (OSError, ValueError) as exc:
+            self._logger.warning(
+                "Could not load the lexical index in %s (%s); hybrid retrieval falls back to dense search.",
+                vectorstore_path,
+                exc,
+            )
+            return None
+        expected = store.build_id if isinstance(store, MmapVectorStore) else store_build_id(store)
+        if lexical.build_id is None or lexical.build_id != expected:
+            # Rows must line up with the vector index for rank fusion to be meaningful;
+            # equal row counts are not enough once chunks were replaced.
+            self._logger.warning(
+                "Lexical index in %s was built from different rows than the %s vector index "
+                "(build %s vs %s); ignoring it. Re-run rag/build_vector_db.py.",
+                vectorstore_path,
+                "serving" if isinstance(store, MmapVectorStore) else "flat",
+                lexical.build_id,
+                expected,
+            )
+            return None
+        return lexical
+
+    def invalidate(self, vectorstore_path: Path | None = None) -> None:
+        """Drop cached indexes (all of them, or only those for ``vectorstore_path``)."""
+
+        with self._lock:
+            if vectorstore_path is None:
+                self._indexes.clear()
+                return
+            resolved = str(Path(vectorstore_path).resolve())
+            for key in [key for key in self._indexes if key[0] == resolved]:
+                del self._indexes[key]
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return hit/miss counters together with memory estimates for logging."""
+
+        with self._lock:
+            return {
+                "hits": self.stats.hits,
+                "misses": self.stats.misses,
+                "reloads": self.stats.reloads,
+                "embedding_hits": self.stats.embedding_hits,
+                "embedding_loads": self.stats.embedding_loads,
+                "loaded_indexes": len(self._indexes),
+                "loaded_embedding_models": len(self._embeddings),
+                "index_bytes": sum(_index_bytes(entry.store) for entry in self._indexes.values()),
+                "embedding_bytes": sum(
+                    _embedding_model_bytes(model) for model in self._embeddings.values()
+                ),
+                "process_rss_bytes": _current_rss_bytes(),
+            }
+
+
+_REGISTRY = VectorStoreRegistry()
+
+
+def get_vectorstore_registry() -> VectorStoreRegistry:
+    """Return the registry shared by every RAG tool in this process."""
+    return _REGISTRY
@@ -1,12 +1,29 @@
 """DuckDuckGo-powered open web search tool."""
 from __future__ import annotations
 
+import contextvars
 import logging
-from typing import Any
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Type
 
 from crewai.tools import BaseTool
-from duckduckgo_search import DDGS
-from pydantic import Field
+from pydantic import BaseModel, Field
+
+from config.tracing import traced_tool
+
+from .page_fetcher import condense, get_page_fetcher
+from .search_backends import SearchClient, get_search_client
+
+MAX_QUERIES_PER_CALL = 5
+
+
+class WebSearchInput(BaseModel):
+    query: str = Field(default="", description="A short search phrase.")
+    queries: Optional[List[str]] = Field(
+        default=None,
+        description=f"Several search phrases (up to {MAX_QUERIES_PER_CALL}) to run concurrently in one call.",
+    )
 
 
 class DuckDuckGoSearchTool(BaseTool):
@@ -14,19 +31,82 @@ class DuckDuckGoSearchTool(BaseTool):
 
     name: str = "duckduckgo_search"
     description: str = (
-        "Query DuckDuckGo for current information. Provide a short search phrase."
+        "Query DuckDuckGo for current information. Provide a short search phrase, "
+        "or 'queries' with several phrases to search them all at once."
     )
+    args_schema: Type[BaseModel] = WebSearchInput
     max_results: int = Field(default=5, ge=1, description="Number of hits to return")
     backend: str = Field(
         default="text",
         description="DuckDuckGo backend to use (text, news, images).",
     )
+    fetch_pages: bool = Field(
+        default=False,
+        description="Fetch the top result pages and return condensed passages of their text.",
+    )
+    fetch_top_n: int = Field(default=3, ge=1, description="How many result pages to fetch per query.")
+    passage_tokens: int = Field(default=250, ge=32, description="Token budget for each page extract.")
+    client: Optional[SearchClient] = Field(
+        default=None,
+        exclude=True,
+        description="Search client to use; defaults to the shared, cached client from the environment.",
+    )
+
+    model_config = {"arbitrary_types_allowed": True}
 
     _logger = logging.getLogger(__name__)
 
-    def _run(self, query: str) -> str:
-        self._logger.info("DuckDuckGo search for query: %s", query)
-        results = self._search(query)
+    @traced_tool
+    def _run(self, query: str = "", queries: Optional[List[str]] = None) -> str:
+        requested = list(dict.fromkeys(q.strip() for q in [query, *(queries or [])] if q and q.strip()))
+        if not requested:
+            raise ValueError("Provide a 'query' or a non-empty list of 'queries'.")
+        requested = requested[:MAX_QUERIES_PER_CALL]
+        if len(requested) == 1:
+            results = self._search(requested[0])
+            return self._format_results(results, self._extracts(requested[0], results))
+
+        with ThreadPoolExecutor(max_workers=len(requested), thread_name_prefix="web-search") as executor:
+            # Each search runs in a copy of this context so cache hits reach the tool's trace span.
+            futures = [
+                executor.submit(contextvars.copy_context().run, self._search, search_query)
+                for search_query in requested
+            ]
+            all_results = [future.result() for future in futures]
+        extracts = self._extracts_many(requested, all_results)
+        sections = []
+        for index, (search_query, results, query_extracts) in enumerate(
+            zip(requested, all_results, extracts), start=1
+        ):
+            formatted = self._format_results(results, query_extracts)
+            sections.append(f"Query {index}: {search_query}\n\n{formatted}")
+        return "\n\n".join(sections)
+
+    def _extracts(self, query: str, results: list[dict[str, Any]]) -> Dict[str, str]:
+        """Fetch the top result pages and condense each to the passages matching ``query``."""
+
+        return self._extracts_many([query], [results])[0]
+
+    def _extracts_many(
+        self, queries: List[str], all_results: List[list[dict[str, Any]]]
+    ) -> List[Dict[str, str]]:
+        """Fetch the top pages of every query in one concurrent batch, then condense per query."""
+
+        if not self.fetch_pages or self.backend != "text":
+            return [{} for _ in queries]
+        top_urls = [
+            [item.get("href") or item.get("url") or "" for item in results[: self.fetch_top_n]]
+            for results in all_results
+        ]
+        pages = get_page_fetcher().fetch_many([url for urls in top_urls for url in urls])
+        return [
+            {url: condense(pages[url], query, self.passage_tokens) for url in urls if pages.get(url)}
+            for query, urls in zip(queries, top_urls)
+        ]
+
+    def _format_results(
+        self, results: list[dict[str, Any]], extracts: Optional[Dict[str, str]] = None
+    ) -> str:
         if not results:
             return "No DuckDuckGo results found for that query."
 
@@ -40,29 +120,33 @@ class DuckDuckGoSearchTool(BaseTool):
                 or item.get("description")
                 or "No summary provided."
             )
-            formatted.append(
-                f"Result {index}: {title}\nURL: {url}\nSummary: {summary.strip()}"
-            )
+            entry = f"Result {index}: {title}\nURL: {url}\nSummary: {summary.strip()}"
+            if extracts and extracts.get(url):
+                entry += f"\nPage extract:\n{extracts[url]}"
+            formatted.append(entry)
 
         serialized = "\n\n".join(formatted)
         self._logger.debug("DuckDuckGo raw results: %s", results)
         return serialized
 
     def _search(self, query: str) -> list[dict[str, Any]]:
+        self._logger.info("DuckDuckGo search for query: %s", query)
+        client = self.client or get_search_client()
         try:
-            with DDGS() as ddgs:
-                if self.backend == "news":
-                    iterator = ddgs.news(query, max_results=self.max_results)
-                elif self.backend == "images":
-                    iterator = ddgs.images(query, max_results=self.max_results)
-                else:
-                    iterator = ddgs.text(query, max_results=self.max_results)
-                return list(iterator)
+            return client.search(self.backend, query, self.max_results)
         except Exception as exc:  # pragma: no cover - network variability
             self._logger.exception("DuckDuckGo search failed for '%s'", query)
             raise ValueError(f"DuckDuckGo search failed: {exc}") from exc
 
 
 def create_web_search_tool() -> DuckDuckGoSearchTool:
-    """Create a tool that performs top-k DuckDuckGo searches."""
-    return DuckDuckGoSearchTool(max_results=5)
+    """Create a tool that performs top-k DuckDuckGo searches.
+
+    Set ``WEB_FETCH_PAGES=1`` to also return condensed text from the top
+    ``WEB_FETCH_TOP_N`` result pages.
+    """
+    return DuckDuckGoSearchTool(
+        max_results=5,
+        fetch_pages=os.getenv("WEB_FETCH_PAGES", "0").lower() in ("1", "true", "yes"),
+        fetch_top_n=int(os.getenv("WEB_FETCH_TOP_N", "3")),
+    )